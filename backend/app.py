@@ -2,10 +2,13 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 from rag.rag_model import run_rag
 import os
-import asyncio
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
-from jobs.main_nodriver import NoDriverLinkedInScraper
+from jobs.main_nodriver import start_parse_executor
+from jobs.session_pool import run_scraper_coroutine
+from jobs.company_resolver import company_gazetteer
+from jobs.linkedin_parser import LinkedInJobParser
+from job_store import save_jobs_to_supabase, scrape_linkedin_jobs_async
 from supabase import create_client, Client
 import sys
 from dotenv import load_dotenv
@@ -14,6 +17,8 @@ import uuid
 from flask import send_from_directory
 from werkzeug.utils import secure_filename
 from resume_service import resume_bp
+from saved_searches import saved_searches_bp, cached_jobs_response, cached_search_jobs
+from scrape_tasks import scrape_tasks_bp, scrape_tasks
 from transformers import pipeline
 import google.generativeai as genai
 from docx import Document
@@ -39,7 +44,7 @@ def root():
 
 @app.route("/healthz", methods=["GET"])
 def healthz():
-    return jsonify({"status": "ok"}), 200
+    return jsonify({"status": "ok", "scrape_tasks": scrape_tasks.stats()}), 200
 
 # Optional: debug your env quickly
 @app.route("/api/debug/env", methods=["GET"])
@@ -52,10 +57,17 @@ def debug():
         "frontend_origin": FRONTEND_ORIGIN,
     }), 200
 
+# Hit counts of the LinkedIn parser's fallback selectors (dead ones mean a layout change)
+@app.route("/api/debug/selectors", methods=["GET"])
+def debug_selectors():
+    return jsonify(LinkedInJobParser.get_selector_stats()), 200
+
 
 
 CHROMA_PATH = os.path.join(os.path.dirname(__file__), "rag", "chroma")
 app.register_blueprint(resume_bp)
+app.register_blueprint(saved_searches_bp)
+app.register_blueprint(scrape_tasks_bp)
 
 # Initialize Supabase client with Service Role Key (bypasses RLS)
 supabase_url = os.getenv("SUPABASE_URL")
@@ -90,89 +102,33 @@ else:
     print("❌ No Supabase keys found in environment variables")
     supabase = None
 
-def get_existing_job_links(user_id: str) -> set:
-    """Get all existing job application links for a user"""
-    if not supabase or not user_id:
-        return set()
-    
-    try:
-        result = supabase.table("user_jobs").select("application_link").eq("user_id", user_id).execute()
-        existing_links = {job['application_link'] for job in result.data if job.get('application_link')}
-        print(f"📋 Found {len(existing_links)} existing job links for user")
-        return existing_links
-    except Exception as e:
-        print(f"❌ Error fetching existing job links: {e}")
-        return set()
+# Page parse workers start now, before the scraper loop and request threads are busy
+start_parse_executor()
 
-def save_jobs_to_supabase(user_id: str, jobs_data: list, source: str = 'linkedin'):
-    """
-    Save jobs to Supabase database, avoiding duplicates
+@app.cli.command("sync-companies")
+def sync_company_gazetteer():
+    """Rebuild the learned company gazetteer from previously scraped user_jobs.company values
+
+    Operator-run (flask --app app sync-companies), not at startup: it reads every
+    user_jobs row. Review the result, since stored companies include names the
+    parser guessed from card text.
     """
     if not supabase:
-        print("⚠️ Supabase client not available, skipping database save")
-        return {"saved": 0, "duplicates": 0, "errors": 0}
-    
-    if not user_id:
-        print("❌ No user_id provided, cannot save jobs")
-        return {"saved": 0, "duplicates": 0, "errors": 0}
-    
-    saved_count = 0
-    duplicate_count = 0
-    error_count = 0
-    
-    print(f"💾 Attempting to save {len(jobs_data)} jobs to Supabase for user {user_id[:8]}...")
-    
-    # Get existing job links to avoid duplicates
-    existing_links = get_existing_job_links(user_id)
+        return
     
-    for job in jobs_data:
-        try:
-            application_link = job.get("application_link", "")
-            
-            # Check if job already exists
-            if application_link in existing_links:
-                print(f"🔄 Job already exists: {job.get('name', 'Unknown')} at {job.get('company', 'Unknown')}")
-                duplicate_count += 1
-                continue
-            
-            # Prepare job data for database
-            job_record = {
-                "user_id": user_id,
-                "job_name": job.get("name", "")[:500],  # Truncate to match VARCHAR(500)
-                "company": job.get("company", "")[:200],  # Truncate to match VARCHAR(200)
-                "location": job.get("location", "")[:200] if job.get("location") else None,
-                "location_type": job.get("location_type", "")[:50] if job.get("location_type") else None,
-                "job_type": job.get("job_type", "")[:100] if job.get("job_type") else None,
-                "posting_date": job.get("posting_date", "")[:100] if job.get("posting_date") else None,
-                "application_link": application_link,
-                "description": job.get("description", "") if job.get("description") else None,
-                "source": source
-            }
-            
-            # Insert the job
-            result = supabase.table("user_jobs").insert(job_record).execute()
-            
-            if result.data:
-                print(f"✅ Saved job: {job_record['job_name']} at {job_record['company']}")
-                saved_count += 1
-                # Add to existing links set to prevent duplicates in the same batch
-                existing_links.add(application_link)
-            else:
-                print(f"❌ Failed to save job: {job_record['job_name']} at {job_record['company']}")
-                error_count += 1
-                
-        except Exception as e:
-            print(f"❌ Error saving job '{job.get('name', 'Unknown')}': {str(e)}")
-            error_count += 1
-            continue
-    
-    print(f"📊 Database save summary: {saved_count} saved, {duplicate_count} duplicates, {error_count} errors")
-    
-    return {
-        "saved": saved_count,
-        "duplicates": duplicate_count,
-        "errors": error_count
-    }
+    try:
+        result = supabase.table("user_jobs").select("company").execute()
+        counts = {}
+        for job in result.data:
+            company = job.get('company')
+            if company:
+                counts[company] = counts.get(company, 0) + 1
+        added = company_gazetteer.rebuild(counts)
+        if added:
+            company_gazetteer.save()
+        print(f"🏢 Company gazetteer synced: {added} new companies learned from {len(result.data)} jobs")
+    except Exception as e:
+        print(f"❌ Error syncing company gazetteer: {e}")
 
 # Add explicit OPTIONS handler for /api/jobs
 @app.route('/api/jobs', methods=['OPTIONS'])
@@ -212,111 +168,6 @@ def debug():
     })
 '''
 
-async def scrape_linkedin_jobs_async(linkedin_username: str, linkedin_password: str, num_jobs: int = 56, search_title: str = "intern", location: str = "", user_id: str = None):
-    """Async wrapper for the LinkedIn scraper with smart duplicate detection"""
-    scraper = NoDriverLinkedInScraper()
-    jobs_data = []  # Initialize outside try block
-    
-    try:
-        # Setup browser
-        await scraper.setup_browser()
-        
-        # Login to LinkedIn
-        login_success = await scraper.login_to_linkedin(linkedin_username, linkedin_password)
-        
-        if not login_success:
-            return {"success": False, "error": "Failed to login to LinkedIn", "jobs": []}
-        
-        # Calculate initial max_pages based on num_jobs (7 jobs per page)
-        initial_max_pages = max(1, (num_jobs + 6) // 7)  # Round up division
-        
-        # Get existing job links to check for duplicates
-        existing_links = get_existing_job_links(user_id) if user_id else set()
-        
-        max_pages = initial_max_pages
-        total_new_jobs = 0
-        page_attempts = 0
-        max_attempts = initial_max_pages * 3  # Don't search forever
-        
-        print(f"🎯 Target: {num_jobs} jobs, Initial pages: {initial_max_pages}, Existing jobs: {len(existing_links)}")
-        
-        while total_new_jobs < num_jobs and page_attempts < max_attempts:
-            print(f"🔍 Scraping attempt with {max_pages} pages (attempt {page_attempts + 1})")
-            
-            # Clear previous jobs for this attempt
-            scraper.jobs = []
-            
-            # Scrape jobs with location support
-            jobs = await scraper.scrape_jobs(keywords=search_title, location=location, max_pages=max_pages)
-            
-            # Count new jobs (not in existing database)
-            new_jobs = []
-            duplicate_count = 0
-            
-            for job in jobs:
-                job_dict = job.model_dump()
-                application_link = job_dict.get("application_link", "")
-                
-                if application_link not in existing_links:
-                    new_jobs.append(job_dict)
-                    existing_links.add(application_link) # Add to set to prevent duplicates in same batch
-                else:
-                    duplicate_count += 1
-            
-            total_new_jobs = len(new_jobs)
-            
-            print(f"📊 Found {len(jobs)} total jobs, {total_new_jobs} new jobs, {duplicate_count} duplicates")
-            
-            # If we have enough new jobs, we're done
-            if total_new_jobs >= num_jobs:
-                jobs_data = new_jobs[:num_jobs]  # Take only the requested number
-                break
-            
-            # If we found mostly duplicates and not enough new jobs, increase search scope
-            duplicate_ratio = duplicate_count / max(len(jobs), 1)
-            
-            if duplicate_ratio > 0.7 and total_new_jobs < num_jobs * 0.5:  # More than 70% duplicates
-                max_pages = min(max_pages + 3, 20)  # Increase pages but cap at 20
-                print(f"🔄 High duplicate ratio ({duplicate_ratio:.1%}), increasing search to {max_pages} pages")
-            else:
-                # Not enough jobs found, but not due to duplicates
-                jobs_data = new_jobs
-                break
-            
-            page_attempts += 1
-        
-        if not jobs_data:
-            jobs_data = []
-        
-        print(f"✅ Successfully scraped {len(jobs_data)} new jobs after {page_attempts + 1} attempts")
-        
-    except Exception as e:
-        print(f"❌ Error during scraping: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        
-    finally:
-        # Clean up browser (this might fail, but we still want to return any jobs we got)
-        try:
-            await scraper.close()
-        except Exception as cleanup_error:
-            print(f"⚠️ Browser cleanup failed (ignoring): {cleanup_error}")
-    
-    # Always return the jobs we managed to scrape, even if cleanup failed
-    if jobs_data:
-        return {
-            "success": True,
-            "message": f"Successfully scraped {len(jobs_data)} new jobs",
-            "total_jobs": len(jobs_data),
-            "jobs": jobs_data
-        }
-    else:
-        return {
-            "success": False,
-            "error": "No new jobs were found",
-            "jobs": []
-        }
-
 @app.route('/api/jobs', methods=['POST'])
 def get_jobs():
     try:
@@ -378,10 +229,17 @@ def get_jobs():
         except (ValueError, TypeError):
             num_jobs = 56  # Default value
         
+        # A saved search the scheduler already scraped answers without a browser ("live": true forces a scrape)
+        if not data.get('live'):
+            cached = cached_search_jobs(user_id, search_title, location, num_jobs)
+            if cached is not None:
+                print(f"⚡ Returning {len(cached['jobs'])} pre-scraped jobs from saved search {cached['saved_search_id']} ({cached['scraped_at']})")
+                return jsonify(cached_jobs_response(cached))
+        
         print(f"🔍 Starting scraping: {num_jobs} jobs for '{search_title}' in '{location or 'Any location'}' for user: {user_id[:8]}...")
         
-        # Run the async scraper with all parameters
-        scraper_result = asyncio.run(scrape_linkedin_jobs_async(
+        # Run the async scraper on the scraper loop, where warm browser sessions live
+        scraper_result = run_scraper_coroutine(scrape_linkedin_jobs_async(
             linkedin_username=linkedin_username, 
             linkedin_password=linkedin_password, 
             num_jobs=num_jobs,
@@ -0,0 +1,361 @@
+# job_store.py
+"""
+Job Store - user_jobs persistence and the new-jobs scrape loop
+
+Shared by the Flask app (app.py) and the saved-search scheduler (scheduler.py),
+which runs in its own process and must not import the web app.
+"""
+import asyncio
+import os
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from jobs.main_nodriver import NoDriverLinkedInScraper
+from jobs.account_leases import AccountLeases
+from jobs.session_pool import SessionBusyError, browser_sessions
+from jobs.company_resolver import company_gazetteer
+from jobs.job_keys import canonical_job_key
+from jobs.scrape_log import PageSummary, end_run, get_logger, start_run
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_ANON_KEY")
+supabase: Optional[Client] = create_client(SUPABASE_URL, SUPABASE_KEY) if (SUPABASE_URL and SUPABASE_KEY) else None
+
+# The web app and the scheduler both import this module: one lease per LinkedIn account across them
+if supabase:
+    browser_sessions.account_lock = AccountLeases(supabase)
+
+def get_existing_job_links(user_id: str) -> set:
+    """Get all existing job application links for a user"""
+    if not supabase or not user_id:
+        return set()
+    
+    try:
+        result = supabase.table("user_jobs").select("application_link").eq("user_id", user_id).execute()
+        existing_links = {job['application_link'] for job in result.data if job.get('application_link')}
+        print(f"📋 Found {len(existing_links)} existing job links for user")
+        return existing_links
+    except Exception as e:
+        print(f"❌ Error fetching existing job links: {e}")
+        return set()
+
+async def load_known_keys(user_id: str) -> set:
+    """
+    Canonical keys of the user's saved jobs, for use inside scraper coroutines.
+    The Supabase client is blocking, so the query runs in a worker thread
+    instead of stalling every warm session on the shared scraper loop.
+    """
+    if not user_id:
+        return set()
+    links = await asyncio.get_running_loop().run_in_executor(None, get_existing_job_links, user_id)
+    return {canonical_job_key(link) for link in links}
+
+LINKS_PER_QUERY = 50  # application links per .in_() filter, keeps the request URL short
+
+def get_jobs_by_links(user_id: str, links: List[str]) -> list:
+    """The user's saved jobs with these application links, newest first"""
+    if not supabase or not user_id or not links:
+        return []
+    
+    records = []
+    try:
+        for start in range(0, len(links), LINKS_PER_QUERY):
+            chunk = links[start:start + LINKS_PER_QUERY]
+            result = supabase.table("user_jobs").select("*").eq("user_id", user_id).in_("application_link", chunk).execute()
+            records.extend(result.data or [])
+    except Exception as e:
+        print(f"❌ Error fetching saved jobs: {e}")
+        return []
+    records.sort(key=lambda record: record.get("created_at") or "", reverse=True)
+    return records
+
+def job_from_record(record: dict) -> dict:
+    """A user_jobs row in the shape the scraper returns jobs in (name, company, ...)"""
+    return {
+        "name": record.get("job_name", ""),
+        "company": record.get("company", ""),
+        "location": record.get("location") or "",
+        "location_type": record.get("location_type") or "",
+        "job_type": record.get("job_type") or "",
+        "posting_date": record.get("posting_date") or "",
+        "application_link": record.get("application_link", ""),
+        "description": record.get("description") or "",
+    }
+
+jobs_log = get_logger("app.jobs")
+
+def save_jobs_to_supabase(user_id: str, jobs_data: list, source: str = 'linkedin'):
+    """
+    Save jobs to Supabase database, avoiding duplicates
+    """
+    if not supabase:
+        print("⚠️ Supabase client not available, skipping database save")
+        return {"saved": 0, "duplicates": 0, "errors": 0, "saved_links": []}
+    
+    if not user_id:
+        print("❌ No user_id provided, cannot save jobs")
+        return {"saved": 0, "duplicates": 0, "errors": 0, "saved_links": []}
+    
+    saved_count = 0
+    duplicate_count = 0
+    error_count = 0
+    saved_companies = []
+    saved_links = []
+    log_run = start_run()
+    summary = PageSummary(jobs_log, "jobs_saved", user=user_id[:8], source=source, jobs=len(jobs_data))
+    
+    jobs_log.info("save_start", "💾 Attempting to save %d jobs to Supabase for user %s...", len(jobs_data), user_id[:8])
+    
+    # Get existing job keys to avoid duplicates (tracking parameters don't hide a known job)
+    existing_keys = {canonical_job_key(link) for link in get_existing_job_links(user_id)}
+    
+    for job in jobs_data:
+        try:
+            application_link = job.get("application_link", "")
+            job_key = canonical_job_key(application_link, source=source)
+            
+            # Check if job already exists
+            if job_key and job_key in existing_keys:
+                jobs_log.sampled(logging.DEBUG, "save_duplicate", "🔄 Job already exists: %s at %s",
+                                 job.get('name', 'Unknown'), job.get('company', 'Unknown'))
+                duplicate_count += 1
+                continue
+            
+            # Prepare job data for database
+            job_record = {
+                "user_id": user_id,
+                "job_name": job.get("name", "")[:500],  # Truncate to match VARCHAR(500)
+                "company": job.get("company", "")[:200],  # Truncate to match VARCHAR(200)
+                "location": job.get("location", "")[:200] if job.get("location") else None,
+                "location_type": job.get("location_type", "")[:50] if job.get("location_type") else None,
+                "job_type": job.get("job_type", "")[:100] if job.get("job_type") else None,
+                "posting_date": job.get("posting_date", "")[:100] if job.get("posting_date") else None,
+                "application_link": application_link,
+                "description": job.get("description", "") if job.get("description") else None,
+                "source": source
+            }
+            
+            # Insert the job
+            result = supabase.table("user_jobs").insert(job_record).execute()
+            
+            if result.data:
+                jobs_log.sampled(logging.DEBUG, "save_ok", "✅ Saved job: %s at %s",
+                                 job_record['job_name'], job_record['company'])
+                saved_count += 1
+                if job.get("company_verified"):
+                    saved_companies.append(job_record['company'])
+                saved_links.append(application_link)
+                # Add to existing keys set to prevent duplicates in the same batch
+                existing_keys.add(job_key)
+            else:
+                jobs_log.sampled(logging.WARNING, "save_failed", "❌ Failed to save job: %s at %s",
+                                 job_record['job_name'], job_record['company'])
+                error_count += 1
+                
+        except Exception as e:
+            jobs_log.sampled(logging.WARNING, "save_error", "❌ Error saving job '%s': %s", job.get('name', 'Unknown'), e)
+            error_count += 1
+            continue
+    
+    summary.set(saved=saved_count, duplicates=duplicate_count, errors=error_count)
+    summary.emit("📊 Database save summary")
+    end_run(log_run)
+    
+    # Grow the known-company gazetteer from company names read from a dedicated field
+    try:
+        if company_gazetteer.learn(saved_companies):
+            company_gazetteer.save()
+    except Exception as e:
+        print(f"⚠️ Could not update company gazetteer: {e}")
+    
+    return {
+        "saved": saved_count,
+        "duplicates": duplicate_count,
+        "errors": error_count,
+        "saved_links": saved_links
+    }
+
+async def scrape_new_jobs(scraper: NoDriverLinkedInScraper, num_jobs: int, search_title: str, location: str,
+                          user_id: str = None, known_keys: set = None) -> list:
+    """
+    Scrape with a logged-in scraper until num_jobs jobs not yet saved for the user are found.
+    Widening the search continues from the next unseen page; jobs from earlier attempts are kept.
+    known_keys (canonical keys to skip) is loaded from the user's saved jobs unless given,
+    so batch queries can share one set.
+    """
+    jobs_data = []
+    
+    # Calculate initial max_pages based on num_jobs and the measured results per page
+    jobs_per_page = scraper.page_stride.stride
+    initial_max_pages = max(1, (num_jobs + jobs_per_page - 1) // jobs_per_page)  # Round up division
+    
+    # Canonical keys of the user's saved jobs: the scraper drops these before enrichment
+    if known_keys is not None:
+        existing_keys = known_keys
+    else:
+        existing_keys = await load_known_keys(user_id)
+    
+    max_pages = initial_max_pages
+    total_new_jobs = 0
+    page_attempts = 0
+    max_attempts = initial_max_pages * 3  # Don't search forever
+    
+    print(f"🎯 Target: {num_jobs} jobs, Initial pages: {initial_max_pages}, Existing jobs: {len(existing_keys)}")
+    
+    # Cursor: pages [0, next_page) are loaded and their jobs counted below
+    scraper.jobs = []
+    next_page = 0
+    new_jobs = []
+    duplicate_count = 0
+    
+    while total_new_jobs < num_jobs and page_attempts < max_attempts:
+        print(f"🔍 Scraping attempt with {max_pages} pages (attempt {page_attempts + 1}, from page {next_page + 1})")
+        
+        # Scrape only the pages this attempt added, with location support; jobs whose key
+        # is in existing_keys are skipped (and counted) by the scraper before enrichment
+        seen = len(scraper.jobs)
+        jobs = await scraper.scrape_jobs(keywords=search_title, location=location, max_pages=max_pages,
+                                         start_page=next_page, known_keys=existing_keys)
+        # Resume after the last page the scraper actually loaded, not at max_pages
+        next_page = scraper.next_page
+        
+        # Everything the scraper returned for this attempt's pages is new
+        new_jobs.extend(job.model_dump() for job in jobs[seen:])
+        duplicate_count = scraper.duplicates_skipped
+        total_new_jobs = len(new_jobs)
+        
+        print(f"📊 Found {len(jobs) + duplicate_count} total jobs, {total_new_jobs} new jobs, {duplicate_count} duplicates")
+        
+        # If we have enough new jobs, we're done
+        if total_new_jobs >= num_jobs:
+            jobs_data = new_jobs[:num_jobs]  # Take only the requested number
+            break
+        
+        # If we found mostly duplicates and not enough new jobs, increase search scope
+        duplicate_ratio = duplicate_count / max(len(jobs) + duplicate_count, 1)
+        
+        if next_page < max_pages:
+            # The scraper stopped before max_pages (results ran out or pages failed to load)
+            jobs_data = new_jobs
+            break
+        
+        if duplicate_ratio > 0.7 and total_new_jobs < num_jobs * 0.5 and max_pages < 20:  # More than 70% duplicates
+            max_pages = min(max_pages + 3, 20)  # Increase pages but cap at 20
+            print(f"🔄 High duplicate ratio ({duplicate_ratio:.1%}), increasing search to {max_pages} pages")
+        else:
+            # Not enough jobs found, but not due to duplicates
+            jobs_data = new_jobs
+            break
+        
+        page_attempts += 1
+    
+    if not jobs_data:
+        # Out of attempts: still return what the earlier attempts found
+        jobs_data = new_jobs[:num_jobs]
+    
+    print(f"✅ Successfully scraped {len(jobs_data)} new jobs after {page_attempts + 1} attempts")
+    
+    return jobs_data
+
+async def scrape_linkedin_jobs_async(linkedin_username: str, linkedin_password: str, num_jobs: int = 56, search_title: str = "intern", location: str = "", user_id: str = None, progress=None):
+    """
+    Async wrapper for the LinkedIn scraper with smart duplicate detection.
+    progress (a jobs.scrape_progress.ScrapeProgress) is attached to the borrowed
+    scraper for this scrape only.
+    """
+    jobs_data = []  # Initialize outside try block
+    browser_memory = {}
+    
+    try:
+        # Borrow a warm, logged-in browser for this account (starts one and logs in if needed)
+        async with browser_sessions.session(linkedin_username, linkedin_password) as scraper:
+            if scraper is None:
+                return {"success": False, "error": "Failed to login to LinkedIn", "jobs": []}
+            
+            scraper.progress = progress
+            try:
+                jobs_data = await scrape_new_jobs(scraper, num_jobs, search_title, location, user_id)
+            finally:
+                scraper.progress = None
+            browser_memory = scraper.last_scrape_memory
+        
+    except SessionBusyError as e:
+        print(f"⏳ {e}")
+        return {"success": False, "error": str(e), "jobs": []}
+    except Exception as e:
+        print(f"❌ Error during scraping: {str(e)}")
+        import traceback
+        traceback.print_exc()
+    
+    # Always return the jobs we managed to scrape, even if cleanup failed
+    if jobs_data:
+        return {
+            "success": True,
+            "message": f"Successfully scraped {len(jobs_data)} new jobs",
+            "total_jobs": len(jobs_data),
+            "browser_memory": browser_memory,
+            "jobs": jobs_data
+        }
+    else:
+        return {
+            "success": False,
+            "error": "No new jobs were found",
+            "jobs": []
+        }
+
+async def scrape_linkedin_batch_async(linkedin_username: str, linkedin_password: str, queries: list, num_jobs: int = 25, user_id: str = None, progress=None):
+    """
+    Run several (search title, location) queries in one warm browser session, as
+    concurrent search tabs. Saved jobs are loaded and deduped once for the whole
+    batch, and a job found by one query is not returned again by another.
+    progress is shared by the batch's queries (see scrape_linkedin_jobs_async).
+    """
+    results = []
+    browser_memory = {}
+    
+    try:
+        async with browser_sessions.session(linkedin_username, linkedin_password) as scraper:
+            if scraper is None:
+                return {"success": False, "error": "Failed to login to LinkedIn", "results": []}
+            
+            # Shared by every query: saved jobs plus everything the batch has found so far
+            known_keys = await load_known_keys(user_id)
+            
+            async def scrape_query(view, search_title, location):
+                return await scrape_new_jobs(view, num_jobs, search_title, location, known_keys=known_keys)
+            
+            scraper.progress = progress
+            try:
+                results = await scraper.scrape_batch(queries, known_keys=known_keys, scrape_query=scrape_query)
+            finally:
+                scraper.progress = None
+            browser_memory = scraper.last_scrape_memory
+    
+    except SessionBusyError as e:
+        print(f"⏳ {e}")
+        return {"success": False, "error": str(e), "results": []}
+    except Exception as e:
+        print(f"❌ Error during batch scraping: {str(e)}")
+        import traceback
+        traceback.print_exc()
+    
+    total_jobs = sum(len(result["jobs"]) for result in results)
+    if total_jobs:
+        return {
+            "success": True,
+            "message": f"Successfully scraped {total_jobs} new jobs across {len(results)} searches",
+            "total_jobs": total_jobs,
+            "browser_memory": browser_memory,
+            "results": results
+        }
+    else:
+        return {
+            "success": False,
+            "error": "No new jobs were found",
+            "results": results
+        }
@@ -0,0 +1,152 @@
+"""
+Account Leases - One scraping browser per LinkedIn account across processes
+
+The web app and the saved-search scheduler (scheduler.py) each keep their own
+browser session pool, and may run on different hosts. Without coordination the
+same LinkedIn account can be logged in and scraping in two Chromium instances
+at once. A lease is a row per account in the linkedin_account_leases table
+(schema in the README):
+  * acquiring inserts the row, or takes it over when its lease expired
+  * the holder renews expires_at every ACCOUNT_LEASE_TTL / 3 while it scrapes
+  * releasing expires it right away; a crashed holder's lease runs out on its own
+  * last_started_at is set on every acquire, so the scheduler paces an account
+    by its last run from either process
+Rows are keyed by a hash of the username, never the username itself.
+
+The Supabase client is blocking, so every query runs in the default executor
+instead of on the scraper loop. When the table is missing or the database
+errors, leases fail open (scraping goes on without the cross-process lock).
+
+Environment:
+  ACCOUNT_LEASE_TTL   seconds a lease lasts without renewal (default 300)
+  ACCOUNT_LEASE_POLL  seconds between attempts to take a held lease (default 2)
+"""
+
+import asyncio
+import hashlib
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jobs.scrape_log import get_logger
+
+log = get_logger(__name__)
+
+LEASE_TABLE = "linkedin_account_leases"
+LEASE_TTL = float(os.getenv("ACCOUNT_LEASE_TTL", "300"))
+LEASE_POLL = float(os.getenv("ACCOUNT_LEASE_POLL", "2"))
+UNIQUE_VIOLATION = "23505"  # Postgres error code of a duplicate primary key
+
+
+def account_hash(username: str) -> str:
+    return hashlib.sha256((username or "").strip().lower().encode("utf-8")).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class AccountLeases:
+    """Cross-process per-account lock backed by a Supabase table"""
+
+    def __init__(self, client, ttl: float = LEASE_TTL, poll: float = LEASE_POLL):
+        self.client = client
+        self.ttl = ttl
+        self.poll = poll
+
+    @asynccontextmanager
+    async def hold(self, username: str, timeout: float):
+        """
+        Hold the account's lease for the body of the with block
+
+        Yields:
+            True once held, False when another process kept it for timeout seconds
+        """
+        key = account_hash(username)
+        holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        deadline = time.monotonic() + timeout
+        while not await self._run(self._try_acquire, key, holder):
+            if time.monotonic() + self.poll > deadline:
+                yield False
+                return
+            await asyncio.sleep(self.poll)
+
+        renewer = asyncio.get_running_loop().create_task(self._renew_until_cancelled(key, holder))
+        try:
+            yield True
+        finally:
+            renewer.cancel()
+            await self._run(self._release, key, holder)
+
+    async def last_started(self, username: str) -> Optional[float]:
+        """Epoch seconds the account's lease was last taken by any process (None when unknown)"""
+        return await self._run(self._last_started, account_hash(username))
+
+    @staticmethod
+    async def _run(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _try_acquire(self, key: str, holder: str) -> bool:
+        now = _now()
+        row = {
+            "holder": holder,
+            "expires_at": (now + timedelta(seconds=self.ttl)).isoformat(),
+            "last_started_at": now.isoformat(),
+        }
+        try:
+            self.client.table(LEASE_TABLE).insert(dict(row, account_hash=key)).execute()
+            return True
+        except Exception as e:
+            if getattr(e, "code", None) != UNIQUE_VIOLATION:
+                log.warning("lease_unavailable", "⚠️ Account lease unavailable, scraping without it: %s", e)
+                return True
+        try:
+            # Take over a lease whose holder stopped renewing it
+            result = (self.client.table(LEASE_TABLE).update(row)
+                      .eq("account_hash", key).lt("expires_at", now.isoformat()).execute())
+        except Exception as e:
+            log.warning("lease_unavailable", "⚠️ Account lease unavailable, scraping without it: %s", e)
+            return True
+        return bool(result.data)
+
+    def _renew(self, key: str, holder: str) -> bool:
+        expires_at = (_now() + timedelta(seconds=self.ttl)).isoformat()
+        try:
+            result = (self.client.table(LEASE_TABLE).update({"expires_at": expires_at})
+                      .eq("account_hash", key).eq("holder", holder).execute())
+        except Exception as e:
+            log.warning("lease_renew_failed", "⚠️ Could not renew account lease: %s", e)
+            return True  # transient: try again on the next tick
+        return bool(result.data)
+
+    async def _renew_until_cancelled(self, key: str, holder: str):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            if not await self._run(self._renew, key, holder):
+                log.warning("lease_lost", "⚠️ Account lease expired mid-scrape; another process may take the account")
+                return
+
+    def _release(self, key: str, holder: str):
+        try:
+            (self.client.table(LEASE_TABLE).update({"expires_at": _now().isoformat()})
+             .eq("account_hash", key).eq("holder", holder).execute())
+        except Exception as e:
+            log.warning("lease_release_failed", "⚠️ Could not release account lease (it expires on its own): %s", e)
+
+    def _last_started(self, key: str) -> Optional[float]:
+        try:
+            result = self.client.table(LEASE_TABLE).select("last_started_at").eq("account_hash", key).execute()
+        except Exception as e:
+            log.warning("lease_unavailable", "⚠️ Could not read account lease: %s", e)
+            return None
+        value = (result.data or [{}])[0].get("last_started_at")
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
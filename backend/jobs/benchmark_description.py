@@ -0,0 +1,88 @@
+"""
+Benchmark the description fallback on the saved LinkedIn pages
+
+Run from backend/:  python -m jobs.benchmark_description
+"""
+import glob
+import os
+import re
+import time
+from jobs.linkedin_parser import _largest_text_block
+from jobs.parse_engine import get_parse_engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAVED_PAGES = [
+    'jobs/nodriver_debug_page_*.html',
+    'nodriver_debug_page_*.html',
+    'linkedin/debug_page_*.html',
+    'linkedin/linkedin_raw_content.html',
+]
+
+
+def naive_largest_text(soup) -> str:
+    """The previous fallback: serialize every container and sort by length"""
+    candidates = sorted(
+        (n.get_text(" ", strip=True) for n in soup.find_all(['div', 'section', 'article'])),
+        key=lambda t: len(t),
+        reverse=True
+    )
+    for c in candidates[:5]:
+        if len(c) > 200:
+            return re.sub(r'\s+', ' ', c).strip()
+    return ""
+
+
+def linear_largest_text(soup) -> str:
+    """The current fallback: one bottom-up pass, then serialize the winner only"""
+    node, length = _largest_text_block(soup)
+    if node is not None and length > 200:
+        return re.sub(r'\s+', ' ', node.get_text(" ", strip=True)).strip()
+    return ""
+
+
+def benchmark_file(filename, engine, repeat: int = 3):
+    """Time both fallbacks on one page and check they agree"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        soup = engine.parse(f.read())
+
+    timings = {}
+    results = {}
+    for name, fn in [('naive', naive_largest_text), ('linear', linear_largest_text)]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results[name] = fn(soup)
+        timings[name] = (time.perf_counter() - start) / repeat
+
+    return timings, results['naive'] == results['linear']
+
+
+def main():
+    """Benchmark the fallback on every saved page"""
+    engine = get_parse_engine()
+    files = sorted(
+        path for pattern in SAVED_PAGES
+        for path in glob.glob(os.path.join(BACKEND_DIR, pattern))
+    )
+    if not files:
+        print("❌ No saved pages found")
+        return
+
+    total_naive = total_linear = 0.0
+    mismatches = 0
+    print(f"🧪 Benchmarking description fallback on {len(files)} pages (engine: {engine.name})")
+    for filename in files:
+        timings, same = benchmark_file(filename, engine)
+        total_naive += timings['naive']
+        total_linear += timings['linear']
+        mismatches += 0 if same else 1
+        print(f"   {os.path.relpath(filename, BACKEND_DIR):45} naive {timings['naive'] * 1000:7.1f} ms   "
+              f"linear {timings['linear'] * 1000:7.1f} ms   {'✅' if same else '❌ MISMATCH'}")
+
+    speedup = total_naive / total_linear if total_linear else float('inf')
+    print(f"\n📊 naive {total_naive * 1000:.1f} ms, linear {total_linear * 1000:.1f} ms ({speedup:.1f}x), "
+          f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
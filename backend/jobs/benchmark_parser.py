@@ -0,0 +1,201 @@
+"""
+Benchmark and accuracy check for the LinkedIn parsers on the saved pages
+
+Run from backend/:
+    python -m jobs.benchmark_parser                  # throughput + diff against golden JSON
+    python -m jobs.benchmark_parser --update-golden  # re-record the golden JSON
+    python -m jobs.benchmark_parser --engine html.parser --repeat 5
+"""
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from jobs.benchmark_description import BACKEND_DIR, SAVED_PAGES
+from jobs.linkedin_parser import LinkedInJobParser, extract_description_from_job_html
+from jobs.parse_engine import get_parse_engine
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'golden_corpus.json')
+
+# Fields compared against the golden JSON, in report order
+JOB_FIELDS = ['name', 'company', 'location', 'location_type', 'job_type', 'posting_date', 'application_link', 'description']
+
+TODAY_PLACEHOLDER = '<today>'
+
+
+def corpus_files() -> list:
+    """Saved pages, as paths relative to backend/"""
+    return sorted(
+        os.path.relpath(path, BACKEND_DIR)
+        for pattern in SAVED_PAGES
+        for path in glob.glob(os.path.join(BACKEND_DIR, pattern))
+    )
+
+
+def parse_page(html_content: str, engine) -> tuple:
+    """Run both parsers on one page with their console output silenced"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        jobs = LinkedInJobParser.extract_jobs_from_html(html_content, engine)
+        description = extract_description_from_job_html(html_content, engine)
+    return jobs, description
+
+
+def page_record(jobs, description: str) -> dict:
+    """Comparable snapshot of one page's parse results"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    records = []
+    for job in jobs:
+        record = {field: getattr(job, field) for field in JOB_FIELDS}
+        # Cards without a date get today's date, which would never match a recorded run
+        if record['posting_date'] == today:
+            record['posting_date'] = TODAY_PLACEHOLDER
+        records.append(record)
+    return {
+        'jobs': records,
+        'description': {
+            'length': len(description),
+            'sha1': hashlib.sha1(description.encode('utf-8')).hexdigest(),
+            'preview': description[:120],
+        },
+    }
+
+
+def diff_page(expected: dict, actual: dict) -> list:
+    """Human-readable differences between two page records"""
+    diffs = []
+    expected_jobs, actual_jobs = expected.get('jobs', []), actual['jobs']
+    if len(expected_jobs) != len(actual_jobs):
+        diffs.append(f"job count {len(expected_jobs)} -> {len(actual_jobs)}")
+    for i, (old, new) in enumerate(zip(expected_jobs, actual_jobs), 1):
+        for field in JOB_FIELDS:
+            if old.get(field) != new.get(field):
+                diffs.append(f"job {i} {field}: {old.get(field)!r} -> {new.get(field)!r}")
+    if expected.get('description', {}).get('sha1') != actual['description']['sha1']:
+        diffs.append(f"description: {expected.get('description', {}).get('preview')!r} -> "
+                     f"{actual['description']['preview']!r}")
+    return diffs
+
+
+def run_accuracy(files: list, pages: dict, engine) -> dict:
+    """Parse every page from a clean selector state and return the page records"""
+    results = {}
+    for filename in files:
+        # Registries learn across pages; reset so each page is judged on its own
+        LinkedInJobParser.reset_selectors()
+        jobs, description = parse_page(pages[filename], engine)
+        results[filename] = page_record(jobs, description)
+    return results
+
+
+def run_throughput(files: list, pages: dict, engine, repeat: int) -> tuple:
+    """Parse the whole corpus `repeat` times; returns (seconds per pass, cards per pass)"""
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cards = 0
+        for filename in files:
+            jobs, _ = parse_page(pages[filename], engine)
+            cards += len(jobs)
+    return (time.perf_counter() - start) / repeat, cards
+
+
+def run_peak_memory(files: list, pages: dict, engine) -> dict:
+    """Peak traced Python allocation while parsing each page, in bytes"""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for filename in files:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            parse_page(pages[filename], engine)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks[filename] = peak - baseline
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def load_golden() -> dict:
+    if not os.path.exists(GOLDEN_PATH):
+        return {}
+    with open(GOLDEN_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_golden(results: dict):
+    os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+    with open(GOLDEN_PATH, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+    print(f"💾 Saved golden results for {len(results)} pages to {os.path.relpath(GOLDEN_PATH, BACKEND_DIR)}")
+
+
+def main(argv=None) -> int:
+    """Benchmark the parsers on the saved pages and check them against the golden JSON"""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--engine', help='parse engine (defaults to the fastest available)')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='timed passes over the corpus')
+    arg_parser.add_argument('--update-golden', action='store_true', help='record the current output as golden')
+    args = arg_parser.parse_args(argv)
+
+    engine = get_parse_engine(args.engine)
+    files = corpus_files()
+    if not files:
+        print("❌ No saved pages found")
+        return 1
+
+    pages = {}
+    for filename in files:
+        with open(os.path.join(BACKEND_DIR, filename), 'r', encoding='utf-8') as f:
+            pages[filename] = f.read()
+    total_mb = sum(len(html) for html in pages.values()) / 1e6
+    print(f"🧪 {len(files)} saved pages ({total_mb:.1f} MB), engine: {engine.name}")
+
+    # Accuracy
+    results = run_accuracy(files, pages, engine)
+    if args.update_golden:
+        save_golden(results)
+        failures = 0
+    else:
+        golden = load_golden()
+        failures = 0
+        for filename in files:
+            if filename not in golden:
+                print(f"   {filename:45} ⚠️ no golden record (run with --update-golden)")
+                continue
+            diffs = diff_page(golden[filename], results[filename])
+            failures += 1 if diffs else 0
+            print(f"   {filename:45} {len(results[filename]['jobs']):3} jobs   "
+                  f"{'✅' if not diffs else f'❌ {len(diffs)} differences'}")
+            for line in diffs[:10]:
+                print(f"      {line}")
+            if len(diffs) > 10:
+                print(f"      ... {len(diffs) - 10} more")
+        for filename in sorted(set(golden) - set(files)):
+            print(f"   {filename:45} ⚠️ in golden JSON but missing from the corpus")
+
+    # Throughput
+    seconds, cards = run_throughput(files, pages, engine, max(1, args.repeat))
+    print(f"\n⚡ {len(files) / seconds:.1f} pages/sec, {cards / seconds:.1f} cards/sec "
+          f"({seconds * 1000:.0f} ms per pass, {cards} cards)")
+
+    # Memory
+    peaks = run_peak_memory(files, pages, engine)
+    worst = max(peaks, key=peaks.get)
+    print(f"🧠 peak traced memory {peaks[worst] / 1e6:.1f} MB ({worst}), "
+          f"mean {sum(peaks.values()) / len(peaks) / 1e6:.1f} MB per page")
+
+    if failures:
+        print(f"\n❌ {failures} pages differ from the golden JSON")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Browser Governor - Budgets for Chromium processes and a reaper for the ones left behind
+
+A nodriver browser is a tree of Chromium processes (browser, GPU, utility and
+one renderer per site). browser.stop() only signals the root, and close()
+paths that swallow errors leave renderers (or the whole tree, when the root
+hung) running; over a day a container collects them until it OOMs. The
+governor:
+  * caps how many browsers are alive at once (setup waits for a free slot)
+  * tracks every browser's process tree, samples its RSS during scrapes and
+    flags a browser whose tree goes over the per-browser budget so its owner
+    recycles it instead of reusing it
+  * after close(), kills whatever is still alive from that tree
+  * kills orphaned nodriver Chromium trees (parent gone, uc_ temp profile)
+    that no live browser owns
+  * reports each scrape's peak RSS and process count
+
+Tab recycling after N navigations lives with the tabs (jobs.detail_pool and
+the scraper's main tab) and reads TAB_MAX_NAVIGATIONS from here.
+
+Memory and PID tracking need psutil; without it only the browser cap and the
+root PID kill remain. This module does not import jobs.* so the Indeed
+scraper's flat imports can use it too.
+
+Environment:
+  BROWSER_MAX_CONCURRENT     browsers alive at once per process (default 3)
+  BROWSER_MAX_RSS_MB         RSS budget of one browser's process tree (default 1500, 0 = none)
+  BROWSER_TAB_MAX_NAVIGATIONS  navigations before a tab is replaced (default 50, 0 = never)
+  BROWSER_SLOT_TIMEOUT       seconds setup waits for a browser slot (default 300)
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+try:
+    import psutil
+except ImportError:  # optional: no memory figures, no child-PID reaping
+    psutil = None
+
+MAX_CONCURRENT_BROWSERS = max(1, int(os.getenv("BROWSER_MAX_CONCURRENT", "3")))
+MAX_BROWSER_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", "1500"))
+TAB_MAX_NAVIGATIONS = max(0, int(os.getenv("BROWSER_TAB_MAX_NAVIGATIONS", "50")))
+SLOT_TIMEOUT = float(os.getenv("BROWSER_SLOT_TIMEOUT", "300"))
+
+SAMPLE_INTERVAL = 2.0  # seconds between RSS samples while a scrape runs
+EXIT_GRACE = 3.0  # seconds stop() gets before stragglers are killed
+PROFILE_MARKER = "uc_"  # nodriver's temporary --user-data-dir prefix
+
+MB = 1024 * 1024
+
+
+def browser_pid(browser) -> Optional[int]:
+    """PID of a nodriver browser's root Chromium process"""
+    pid = getattr(browser, "_process_pid", None)
+    if pid is None:
+        pid = getattr(getattr(browser, "_process", None), "pid", None)
+    return pid
+
+
+class BrowserHandle:
+    """One governed browser: its process tree and memory figures"""
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        # pid -> psutil.Process of the live tree; a Process remembers its create_time,
+        # so a PID the OS hands to an unrelated process is never mistaken for ours
+        self.tree: Dict[int, "psutil.Process"] = {}
+        self._root_seen = False
+        self.rss_mb = 0.0
+        self.processes = 0
+        self.over_budget = False
+        self.scrape_peak_rss_mb = 0.0
+        self.scrape_peak_processes = 0
+        self.released = False
+
+    @property
+    def pids(self) -> Set[int]:
+        """PIDs of the tree's processes still alive at the last refresh"""
+        if psutil is None:
+            return {self.pid} if self.pid else set()
+        return set(self.tree)
+
+    def refresh(self) -> float:
+        """Pick up new child processes, forget exited ones and return the tree's current RSS in MB"""
+        if psutil is None or not self.pid:
+            return 0.0
+        # Exited processes are dropped, their PIDs may be reused by now
+        self.tree = {pid: process for pid, process in self.tree.items() if process.is_running()}
+        processes = []
+        try:
+            root = self.tree.get(self.pid)
+            if root is None and not self._root_seen:
+                self._root_seen = True
+                root = psutil.Process(self.pid)  # first look, while the browser is known to run
+            if root is not None:
+                processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            pass
+        # Orphaned children of an exited root stay in the tree until they exit too
+        found = {process.pid for process in processes}
+        processes += [process for pid, process in self.tree.items() if pid not in found]
+        rss = 0
+        for process in processes:
+            self.tree.setdefault(process.pid, process)
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                continue
+        self.rss_mb = rss / MB
+        self.processes = len(processes)
+        self.scrape_peak_rss_mb = max(self.scrape_peak_rss_mb, self.rss_mb)
+        self.scrape_peak_processes = max(self.scrape_peak_processes, self.processes)
+        return self.rss_mb
+
+    def start_scrape(self):
+        self.scrape_peak_rss_mb = 0.0
+        self.scrape_peak_processes = 0
+
+    def scrape_stats(self) -> Dict:
+        return {
+            "peak_rss_mb": round(self.scrape_peak_rss_mb, 1),
+            "peak_processes": self.scrape_peak_processes,
+            "rss_mb": round(self.rss_mb, 1),
+            "over_budget": self.over_budget,
+        }
+
+
+class BrowserGovernor:
+    """
+    Process-wide browser budget. Usage from a scraper:
+
+        handle = await governor.launch(lambda: uc.start(...))   # waits for a slot
+        monitor = governor.monitor(handle)                       # during a scrape
+        ...; monitor.cancel(); handle.scrape_stats()
+        await governor.release(handle)                           # after browser.stop()
+    """
+
+    def __init__(self, max_browsers: int = MAX_CONCURRENT_BROWSERS, max_rss_mb: float = MAX_BROWSER_RSS_MB):
+        self.max_browsers = max_browsers
+        self.max_rss_mb = max_rss_mb
+        # threading primitive: scrapers may run on different event loops
+        self._slots = threading.BoundedSemaphore(max_browsers)
+        self._handles: List[BrowserHandle] = []
+        self._lock = threading.Lock()
+
+    async def launch(self, start_browser, timeout: float = SLOT_TIMEOUT):
+        """
+        Start a browser once a slot is free
+
+        Args:
+            start_browser: Zero-argument coroutine function returning a nodriver Browser
+            timeout: Seconds to wait for a slot before giving up
+
+        Returns:
+            (browser, BrowserHandle)
+        """
+        deadline = time.monotonic() + timeout
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"No browser slot free after {timeout:.0f}s ({self.max_browsers} browsers running)")
+            await asyncio.sleep(0.25)
+
+        self.reap_orphans()
+        try:
+            browser = await start_browser()
+        except BaseException:
+            self._slots.release()
+            raise
+        handle = BrowserHandle(browser_pid(browser))
+        handle.refresh()
+        with self._lock:
+            self._handles.append(handle)
+        return browser, handle
+
+    def sample(self, handle: Optional[BrowserHandle]) -> float:
+        """Refresh a browser's RSS; flags it over_budget past max_rss_mb"""
+        if handle is None:
+            return 0.0
+        rss_mb = handle.refresh()
+        if self.max_rss_mb > 0 and rss_mb > self.max_rss_mb and not handle.over_budget:
+            handle.over_budget = True
+            print(f"🐘 Browser {handle.pid} uses {rss_mb:.0f} MB (budget {self.max_rss_mb:.0f} MB), recycling it after this scrape")
+        return rss_mb
+
+    def monitor(self, handle: Optional[BrowserHandle], interval: float = SAMPLE_INTERVAL) -> asyncio.Task:
+        """Task sampling the browser's RSS until cancelled (resets the scrape peak)"""
+        async def run():
+            while True:
+                self.sample(handle)
+                await asyncio.sleep(interval)
+
+        if handle is not None:
+            handle.start_scrape()
+        return asyncio.get_running_loop().create_task(run())
+
+    async def release(self, handle: Optional[BrowserHandle]) -> int:
+        """
+        Free the browser's slot and kill whatever is left of its process tree
+
+        Returns:
+            Number of processes that had to be killed
+        """
+        if handle is None or handle.released:
+            return 0
+        handle.released = True
+        with self._lock:
+            if handle in self._handles:
+                self._handles.remove(handle)
+        try:
+            handle.refresh()  # children spawned since the last sample
+            return await asyncio.get_running_loop().run_in_executor(None, self._kill_tree, handle)
+        finally:
+            self._slots.release()
+
+    def _kill_tree(self, handle: BrowserHandle) -> int:
+        if psutil is None:
+            return self._kill_pids_without_psutil(handle.pids)
+        # The Process objects seen while the browser ran: kill() checks they are
+        # still the same processes, so a reused PID is left alone
+        processes = list(handle.tree.values())
+        _, alive = psutil.wait_procs(processes, timeout=EXIT_GRACE)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                continue
+        if alive:
+            psutil.wait_procs(alive, timeout=EXIT_GRACE)
+            print(f"🧟 Killed {len(alive)} Chromium processes left after close()")
+        return len(alive)
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            # The browser root is our child: reap it if it exited
+            return os.waitpid(pid, os.WNOHANG)[0] == 0
+        except ChildProcessError:
+            pass
+        except OSError:
+            return False
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except (PermissionError, OSError):
+            return True
+
+    @classmethod
+    def _kill_pids_without_psutil(cls, pids: Set[int]) -> int:
+        # Poll for exit instead of sleeping the whole grace period
+        deadline = time.monotonic() + EXIT_GRACE
+        alive = {pid for pid in pids if cls._pid_alive(pid)}
+        while alive and time.monotonic() < deadline:
+            time.sleep(0.1)
+            alive = {pid for pid in alive if cls._pid_alive(pid)}
+        killed = 0
+        for pid in alive:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed += 1
+            except (ProcessLookupError, PermissionError, OSError):
+                continue
+        if killed:
+            print(f"🧟 Killed {killed} Chromium processes left after close()")
+        return killed
+
+    def reap_orphans(self) -> int:
+        """Kill nodriver Chromium processes whose parent is gone and no live browser owns"""
+        if psutil is None:
+            return 0
+        with self._lock:
+            owned = set().union(*(handle.pids for handle in self._handles)) if self._handles else set()
+        orphans = []
+        for process in psutil.process_iter(["pid", "ppid", "name", "cmdline"]):
+            info = process.info
+            if info["pid"] in owned or info["ppid"] not in (0, 1):
+                continue
+            name = (info.get("name") or "").lower()
+            cmdline = " ".join(info.get("cmdline") or [])
+            if "chrom" in name and f"{os.sep}{PROFILE_MARKER}" in cmdline:
+                orphans.append(process)
+        for process in orphans:
+            try:
+                for child in process.children(recursive=True):
+                    child.kill()
+                process.kill()
+            except psutil.Error:
+                continue
+        if orphans:
+            print(f"🧟 Reaped {len(orphans)} orphaned Chromium process trees")
+        return len(orphans)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            handles = list(self._handles)
+        return {
+            "browsers": len(handles),
+            "max_browsers": self.max_browsers,
+            "rss_mb": round(sum(handle.rss_mb for handle in handles), 1),
+            "processes": sum(handle.processes for handle in handles),
+        }
+
+
+browser_governor = BrowserGovernor()
@@ -0,0 +1,366 @@
+"""
+Company Resolver - Compiled company-name matching shared by the LinkedIn parser
+
+The gazetteer has two parts:
+  * seed companies, hand-curated in jobs/data/known_companies.json (tracked in
+    git, never written at runtime)
+  * learned companies and the candidate counts they are promoted from, in a
+    separate untracked file. Only company names read from a dedicated field
+    (the in-page card subtitle or LinkedIn's voyager JSON, see
+    Linkedin.company_verified) are counted: names guessed from mixed card
+    text would otherwise be learned and then used to split later titles.
+    Candidates are capped and forgotten when not seen for a while.
+
+Environment:
+  COMPANY_GAZETTEER_PATH      learned companies file (default jobs/data/learned_companies.json)
+  COMPANY_MAX_CANDIDATES      candidate names kept, most seen first (default 2000)
+  COMPANY_CANDIDATE_TTL_DAYS  days a candidate is kept without being seen again (default 30)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List
+
+KNOWN_COMPANIES_PATH = os.path.join(os.path.dirname(__file__), "data", "known_companies.json")
+LEARNED_COMPANIES_PATH = os.getenv("COMPANY_GAZETTEER_PATH",
+                                   os.path.join(os.path.dirname(__file__), "data", "learned_companies.json"))
+MAX_CANDIDATES = max(0, int(os.getenv("COMPANY_MAX_CANDIDATES", "2000")))
+CANDIDATE_TTL = float(os.getenv("COMPANY_CANDIDATE_TTL_DAYS", "30")) * 86400
+
+# Words that show up in job titles / card chrome and are never a company name
+JOB_RELATED_WORDS = [
+    'Software', 'Engineer', 'Backend', 'Developer', 'Co-op', 'Student', 'Intern', 'Architect',
+    'Data', 'Science', 'JavaScript', 'Development', 'Fall', 'Term', 'months', 'Internship',
+    'Coop', 'Winter', 'with', 'verification', 'Senior', 'Junior', 'Lead', 'Principal',
+    'Analytics', 'Systems', 'Embedded', 'Growth', 'Machine', 'Learning', 'FPGA', 'DSP',
+    'Automation', 'Aquatic', 'Informatics'
+]
+
+LOCATION_WORDS = [
+    'Toronto', 'Vancouver', 'Montreal', 'Calgary', 'Ottawa', 'Kanata', 'Pickering', 'Richmond',
+    'Remote', 'Hybrid', 'On-site', 'BC', 'ON', 'QC', 'AB', 'Quebec'
+]
+
+# Shorter location list used by the full-card-text fallback
+CARD_LOCATION_WORDS = ['Toronto', 'Vancouver', 'Montreal', 'Remote', 'Hybrid', 'On-site', 'BC', 'ON', 'QC', 'Quebec']
+
+JOB_TITLE_WORDS = [
+    'remote', 'hybrid', 'onsite', 'canada', 'engineer', 'developer',
+    'architect', 'analyst', 'manager', 'specialist', 'coordinator',
+    'assistant', 'associate', 'director', 'lead', 'principal',
+    'analytics', 'systems', 'solutions', 'technologies'
+]
+
+LOCATION_PREFIX_TITLE_WORDS = [
+    'software', 'data', 'senior', 'junior', 'embedded', 'engineer', 'developer',
+    'architect', 'analyst', 'manager', 'specialist', 'coordinator',
+    'assistant', 'associate', 'director', 'lead', 'principal',
+    'analytics', 'systems', 'solutions', 'technologies'
+]
+
+# Generic words that the heuristics sometimes return; never learned into the gazetteer
+GENERIC_COMPANY_WORDS = [
+    'unknown company', 'company', 'social', 'summer', 'product', 'full', 'entry', 'research',
+    'marketing', 'engineering', 'operations', 'business', 'community', 'retail', 'digital',
+    'investment', 'quantitative', 'trading', 'markets', 'client', 'public', 'finance',
+    'creative', 'supply', 'commerce', 'frontend', 'front', 'scientist', 'motion', 'brand',
+    'concerts', 'enterprise', 'sustainability', 'merchandising', 'hr systems'
+]
+
+# One compiled alternation instead of one re.sub per word
+JOB_WORDS_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(word) for word in JOB_RELATED_WORDS) + r')\b', re.IGNORECASE
+)
+VERIFICATION_PATTERN = re.compile(r'verification\s+([^,\(]+?)(?:\s+[A-Z][a-z]+,|\s+\()', re.IGNORECASE)
+WINTER_PATTERN = re.compile(r'-\s+WINTER\s+\d{4}\s+([A-Z][a-z]+)\s+[A-Z]')
+LOCATION_PREFIX_PATTERN = re.compile(
+    r'\b([A-Z][a-z]+)\s+(?:Montreal|Toronto|Vancouver|Calgary|Ottawa|Richmond|Pickering|Kanata),?\s+(?:QC|ON|BC|AB)'
+)
+COMPANY_SUFFIX_PATTERN = re.compile(
+    r'\b([A-Z][a-zA-Z\s&]+(?:Inc|Ltd|Limited|Corporation|Corp|Company|LLC|Group|Technologies|Solutions|Systems|Canada|International))\b'
+)
+PUNCTUATION_PATTERN = re.compile(r'[()|-]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+_job_title_words = set(JOB_TITLE_WORDS)
+_location_prefix_title_words = set(LOCATION_PREFIX_TITLE_WORDS)
+_location_words = set(LOCATION_WORDS)
+_card_location_words = set(CARD_LOCATION_WORDS)
+_unlearnable_words = (
+    {word.lower() for word in JOB_RELATED_WORDS + LOCATION_WORDS} |
+    _job_title_words | set(GENERIC_COMPANY_WORDS)
+)
+
+
+class CompanyGazetteer:
+    """
+    Known company names matched with a single compiled alternation.
+
+    Seed companies (hand-curated) match as case-insensitive substrings, which
+    also catches LinkedIn's glued text like "InternGPTZero". Learned companies
+    (promoted from company names scraped from a dedicated field) must match on
+    word boundaries so short names don't fire inside longer words.
+    """
+
+    def __init__(self, path: str = KNOWN_COMPANIES_PATH, learned_path: str = LEARNED_COMPANIES_PATH,
+                 min_count: int = 2, max_candidates: int = MAX_CANDIDATES, candidate_ttl: float = CANDIDATE_TTL):
+        self.path = path
+        self.learned_path = learned_path
+        self.min_count = min_count
+        self.max_candidates = max_candidates
+        self.candidate_ttl = candidate_ttl
+        self.seed: List[str] = []
+        self.learned: List[str] = []
+        self.candidates: Dict[str, Dict] = {}  # name -> {"count", "seen" (epoch seconds)}
+        self._canonical: Dict[str, str] = {}
+        self._pattern = None
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def _read(path: str) -> Dict:
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load known companies from {path}: {e}")
+            return {}
+
+    def load(self):
+        """Load the seed list and the learned companies from their JSON files"""
+        seed = self._read(self.path).get("seed", [])
+        learned = self._read(self.learned_path)
+        with self._lock:
+            self.seed = list(seed)
+            self.learned = list(learned.get("learned", []))
+            self.candidates = {name: entry for name, entry in learned.get("candidates", {}).items()
+                               if isinstance(entry, dict)}
+            self._compile()
+
+    def save(self):
+        """Atomically write the learned companies and candidates (the seed file is never written)"""
+        with self._lock:
+            self._trim_candidates()
+            data = {"learned": self.learned, "candidates": self.candidates}
+        os.makedirs(os.path.dirname(self.learned_path) or ".", exist_ok=True)
+        tmp_path = f"{self.learned_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.learned_path)
+
+    def _compile(self):
+        self._canonical = {}
+        alternatives = []
+        entries = [(name, False) for name in self.seed] + [(name, True) for name in self.learned]
+        # Longest first so "Feroot Security" wins over a shorter overlapping name
+        for name, bounded in sorted(entries, key=lambda entry: len(entry[0]), reverse=True):
+            key = name.lower()
+            if not key or key in self._canonical:
+                continue
+            self._canonical[key] = name
+            escaped = re.escape(name)
+            alternatives.append(rf'\b{escaped}\b' if bounded else escaped)
+        self._pattern = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def find(self, text: str) -> str:
+        """Return the first known company mentioned in text, or empty string"""
+        pattern = self._pattern
+        if not text or pattern is None:
+            return ""
+        match = pattern.search(text)
+        if not match:
+            return ""
+        return self._canonical.get(match.group(0).lower(), match.group(0))
+
+    @staticmethod
+    def is_learnable(name: str) -> bool:
+        """Whether a scraped company value is plausible enough to count"""
+        if not name:
+            return False
+        name = name.strip()
+        if len(name) < 3 or len(name) > 100:
+            return False
+        return name.lower() not in _unlearnable_words
+
+    def learn(self, names: Iterable[str]) -> int:
+        """
+        Count scraped company names and promote the ones seen min_count times.
+        Only pass names read from a dedicated company field, never ones guessed
+        from mixed text by the resolver below.
+
+        Returns:
+            Number of companies newly added to the gazetteer
+        """
+        added = 0
+        now = time.time()
+        with self._lock:
+            for name in names:
+                if not self.is_learnable(name):
+                    continue
+                name = WHITESPACE_PATTERN.sub(' ', name.strip())
+                entry = self.candidates.setdefault(name, {"count": 0, "seen": now})
+                entry["count"] += 1
+                entry["seen"] = now
+                added += self._promote(name)
+            self._trim_candidates(now)
+            if added:
+                self._compile()
+        return added
+
+    def rebuild(self, counts: Dict[str, int]) -> int:
+        """
+        Replace candidate counts with a full tally (e.g. every user_jobs.company row)
+
+        Returns:
+            Number of companies newly added to the gazetteer
+        """
+        added = 0
+        now = time.time()
+        with self._lock:
+            self.candidates = {}
+            for name, count in counts.items():
+                if not self.is_learnable(name):
+                    continue
+                name = WHITESPACE_PATTERN.sub(' ', name.strip())
+                entry = self.candidates.setdefault(name, {"count": 0, "seen": now})
+                entry["count"] += count
+            for name in list(self.candidates):
+                added += self._promote(name)
+            self._trim_candidates(now)
+            if added:
+                self._compile()
+        return added
+
+    def _trim_candidates(self, now: float = None):
+        """Forget promoted and stale candidates, then keep the max_candidates most seen (caller holds the lock)"""
+        now = time.time() if now is None else now
+        cutoff = now - self.candidate_ttl if self.candidate_ttl > 0 else None
+        kept = {name: entry for name, entry in self.candidates.items()
+                if name.lower() not in self._canonical and (cutoff is None or entry.get("seen", 0) >= cutoff)}
+        if len(kept) > self.max_candidates:
+            ranked = sorted(kept.items(), key=lambda item: (item[1]["count"], item[1].get("seen", 0)), reverse=True)
+            kept = dict(ranked[:self.max_candidates])
+        self.candidates = kept
+
+    def _promote(self, name: str) -> int:
+        if self.candidates.get(name, {}).get("count", 0) < self.min_count:
+            return 0
+        key = name.lower()
+        if key in self._canonical:
+            return 0
+        self.learned.append(name)
+        self._canonical[key] = name
+        return 1
+
+
+company_gazetteer = CompanyGazetteer()
+
+
+def strip_job_words(text: str) -> str:
+    """Remove job-title vocabulary and punctuation so company names stand out"""
+    cleaned_text = JOB_WORDS_PATTERN.sub('', text)
+    cleaned_text = PUNCTUATION_PATTERN.sub(' ', cleaned_text)  # Remove punctuation
+    return WHITESPACE_PATTERN.sub(' ', cleaned_text).strip()
+
+
+def match_verification_company(text: str) -> str:
+    """Company text between a "with verification" badge and the location"""
+    verification_match = VERIFICATION_PATTERN.search(text)
+    if verification_match:
+        potential_company = WHITESPACE_PATTERN.sub(' ', verification_match.group(1).strip())
+        if len(potential_company) > 1 and not any(word in potential_company.lower() for word in ['remote', 'hybrid', 'on-site']):
+            return potential_company
+    return ""
+
+
+def resolve_company_from_mixed_text(mixed_text: str) -> str:
+    """Extract clean company name from mixed text containing job titles, companies, and locations"""
+    # Strategy 1: First try to find known companies in the text
+    company = company_gazetteer.find(mixed_text)
+    if company:
+        return company
+
+    # Strategy 2: Look for text between "verification" and location indicators
+    company = match_verification_company(mixed_text)
+    if company:
+        return company
+
+    # Strategy 2.5: Special patterns for specific cases we've seen
+    # Pattern: "JobTitle - CompanyName - SEASON YEAR CompanyName Location"
+    special_pattern = WINTER_PATTERN.search(mixed_text)
+    if special_pattern:
+        potential_company = special_pattern.group(1)
+        if potential_company not in ['Montreal', 'Toronto', 'Vancouver', 'Calgary', 'Ottawa']:
+            return potential_company
+
+    # Pattern: "CompanyName Location, Province"
+    location_before_pattern = LOCATION_PREFIX_PATTERN.search(mixed_text)
+    if location_before_pattern:
+        potential_company = location_before_pattern.group(1)
+        if potential_company.lower() not in _location_prefix_title_words:
+            return potential_company
+
+    # Strategy 3: Look for multi-word company names that are likely real companies
+    # Look for patterns like "Company Name Inc", "Company Ltd", etc.
+    company_match = COMPANY_SUFFIX_PATTERN.search(mixed_text)
+    if company_match:
+        potential_company = company_match.group(1).strip()
+        # Make sure it's not just a job title
+        if not any(title_word in potential_company.lower() for title_word in ['engineer', 'developer', 'intern', 'student', 'analyst', 'specialist']):
+            return potential_company
+
+    # Strategy 4: Look for capitalized words that appear after removing job-related terms
+    # But be more selective to avoid picking up job title words
+    for word in strip_job_words(mixed_text).split():
+        word = word.strip('.,()[]')  # Remove punctuation
+        if (len(word) > 3 and  # Company names are usually longer than 3 characters
+            word[0].isupper() and
+            word not in _location_words and
+            word.isalpha() and  # Only alphabetic words
+            word.lower() not in _job_title_words):
+            return word
+
+    # Strategy 5: If nothing else works, return empty string instead of original text
+    # This prevents showing mixed text as company name
+    return ""
+
+
+def resolve_company_from_card_text(full_text: str) -> str:
+    """Extract a company name from the full text of a card whose selectors all missed"""
+    # Strategy 1: First try to find known companies in the text
+    company = company_gazetteer.find(full_text)
+    if company:
+        return company
+
+    # Strategy 2: If still no company found, try regex patterns
+    # Pattern 1: look for text between "verification" and location indicators
+    company = match_verification_company(full_text)
+
+    # Pattern 2: Look for capitalized words that appear after removing job-related terms
+    if not company:
+        for word in strip_job_words(full_text).split():
+            word = word.strip('.,()[]')  # Remove punctuation
+            if (len(word) > 2 and
+                word[0].isupper() and
+                word not in _card_location_words and
+                word.isalpha()):  # Only alphabetic words
+                company = word
+                break
+
+    # Pattern 3: For multi-word companies, look for consecutive capitalized words
+    if not company or len(company.split()) == 1:
+        # Look for multi-word company names like "Foresters Financial"
+        words = full_text.split()
+        for i, word in enumerate(words):
+            if (word in ['Foresters', 'Financial'] and
+                i + 1 < len(words) and
+                words[i + 1] in ['Financial', 'Security', 'Construction']):
+                company = f"{word} {words[i + 1]}"
+                break
+
+    return company
@@ -0,0 +1,161 @@
+"""
+Detail Pool - A pool of browser tabs for job detail pages
+
+Job descriptions used to be fetched one at a time in a single detail tab. This
+module keeps several detail tabs open and lends them out one job at a time:
+  * each tab has its own VoyagerCapture and its own Fetch interception, so
+    paused requests are always continued on the tab that paused them and
+    concurrent navigations cannot hit "Invalid InterceptionId"
+  * a shared per-host rate limiter spaces navigations to the same host, so a
+    bigger pool fetches in parallel but does not burst at LinkedIn
+  * a tab lent out BROWSER_TAB_MAX_NAVIGATIONS times is closed and replaced,
+    so renderer memory does not grow for the life of a warm session
+
+Environment:
+  LINKEDIN_DETAIL_TABS          detail tabs opened per scraper (default 3)
+  LINKEDIN_DETAIL_MIN_INTERVAL  seconds between detail navigations to one host (default 0.3)
+"""
+
+import asyncio
+import inspect
+import os
+import time
+import urllib.parse
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from jobs.browser_governor import TAB_MAX_NAVIGATIONS
+from jobs.voyager_capture import VoyagerCapture
+
+DETAIL_TABS = max(1, int(os.getenv("LINKEDIN_DETAIL_TABS", "3")))
+DETAIL_MIN_INTERVAL = float(os.getenv("LINKEDIN_DETAIL_MIN_INTERVAL", "0.3"))
+
+
+class HostRateLimiter:
+    """
+    Hands out navigation slots at least min_interval apart per host.
+
+    Slots are reserved before sleeping, so concurrent callers queue up behind
+    each other instead of all waking at the same time.
+    """
+
+    def __init__(self, min_interval: float = DETAIL_MIN_INTERVAL):
+        self.min_interval = max(0.0, min_interval)
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, url: str):
+        """Sleep until the next navigation to url's host is allowed"""
+        if self.min_interval <= 0:
+            return
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class DetailTab:
+    """One pooled detail tab and the voyager payloads it has seen"""
+
+    def __init__(self, tab, index: int):
+        self.tab = tab
+        self.index = index
+        self.capture = VoyagerCapture()
+        self.navigations = 0
+
+
+class DetailTabPool:
+    """
+    Fixed set of detail tabs lent out one job at a time.
+
+    Usage:
+        async with pool.acquire() as detail:
+            await pool.rate_limiter.wait(url)
+            await detail.tab.get(url)
+    """
+
+    def __init__(self, size: int = DETAIL_TABS, rate_limiter: Optional[HostRateLimiter] = None,
+                 max_navigations: int = TAB_MAX_NAVIGATIONS):
+        self.size = max(1, size)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.max_navigations = max_navigations
+        self.tabs: List[DetailTab] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._browser = None
+        self._on_tab_opened = None
+
+    async def open(self, browser, on_tab_opened=None):
+        """
+        Open the pool's tabs in a browser
+
+        Args:
+            browser: nodriver Browser
+            on_tab_opened: Optional coroutine function called with each new tab
+                (used to enable per-tab network capture)
+        """
+        self._idle = asyncio.Queue()
+        self._browser = browser
+        self._on_tab_opened = on_tab_opened
+        for index in range(self.size):
+            detail = await self._open_tab(index)
+            self.tabs.append(detail)
+            self._idle.put_nowait(detail)
+
+    async def _open_tab(self, index: int) -> DetailTab:
+        tab = await self._browser.get("about:blank", new_tab=True)
+        if self._on_tab_opened is not None:
+            await self._on_tab_opened(tab)
+        return DetailTab(tab, index)
+
+    async def _recycle(self, detail: DetailTab) -> DetailTab:
+        """Replace a tab that reached max_navigations (keeps the old one if that fails)"""
+        try:
+            fresh = await self._open_tab(detail.index)
+        except Exception as e:
+            print(f"⚠️ detail tab {detail.index} recycle: {e}")
+            detail.navigations = 0
+            return detail
+        self.tabs[self.tabs.index(detail)] = fresh
+        await self._close_tab(detail)
+        return fresh
+
+    def capture_for(self, tab) -> Optional[VoyagerCapture]:
+        """The VoyagerCapture of a pooled tab (None for tabs outside the pool)"""
+        for detail in self.tabs:
+            if detail.tab is tab:
+                return detail.capture
+        return None
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow an idle tab (waits FIFO when all tabs are busy)"""
+        if self._idle is None:
+            raise RuntimeError("DetailTabPool.open() has not been called")
+        detail = await self._idle.get()
+        try:
+            yield detail
+        finally:
+            detail.navigations += 1
+            try:
+                if self.max_navigations and detail.navigations >= self.max_navigations:
+                    detail = await self._recycle(detail)
+            finally:
+                self._idle.put_nowait(detail)
+
+    async def close(self):
+        """Close every pooled tab (best-effort)"""
+        for detail in self.tabs:
+            await self._close_tab(detail)
+        self.tabs = []
+        self._idle = None
+        self._browser = None
+
+    @staticmethod
+    async def _close_tab(detail: DetailTab):
+        try:
+            if hasattr(detail.tab, "close") and callable(detail.tab.close):
+                res = detail.tab.close()
+                if inspect.isawaitable(res): await res
+        except Exception as e:
+            print(f"⚠️ detail tab {detail.index} close: {e}")
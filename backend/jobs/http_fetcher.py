@@ -0,0 +1,175 @@
+"""
+HTTP Fetcher - Job descriptions over plain HTTP with the browser's session
+
+A browser navigation per description pays for Chromium rendering, page scripts
+and an outerHTML dump. LinkedIn serves the job page HTML, with the posting's
+voyager JSON embedded in it, to any client holding the session cookies. This
+fetcher exports those cookies from the nodriver browser and reuses them in one
+pooled httpx client (keep-alive, HTTP/2 when h2 is installed, bounded
+concurrency). The scraper falls back to a browser tab whenever a fetch here is
+blocked or yields no description.
+
+Environment:
+  LINKEDIN_HTTP_DESCRIPTIONS  "1" (default) to try HTTP first, "0" to always use the browser
+  LINKEDIN_HTTP_CONCURRENCY   simultaneous HTTP requests (default 6)
+  LINKEDIN_HTTP_MAX_BLOCKS    blocked responses before the fast path turns itself off (default 3)
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+from jobs.linkedin_parser import extract_description_from_job_html
+from jobs.voyager_capture import VoyagerCapture, embedded_payloads_from_html, job_id_from_link
+
+try:
+    import httpx
+except ImportError:  # optional: the scraper then uses browser tabs only
+    httpx = None
+
+HTTP_DESCRIPTIONS = os.getenv("LINKEDIN_HTTP_DESCRIPTIONS", "1") != "0"
+HTTP_CONCURRENCY = max(1, int(os.getenv("LINKEDIN_HTTP_CONCURRENCY", "6")))
+HTTP_MAX_BLOCKS = int(os.getenv("LINKEDIN_HTTP_MAX_BLOCKS", "3"))
+
+# Status codes LinkedIn uses to refuse a client (999 is its bot wall)
+BLOCKED_STATUSES = {401, 403, 429, 999}
+# Final URLs that mean the session was not accepted
+BLOCKED_URL_MARKERS = ("/authwall", "/login", "/checkpoint", "/uas/")
+
+COOKIE_DOMAIN = "linkedin.com"
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class DescriptionHttpFetcher:
+    """
+    Pooled HTTP client carrying a browser session's LinkedIn cookies.
+
+    fetch_description returns None when the request was blocked or failed
+    (caller should use the browser) and "" when the page had no description.
+    """
+
+    def __init__(self, concurrency: int = HTTP_CONCURRENCY, max_blocks: int = HTTP_MAX_BLOCKS,
+                 timeout: float = 10.0):
+        self.concurrency = max(1, concurrency)
+        self.max_blocks = max_blocks
+        self.timeout = timeout
+        self.blocks = 0
+        self._client = None
+        self._slots = asyncio.Semaphore(self.concurrency)
+
+    @staticmethod
+    def is_available() -> bool:
+        return httpx is not None
+
+    @property
+    def enabled(self) -> bool:
+        """False once LinkedIn refused max_blocks requests (the session is no good over HTTP)"""
+        return self._client is not None and (self.max_blocks <= 0 or self.blocks < self.max_blocks)
+
+    async def start(self, browser, tab=None) -> bool:
+        """
+        (Re)build the client from the browser's current cookies
+
+        Args:
+            browser: nodriver Browser (cookies come from browser.cookies)
+            tab: Optional tab to copy the User-Agent from, so requests look like the browser's
+
+        Returns:
+            True when the fast path is ready
+        """
+        if not self.is_available():
+            print("⚠️ httpx not installed, descriptions will use browser tabs")
+            return False
+
+        try:
+            browser_cookies = await browser.cookies.get_all()
+        except Exception as e:
+            print(f"⚠️ Could not export browser cookies: {e}")
+            return False
+        cookies = httpx.Cookies()
+        for cookie in browser_cookies or []:
+            domain = (getattr(cookie, "domain", "") or "")
+            if domain.lstrip(".").endswith(COOKIE_DOMAIN):
+                cookies.set(cookie.name, cookie.value, domain=domain, path=getattr(cookie, "path", None) or "/")
+        if not cookies:
+            print("⚠️ No LinkedIn cookies in the browser, descriptions will use browser tabs")
+            return False
+
+        headers = {
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        if tab is not None:
+            try:
+                user_agent = await tab.evaluate("navigator.userAgent")
+                if isinstance(user_agent, str) and user_agent:
+                    headers["User-Agent"] = user_agent
+            except Exception:
+                pass
+
+        await self.close()
+        self._client = httpx.AsyncClient(
+            http2=_http2_available(),
+            cookies=cookies,
+            headers=headers,
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        self.blocks = 0
+        print(f"⚡ HTTP description fetcher ready ({len(cookies)} cookies, "
+              f"{'HTTP/2' if _http2_available() else 'HTTP/1.1'}, {self.concurrency} connections)")
+        return True
+
+    def _is_blocked(self, response) -> bool:
+        if response.status_code in BLOCKED_STATUSES:
+            return True
+        return any(marker in response.url.path for marker in BLOCKED_URL_MARKERS)
+
+    async def fetch_description(self, url: str) -> Optional[str]:
+        """
+        Fetch a job page and extract its description
+
+        Returns:
+            Description text, "" when the page had none, None when blocked or failed
+        """
+        if not url or not self.enabled:
+            return None
+
+        async with self._slots:
+            try:
+                response = await self._client.get(url)
+            except Exception:
+                return None
+
+        if self._is_blocked(response):
+            self.blocks += 1
+            if not self.enabled:
+                print(f"⚠️ LinkedIn blocked {self.blocks} HTTP description requests, using browser tabs only")
+            return None
+        if response.status_code != 200:
+            return None
+
+        html = response.text
+        # The posting's own JSON first: exact text, no HTML parse needed
+        capture = VoyagerCapture()
+        if capture.add_payloads(embedded_payloads_from_html(html)):
+            description = capture.take_description(job_id_from_link(url))
+            if description:
+                return description
+        return extract_description_from_job_html(html)
+
+    async def close(self):
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                print(f"⚠️ HTTP fetcher close: {e}")
+        self._client = None
@@ -0,0 +1,173 @@
+"""
+In-Page Extractor - Pulls job fields out of the live DOM with a single tab.evaluate
+
+Shipping document.documentElement.outerHTML over CDP (up to ~1.3 MB per search
+page) just to read six fields per card is wasteful. These scripts run inside the
+page and return compact JSON instead; LinkedInJobParser stays the fallback
+whenever the extractor comes back empty (layout change, script error, ...).
+"""
+
+import json
+from typing import Dict, List, Optional
+from jobs.model.linkedin import Linkedin
+from jobs.linkedin_parser import LinkedInJobParser, JOB_DESCRIPTION_SELECTORS
+
+# Card containers, in priority order (first selector with any match wins)
+INPAGE_CARD_SELECTORS = [
+    'li[data-occludable-job-id]',
+    '.job-search-card',
+    '.jobs-search-results__list-item',
+    '.base-card',
+    '.base-search-card',
+    '[data-job-id]',
+]
+
+# Field selectors, tried in order inside each card
+INPAGE_FIELD_SELECTORS = {
+    "title": [
+        '.job-card-list__title--link strong',
+        '.job-card-list__title--link span[aria-hidden="true"]',
+        '.job-card-list__title--link',
+        'h3 a span[title]',
+        '.base-search-card__title',
+        'h3',
+        'a[href*="/jobs/view/"]',
+    ],
+    "company": [
+        '.artdeco-entity-lockup__subtitle',
+        '.job-card-container__primary-description',
+        '.base-search-card__subtitle',
+        '.job-search-card__subtitle',
+        'h4',
+    ],
+    "location": [
+        '.job-card-container__metadata-wrapper li',
+        '.job-card-container__metadata-item',
+        '.job-search-card__location',
+        '.base-search-card__metadata',
+    ],
+    "date": [
+        'time',
+        '.job-search-card__listdate',
+    ],
+}
+
+SEARCH_PAGE_EXTRACT_JS = """
+(function(cardSelectors, fieldSelectors) {
+    const text = (el) => el ? (el.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+    const first = (card, selectors) => {
+        for (const sel of selectors) {
+            const value = text(card.querySelector(sel));
+            if (value) return value;
+        }
+        return '';
+    };
+    let cards = [];
+    for (const sel of cardSelectors) {
+        cards = Array.from(document.querySelectorAll(sel));
+        if (cards.length) break;
+    }
+    const records = [];
+    for (const card of cards) {
+        const title = first(card, fieldSelectors.title);
+        if (!title) continue;  // occluded card that has not rendered yet
+        const link = card.querySelector('a[href*="/jobs/view/"]') || card.querySelector('a[href]');
+        const urn = card.getAttribute('data-entity-urn') || '';
+        records.push({
+            id: card.getAttribute('data-occludable-job-id') || card.getAttribute('data-job-id') ||
+                (card.querySelector('[data-job-id]') || {getAttribute: () => ''}).getAttribute('data-job-id') ||
+                (urn.match(/(\\d+)$/) || [, ''])[1],
+            title: title,
+            company: first(card, fieldSelectors.company),
+            location: first(card, fieldSelectors.location),
+            link: link ? link.getAttribute('href') : '',
+            date: first(card, fieldSelectors.date),
+        });
+    }
+    return JSON.stringify({cards: records, total: cards.length});
+})(%s, %s)
+""" % (json.dumps(INPAGE_CARD_SELECTORS), json.dumps(INPAGE_FIELD_SELECTORS))
+
+JOB_DETAIL_EXTRACT_JS = """
+(function(selectors) {
+    for (const sel of selectors) {
+        const node = document.querySelector(sel);
+        const value = node ? (node.innerText || node.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+        if (value) return JSON.stringify({description: value.replace(/(Show more|Show less)$/i, '').trim()});
+    }
+    return JSON.stringify({description: ''});
+})(%s)
+""" % json.dumps(JOB_DESCRIPTION_SELECTORS)
+
+
+def _decode(result) -> Optional[Dict]:
+    """Decode the JSON string returned by an extract script (None on errors)"""
+    # tab.evaluate returns ExceptionDetails/RemoteObject instead of a value when the script fails
+    if not isinstance(result, str):
+        return None
+    try:
+        data = json.loads(result)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def extract_search_page(tab) -> List[Dict]:
+    """
+    Run the search page extractor in a tab
+
+    Args:
+        tab: nodriver Tab showing a LinkedIn jobs search page
+
+    Returns:
+        List of card records (id, title, company, location, link, date);
+        empty when the extractor found nothing or failed
+    """
+    try:
+        data = _decode(await tab.evaluate(SEARCH_PAGE_EXTRACT_JS, return_by_value=True))
+    except Exception as e:
+        print(f"⚠️ In-page card extraction failed: {e}")
+        return []
+    if not data:
+        return []
+    return [record for record in data.get("cards") or [] if isinstance(record, dict)]
+
+
+async def extract_job_description(tab) -> str:
+    """
+    Run the job detail extractor in a tab
+
+    Args:
+        tab: nodriver Tab showing a LinkedIn job detail page
+
+    Returns:
+        Description text, "" when no known description container was found
+    """
+    try:
+        data = _decode(await tab.evaluate(JOB_DETAIL_EXTRACT_JS, return_by_value=True))
+    except Exception as e:
+        print(f"⚠️ In-page description extraction failed: {e}")
+        return ""
+    return (data or {}).get("description") or ""
+
+
+def jobs_from_card_records(records: List[Dict]) -> List[Linkedin]:
+    """
+    Turn in-page card records into Linkedin jobs
+
+    Args:
+        records: Card records from extract_search_page
+
+    Returns:
+        List of Linkedin job objects, in page order
+    """
+    jobs = []
+    for record in records:
+        try:
+            job = LinkedInJobParser.job_from_card_record(record)
+        except Exception as e:
+            print(f"❌ Error building job from card {record.get('id')}: {e}")
+            continue
+        if job:
+            jobs.append(job)
+    return jobs
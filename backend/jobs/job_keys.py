@@ -0,0 +1,64 @@
+"""
+Job Keys - Canonical, tracking-proof identities for job postings
+
+The same posting shows up under many links: LinkedIn appends refId/trackingId
+query strings and sometimes a title slug, Indeed wraps jk= in /rc/clk and
+/pagead redirects. Exact link comparison misses these duplicates, so dedupe
+works on keys instead:
+    https://www.linkedin.com/jobs/view/some-title-4277872414/?refId=..  -> linkedin:4277872414
+    https://www.linkedin.com/jobs/search/?currentJobId=4277872414       -> linkedin:4277872414
+    https://ca.indeed.com/rc/clk?jk=5d1c0e7bd0d2f9a3&from=serp          -> indeed:5d1c0e7bd0d2f9a3
+Links without a recognizable id fall back to scheme + host + path.
+"""
+
+import re
+import urllib.parse
+from typing import Optional
+
+LINKEDIN_VIEW_PATTERN = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)')
+LINKEDIN_ID_PARAMS = ("currentJobId", "jobId")
+INDEED_ID_PARAMS = ("jk", "vjk")
+
+
+def job_key_from_id(job_id: str, source: str = "linkedin") -> str:
+    """Key for a bare id, e.g. a card's data-occludable-job-id or data-jk"""
+    return f"{source}:{str(job_id).strip().lower()}"
+
+
+def canonical_job_key(link: str, job_id: Optional[str] = None, source: Optional[str] = None) -> str:
+    """
+    Reduce a job link to a stable key
+
+    Args:
+        link: Application link as scraped (may carry tracking parameters)
+        job_id: Id read straight off the card (data-occludable-job-id, data-jk), if any
+        source: "linkedin" or "indeed" when known; otherwise guessed from the link
+
+    Returns:
+        "<source>:<id>" when an id is found, else the link without query/fragment ("" for no link)
+    """
+    link = (link or "").strip()
+    parts = urllib.parse.urlsplit(link)
+    host = parts.netloc.lower()
+    if source is None:
+        source = "indeed" if "indeed." in host else "linkedin" if "linkedin." in host else None
+
+    if job_id:
+        return job_key_from_id(job_id, source or "linkedin")
+
+    query = urllib.parse.parse_qs(parts.query)
+    if source == "indeed" or any(param in query for param in INDEED_ID_PARAMS):
+        for param in INDEED_ID_PARAMS:
+            if query.get(param):
+                return job_key_from_id(query[param][0], "indeed")
+    if source != "indeed":
+        match = LINKEDIN_VIEW_PATTERN.search(parts.path)
+        if match:
+            return job_key_from_id(match.group(1), "linkedin")
+        for param in LINKEDIN_ID_PARAMS:
+            if query.get(param) and query[param][0].isdigit():
+                return job_key_from_id(query[param][0], "linkedin")
+
+    if not link:
+        return ""
+    return urllib.parse.urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), "", ""))
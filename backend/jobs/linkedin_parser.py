@@ -2,106 +2,293 @@
 LinkedIn Job Parser - Extracts job data from LinkedIn HTML
 """
 
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
+from bs4.element import CData, NavigableString, Tag
 from jobs.model.linkedin import Linkedin
+from jobs.parse_engine import ParseEngine, get_parse_engine
+from jobs.selector_registry import SelectorRegistry
+from jobs.company_resolver import resolve_company_from_card_text, resolve_company_from_mixed_text
+from jobs.scrape_log import PageSummary, get_logger
+import logging
 import re
 from datetime import datetime
 
+log = get_logger(__name__)
+
+# Job card selectors, in priority order
+JOB_CARD_SELECTORS = [
+    # Page 1 structure (authenticated, broader results)
+    '.job-search-card',  # This finds 60 cards with good structure
+    
+    # Page 2 structure (specific job feed)
+    'li[data-occludable-job-id]',  # This finds 25 cards, needs different extraction
+    
+    # Fallback selectors
+    '.jobs-search-results__list-item',
+    '.base-card',
+    '.base-search-card',
+    'li.result-card',
+    'article',
+    '[data-job-id]',
+    '.job-card',
+    
+    # Broader selectors for different LinkedIn layouts
+    'li:has(h3)',
+    'div[data-entity-urn*="job"]',
+]
+
+# Job title selectors, in priority order
+JOB_TITLE_SELECTORS = [
+    # For page 1 structure (.job-search-card) - get the actual job title, not company
+    'h3 a span[title]',  # Job title is often in a span with title attribute
+    'h3 a',  # Job title link
+    'h3 span',  # Job title span
+    'h3',  # Direct h3 (but this might be company name in some cases)
+    
+    # For page 2 structure (li[data-occludable-job-id])
+    'h4 a', 
+    '.job-search-card__title a',
+    '.jobs-unified-top-card__job-title a',
+    
+    # Public LinkedIn
+    '.base-search-card__title a',
+    '.result-card__title a',
+    
+    # General selectors
+    'a[data-tracking-control-name*="job"]',
+    'h4',
+    '.job-title',
+    '[data-job-title]',
+    'a[href*="/jobs/view/"]',
+    
+    # Fallback selectors
+    'a[href*="linkedin.com/jobs"]',
+    '.job-card-container h3',
+    '.job-card h3'
+]
+
+# Company selectors, in priority order
+JOB_COMPANY_SELECTORS = [
+    # For page 1 structure (.job-search-card)
+    'h4',  # Direct h4 element (like "Nuro", "Twitch")
+    '.base-search-card__subtitle a',
+    '.job-search-card__subtitle-link',
+    
+    # For page 2 structure (li[data-occludable-job-id])  
+    '.job-search-card__subtitle',  # Company name in subtitle
+    'h4 a',
+    '.jobs-unified-top-card__company-name a',
+    
+    # General selectors  
+    '.company-name',
+    '[data-company-name]',
+    'a[data-tracking-control-name*="company"]',
+    '.base-search-card__subtitle',
+    
+    # Fallback selectors - look for text patterns
+    '*:contains("verified")',  # Company names often appear near verification badges
+    
+    # Very specific fallback for the structure we see
+    'div:nth-child(2)',  # Sometimes company is second div
+    'span:contains("verification")',  # Look near verification text
+]
+
+# Location selectors, in priority order
+JOB_LOCATION_SELECTORS = [
+    # Authenticated LinkedIn
+    '.job-search-card__location',
+    '.base-search-card__metadata',
+    '.jobs-unified-top-card__bullet',
+    
+    # General selectors
+    '.job-location',
+    '[data-job-location]',
+    '.job-search-card__metadata',
+    '.base-search-card__metadata-item',
+    
+    # Fallback selectors
+    '.location',
+    '.job-card-container .location'
+]
+
+# Posting date selectors, in priority order
+JOB_DATE_SELECTORS = [
+    'time',
+    '.job-search-card__listdate',
+    '.base-search-card__metadata time',
+    '[data-job-posted]'
+]
+
+
 class LinkedInJobParser:
     """Parses LinkedIn job listings from HTML content"""
     
+    # Adaptive selector registries shared across pages. Every field's selectors
+    # overlap (e.g. a bare 'h3' also matches when 'h3 a span[title]' would, and
+    # can be the company), so the registries only demote dead selectors: promoting
+    # a broad fallback that won on one card would make it beat the precise
+    # selectors on every later card.
+    card_selectors = SelectorRegistry("card", JOB_CARD_SELECTORS, promote_winner=False)
+    title_selectors = SelectorRegistry("title", JOB_TITLE_SELECTORS, promote_winner=False)
+    company_selectors = SelectorRegistry("company", JOB_COMPANY_SELECTORS, promote_winner=False)
+    location_selectors = SelectorRegistry("location", JOB_LOCATION_SELECTORS, promote_winner=False)
+    date_selectors = SelectorRegistry("date", JOB_DATE_SELECTORS, promote_winner=False)
+    
+    @classmethod
+    def selector_registries(cls) -> List[SelectorRegistry]:
+        return [cls.card_selectors, cls.title_selectors, cls.company_selectors,
+                cls.location_selectors, cls.date_selectors]
+
+    @classmethod
+    def get_selector_stats(cls) -> Dict[str, Dict]:
+        """Per-selector hit statistics for every field registry (served at /api/debug/selectors)"""
+        return {registry.name: registry.get_stats() for registry in cls.selector_registries()}
+
+    @classmethod
+    def dead_selectors(cls) -> Dict[str, List[str]]:
+        """Registry name -> selectors that stopped matching, for registries that have any"""
+        dead = {registry.name: registry.dead_selectors() for registry in cls.selector_registries()}
+        return {name: selectors for name, selectors in dead.items() if selectors}
+
+    @classmethod
+    def reset_selectors(cls):
+        """Forget the learned selector order and statistics of every field registry"""
+        for registry in cls.selector_registries():
+            registry.reset()
+
+    @classmethod
+    def take_selector_counts(cls) -> Dict[str, Dict]:
+        """Selector counts recorded in this process since the last call, by registry name"""
+        return {registry.name: registry.take_unreported() for registry in cls.selector_registries()}
+
+    @classmethod
+    def merge_selector_counts(cls, counts: Dict[str, Dict]):
+        """Add counts a parse worker took with take_selector_counts"""
+        for registry in cls.selector_registries():
+            registry.merge(counts.get(registry.name) or {})
+
+    @staticmethod
+    def parse_page_in_worker(html_content: str) -> Tuple[List[Linkedin], Dict[str, Dict]]:
+        """
+        extract_jobs_from_html for a parse pool worker process: also returns the
+        selector counts the page added, since the worker's registries are not
+        the parent's (merge them with merge_selector_counts)
+        """
+        jobs = LinkedInJobParser.extract_jobs_from_html(html_content)
+        return jobs, LinkedInJobParser.take_selector_counts()
+
     @staticmethod
-    def extract_jobs_from_html(html_content: str) -> List[Linkedin]:
+    def extract_jobs_from_html(html_content: str, engine: Optional[ParseEngine] = None) -> List[Linkedin]:
         """
         Extract job listings from LinkedIn HTML content
         
         Args:
             html_content: Raw HTML from LinkedIn jobs page
+            engine: Parse engine to build the tree with (defaults to the fastest available)
             
         Returns:
             List of Linkedin job objects
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        jobs = []
+        return list(LinkedInJobParser.iter_jobs_from_html(html_content, engine))
+    
+    @staticmethod
+    def iter_jobs_from_html(html_content: str, engine: Optional[ParseEngine] = None) -> Iterator[Linkedin]:
+        """
+        Stream job listings from LinkedIn HTML content, one card at a time
         
-        print(f"🔍 Parsing HTML content (length: {len(html_content)})")
+        Each card's subtree is freed as soon as it has been parsed, so callers can
+        start working on the first jobs while later cards are still being parsed.
         
-        # Try multiple possible selectors for job cards
-        job_selectors = [
-            # Page 1 structure (authenticated, broader results)
-            '.job-search-card',  # This finds 60 cards with good structure
-            
-            # Page 2 structure (specific job feed)
-            'li[data-occludable-job-id]',  # This finds 25 cards, needs different extraction
-            
-            # Fallback selectors
-            '.jobs-search-results__list-item',
-            '.base-card',
-            '.base-search-card',
-            'li.result-card',
-            'article',
-            '[data-job-id]',
-            '.job-card',
+        Args:
+            html_content: Raw HTML from LinkedIn jobs page
+            engine: Parse engine to build the tree with (defaults to the fastest available)
             
-            # Broader selectors for different LinkedIn layouts
-            'li:has(h3)',
-            'div[data-entity-urn*="job"]',
-        ]
+        Yields:
+            Linkedin job objects, in page order
+        """
+        summary = PageSummary(log, "page_parsed", html_len=len(html_content))
+        soup = (engine or get_parse_engine()).parse(html_content)
+        
+        log.debug("parse_start", "🔍 Parsing HTML content (length: %d)", len(html_content))
         
         job_cards = []
-        for selector in job_selectors:
-            cards = soup.select(selector)
-            if cards:
-                print(f"✅ Found {len(cards)} job cards using selector: {selector}")
-                # Filter out obvious non-job cards
-                filtered_cards = []
-                for card in cards:
-                    card_classes = ' '.join(card.get('class', [])).lower()
-                    card_text = card.get_text().lower()
-                    
-                    # Only skip cards that are clearly ads or promotions (be less aggressive)
-                    skip_indicators = ['ad-banner', 'promoted-job']  # Removed job-alert and premium-insight
-                    if any(indicator in card_classes for indicator in skip_indicators):
-                        continue
-                        
-                    # Only skip cards with very little content (lowered threshold)
-                    if len(card.get_text().strip()) < 15:  # Reduced from 30 to 15
-                        continue
-                        
-                    filtered_cards.append(card)
+        # Try card selectors (previous page's winner first)
+        cards, selector = LinkedInJobParser.card_selectors.select_all(soup)
+        summary.set(selector=selector, cards=len(cards))
+        if cards:
+            log.debug("cards_found", "✅ Found %d job cards using selector: %s", len(cards), selector)
+            # Filter out obvious non-job cards
+            filtered_cards = []
+            for card in cards:
+                card_classes = ' '.join(card.get('class', [])).lower()
                 
-                print(f"📝 After filtering: {len(filtered_cards)} cards remain")
-                job_cards = filtered_cards
-                break
-            else:
-                print(f"❌ No cards found with selector: {selector}")
+                # Only skip cards that are clearly ads or promotions (be less aggressive)
+                skip_indicators = ['ad-banner', 'promoted-job']  # Removed job-alert and premium-insight
+                if any(indicator in card_classes for indicator in skip_indicators):
+                    continue
+                    
+                # Only skip cards with very little content (lowered threshold)
+                if len(card.get_text().strip()) < 15:  # Reduced from 30 to 15
+                    continue
+                    
+                filtered_cards.append(card)
+            
+            log.debug("cards_filtered", "📝 After filtering: %d cards remain", len(filtered_cards))
+            job_cards = filtered_cards
         
         if not job_cards:
-            print("⚠️ No job cards found with any selector. Trying broader search...")
+            log.warning("cards_missing", "⚠️ No job cards found with any selector. Trying broader search...")
             # Try to find any list items or articles that might contain job data
             job_cards = soup.find_all(['li', 'article', 'div'], class_=lambda x: x and 'job' in x.lower() if x else False)
-            print(f"🔍 Found {len(job_cards)} potential job containers with broad search")
+            log.debug("cards_broad", "🔍 Found %d potential job containers with broad search", len(job_cards))
+            summary.set(selector="broad-search")
+        summary.set(kept=len(job_cards))
+        
+        # Cards that wrap other cards can't be freed until their nested cards are parsed
+        containers = LinkedInJobParser._cards_with_nested_cards(job_cards)
         
         for i, card in enumerate(job_cards):
+            job_data = None
             try:
                 job_data = LinkedInJobParser._extract_single_job(card, i+1)  # Pass card number for debugging
                 if job_data:
-                    jobs.append(job_data)
-                    print(f"✅ Extracted job {i+1}: {job_data.name} at {job_data.company}")
+                    summary.incr("jobs")
+                    log.sampled(logging.DEBUG, "card_extracted", "✅ Extracted job %d: %s at %s",
+                                i+1, job_data.name, job_data.company)
                 else:
-                    print(f"⚠️ Could not extract data from card {i+1} (likely ad or different structure)")
+                    summary.incr("skipped")
+                    log.sampled(logging.DEBUG, "card_skipped",
+                                "⚠️ Could not extract data from card %d (likely ad or different structure)", i+1)
             except Exception as e:
-                print(f"❌ Error parsing job card {i+1}: {e}")
-                # Print more debug info for problematic cards
-                try:
-                    card_text = card.get_text()[:200] if hasattr(card, 'get_text') else str(card)[:200]
-                    print(f"   Card preview: {card_text}...")
-                except:
-                    print(f"   Could not preview card content")
-                continue
-                
-        return jobs
+                summary.incr("errors")
+                # Card preview only costs anything when the error is actually logged
+                preview = ""
+                if log.enabled(logging.WARNING):
+                    try:
+                        preview = card.get_text()[:200] if hasattr(card, 'get_text') else str(card)[:200]
+                    except Exception:
+                        preview = "<unavailable>"
+                log.sampled(logging.WARNING, "card_error", "❌ Error parsing job card %d: %s", i+1, e, preview=preview)
+            
+            if id(card) not in containers:
+                card.decompose()
+            if job_data:
+                yield job_data
+        
+        # Break the remaining parent/child reference cycles so the tree is freed now
+        soup.decompose()
+        summary.emit("📄 Parsed search page")
+    
+    @staticmethod
+    def _cards_with_nested_cards(cards) -> set:
+        """ids of cards that contain another card from the same list"""
+        card_ids = {id(card) for card in cards}
+        containers = set()
+        for card in cards:
+            for parent in card.parents:
+                if id(parent) in card_ids:
+                    containers.add(id(parent))
+        return containers
     
     @staticmethod
     def _extract_single_job(card, card_number: int = 0) -> Optional[Linkedin]:
@@ -113,157 +300,42 @@ class LinkedInJobParser:
         
         # Skip if this looks like an ad or promotion
         if any(indicator in ' '.join(card_classes).lower() for indicator in ['ad', 'promoted', 'sponsor']):
-            print(f"   Card {card_number}: Skipping ad/promoted content")
+            log.sampled(logging.DEBUG, "card_ad", "   Card %d: Skipping ad/promoted content", card_number)
             return None
             
         # Skip if card is too small (but be less strict for lazy-loaded content)
         if len(card_text.strip()) < 5:  # Reduced from 20 to 5 to allow lazy-loaded cards
-            print(f"   Card {card_number}: Skipping - too little content ({len(card_text)} chars)")
+            log.sampled(logging.DEBUG, "card_empty", "   Card %d: Skipping - too little content (%d chars)",
+                        card_number, len(card_text))
             return None
         
-        # Try multiple selectors for job title
-        title_selectors = [
-            # For page 1 structure (.job-search-card) - get the actual job title, not company
-            'h3 a span[title]',  # Job title is often in a span with title attribute
-            'h3 a',  # Job title link
-            'h3 span',  # Job title span
-            'h3',  # Direct h3 (but this might be company name in some cases)
-            
-            # For page 2 structure (li[data-occludable-job-id])
-            'h4 a', 
-            '.job-search-card__title a',
-            '.jobs-unified-top-card__job-title a',
-            
-            # Public LinkedIn
-            '.base-search-card__title a',
-            '.result-card__title a',
-            
-            # General selectors
-            'a[data-tracking-control-name*="job"]',
-            'h4',
-            '.job-title',
-            '[data-job-title]',
-            'a[href*="/jobs/view/"]',
-            
-            # Fallback selectors
-            'a[href*="linkedin.com/jobs"]',
-            '.job-card-container h3',
-            '.job-card h3'
-        ]
-        
-        title = ""
-        title_elem = None
-        for selector in title_selectors:
-            title_elem = card.select_one(selector)
-            if title_elem:
-                raw_title = LinkedInJobParser._clean_text(title_elem.get_text())
-                
-                # Additional cleaning for titles to remove duplicates and artifacts
-                title = LinkedInJobParser._clean_title(raw_title)
-                if title:
-                    break
+        # Try title selectors (previous card's winner first)
+        # Additional cleaning for titles to remove duplicates and artifacts
+        title, _ = LinkedInJobParser.title_selectors.select_first(
+            card, lambda elem: LinkedInJobParser._clean_title(LinkedInJobParser._clean_text(elem.get_text()))
+        )
         
         if not title:  # Skip if no title found
-            print(f"   Card {card_number}: No title found, skipping")
+            log.sampled(logging.DEBUG, "card_no_title", "   Card %d: No title found, skipping", card_number)
             return None
         
-        # Try multiple selectors for company
-        company_selectors = [
-            # For page 1 structure (.job-search-card)
-            'h4',  # Direct h4 element (like "Nuro", "Twitch")
-            '.base-search-card__subtitle a',
-            '.job-search-card__subtitle-link',
-            
-            # For page 2 structure (li[data-occludable-job-id])  
-            '.job-search-card__subtitle',  # Company name in subtitle
-            'h4 a',
-            '.jobs-unified-top-card__company-name a',
-            
-            # General selectors  
-            '.company-name',
-            '[data-company-name]',
-            'a[data-tracking-control-name*="company"]',
-            '.base-search-card__subtitle',
-            
-            # Fallback selectors - look for text patterns
-            '*:contains("verified")',  # Company names often appear near verification badges
-            
-            # Very specific fallback for the structure we see
-            'div:nth-child(2)',  # Sometimes company is second div
-            'span:contains("verification")',  # Look near verification text
-        ]
-        
-        company = ""
-        raw_company_text = ""
-        for selector in company_selectors:
-            company_elem = card.select_one(selector)
-            if company_elem:
-                raw_company_text = LinkedInJobParser._clean_text(company_elem.get_text())
-                if raw_company_text and len(raw_company_text) > 1:  # Make sure it's not just whitespace
-                    # Apply smart company extraction to the raw text
-                    company = LinkedInJobParser._extract_company_from_mixed_text(raw_company_text, title)
-                    if company:
-                        break
+        def company_from_elem(company_elem):
+            raw_company_text = LinkedInJobParser._clean_text(company_elem.get_text())
+            if raw_company_text and len(raw_company_text) > 1:  # Make sure it's not just whitespace
+                # Apply smart company extraction to the raw text
+                return LinkedInJobParser._extract_company_from_mixed_text(raw_company_text, title)
+            return ""
+        
+        # Try company selectors (previous card's winner first)
+        company, _ = LinkedInJobParser.company_selectors.select_first(card, company_from_elem)
         
         # If still no company, try a different approach - parse the full card text
         if not company:
             full_text = card.get_text()
             lines = [line.strip() for line in full_text.split('\n') if line.strip()]
             
-            # For the page 2 structure, company often appears in a specific pattern
-            # Look for lines that contain company names (usually after job title)
-            known_companies = ['GPTZero', 'Foresters Financial', 'League', 'Corpay', 'Intact', 'Feroot Security', 'Lanescape']
-            
-            # Strategy 1: First try to find known companies in the text
-            full_text_lower = full_text.lower()
-            for known_company in known_companies:
-                if known_company.lower() in full_text_lower:
-                    company = known_company
-                    break
-            
-            # Strategy 2: If still no company found, try regex patterns
-            if not company:
-                import re
-                
-                # Pattern 1: look for text between "verification" and location indicators
-                verification_match = re.search(r'verification\s+([^,\(]+?)(?:\s+[A-Z][a-z]+,|\s+\()', full_text, re.IGNORECASE)
-                if verification_match:
-                    potential_company = verification_match.group(1).strip()
-                    # Clean up the potential company name
-                    potential_company = re.sub(r'\s+', ' ', potential_company)
-                    if len(potential_company) > 1 and not any(word in potential_company.lower() for word in ['remote', 'hybrid', 'on-site']):
-                        company = potential_company
-                
-                # Pattern 2: Look for capitalized words that appear after removing job-related terms
-                if not company:
-                    # Remove job-related words to isolate company names
-                    cleaned_text = re.sub(r'\b(Software|Engineer|Backend|Developer|Co-op|Student|Intern|Architect|Data|Science|JavaScript|Development|Fall|Term|months|Internship|Coop|Winter|with|verification)\b', '', full_text, flags=re.IGNORECASE)
-                    cleaned_text = re.sub(r'[()|-]', ' ', cleaned_text)  # Remove punctuation
-                    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-                    
-                    # Look for capitalized words that could be company names
-                    location_words = ['Toronto', 'Vancouver', 'Montreal', 'Remote', 'Hybrid', 'On-site', 'BC', 'ON', 'QC', 'Quebec']
-                    words = cleaned_text.split()
-                    
-                    for word in words:
-                        word = word.strip('.,()[]')  # Remove punctuation
-                        if (len(word) > 2 and 
-                            word[0].isupper() and 
-                            word not in location_words and 
-                            word.isalpha()):  # Only alphabetic words
-                            company = word
-                            break
-                
-                # Pattern 3: For multi-word companies, look for consecutive capitalized words
-                if not company or len(company.split()) == 1:
-                    # Look for multi-word company names like "Foresters Financial"
-                    words = full_text.split()
-                    for i, word in enumerate(words):
-                        if (word in ['Foresters', 'Financial'] and 
-                            i + 1 < len(words) and 
-                            words[i + 1] in ['Financial', 'Security', 'Construction']):
-                            company = f"{word} {words[i + 1]}"
-                            break
+            # Known companies first, then "verification" and capitalized-word patterns
+            company = resolve_company_from_card_text(full_text)
             
             # If still no company found, use a more sophisticated approach
             if not company and len(lines) >= 3:
@@ -294,31 +366,12 @@ class LinkedInJobParser:
                         company = line_clean
                         break
         
-        # Try multiple selectors for location
-        location_selectors = [
-            # Authenticated LinkedIn
-            '.job-search-card__location',
-            '.base-search-card__metadata',
-            '.jobs-unified-top-card__bullet',
-            
-            # General selectors
-            '.job-location',
-            '[data-job-location]',
-            '.job-search-card__metadata',
-            '.base-search-card__metadata-item',
-            
-            # Fallback selectors
-            '.location',
-            '.job-card-container .location'
-        ]
-        
-        location = ""
-        for selector in location_selectors:
-            location_elem = card.select_one(selector)
-            if location_elem:
-                location = LinkedInJobParser._clean_text(location_elem.get_text())
-                if location and len(location) > 1:
-                    break
+        def location_from_elem(location_elem):
+            location = LinkedInJobParser._clean_text(location_elem.get_text())
+            return location if len(location) > 1 else ""
+        
+        # Try location selectors (previous card's winner first)
+        location, _ = LinkedInJobParser.location_selectors.select_first(card, location_from_elem)
         
         # If still no location, parse from card text
         if not location:
@@ -344,22 +397,33 @@ class LinkedInJobParser:
             elif href.startswith('http'):
                 application_link = href
         
-        # Extract posting date (if available)
-        date_selectors = [
-            'time',
-            '.job-search-card__listdate',
-            '.base-search-card__metadata time',
-            '[data-job-posted]'
-        ]
-        
-        posting_date = ""
-        for selector in date_selectors:
-            date_elem = card.select_one(selector)
-            if date_elem:
-                posting_date = LinkedInJobParser._clean_text(date_elem.get_text())
-                if posting_date:
-                    break
+        # Try posting date selectors (previous card's winner first)
+        posting_date, _ = LinkedInJobParser.date_selectors.select_first(
+            card, lambda elem: LinkedInJobParser._clean_text(elem.get_text())
+        )
+        
+        log.sampled(logging.DEBUG, "card_fields", "🔍 Extracted: '%s' at '%s' in '%s'", title, company, location)
         
+        return LinkedInJobParser.build_job(title, company, location, application_link, posting_date)
+    
+    @staticmethod
+    def build_job(title: str, company: str, location: str, application_link: str, posting_date: str = "",
+                  company_verified: bool = False) -> Linkedin:
+        """
+        Build a Linkedin job from already-cleaned card fields, filling in the
+        defaults and the job/location type inferred from the title and location
+        
+        Args:
+            title: Cleaned job title
+            company: Company name ("" when unknown)
+            location: Location text ("" when unknown)
+            application_link: Absolute job link
+            posting_date: Posting date text (defaults to today)
+            company_verified: Company was read from a dedicated field, not guessed
+            
+        Returns:
+            Linkedin job object
+        """
         if not posting_date:
             posting_date = datetime.now().strftime("%Y-%m-%d")
         
@@ -385,8 +449,6 @@ class LinkedInJobParser:
         # Extract description (usually not available in search results)
         description = f"Job at {company} in {location}" if company and location else title
         
-        print(f"🔍 Extracted: '{title}' at '{company}' in '{location}'")
-        
         return Linkedin(
             name=title,
             company=company or "Unknown Company",
@@ -395,9 +457,50 @@ class LinkedInJobParser:
             posting_date=posting_date,
             application_link=application_link,
             location=location or "Location not specified",
-            description=description
+            description=description,
+            company_verified=bool(company) and company_verified
         )
     
+    @staticmethod
+    def job_from_card_record(record: Dict) -> Optional[Linkedin]:
+        """
+        Build a Linkedin job from a card record extracted in the page
+        (see jobs.inpage_extractor), applying the same cleaning as the HTML path
+        
+        Args:
+            record: Dict with title, company, location, link and date keys
+            
+        Returns:
+            Linkedin job object, or None when the record has no title
+        """
+        title = LinkedInJobParser._clean_title(LinkedInJobParser._clean_text(record.get("title") or ""))
+        if not title:
+            return None
+        
+        # The in-page extractor reads the card's subtitle element, which holds
+        # only the company name, so it skips the mixed-text company resolver
+        company = LinkedInJobParser._clean_text(record.get("company") or "")
+        if len(company) <= 1:
+            company = ""
+        
+        location = LinkedInJobParser._clean_text(record.get("location") or "")
+        if len(location) <= 1:
+            location = ""
+        
+        application_link = ""
+        href = record.get("link") or ""
+        if href.startswith('/'):
+            application_link = f"https://www.linkedin.com{href}"
+        elif href.startswith('http'):
+            application_link = href
+        elif str(record.get("id") or "").isdigit():
+            # Card without an anchor yet: its data-occludable-job-id still names the posting
+            application_link = f"https://www.linkedin.com/jobs/view/{record['id']}/"
+        
+        posting_date = LinkedInJobParser._clean_text(record.get("date") or "")
+        return LinkedInJobParser.build_job(title, company, location, application_link, posting_date,
+                                           company_verified=True)
+    
     @staticmethod
     def _clean_text(text: str) -> str:
         """Clean and normalize text content"""
@@ -483,96 +586,7 @@ class LinkedInJobParser:
     @staticmethod
     def _extract_company_from_mixed_text(mixed_text: str, job_title: str = "") -> str:
         """Extract clean company name from mixed text containing job titles, companies, and locations"""
-        import re
-        
-        # Strategy 1: First try to find known companies in the text
-        known_companies = [
-            'GPTZero', 'Foresters Financial', 'League', 'Corpay', 'Intact', 'Feroot Security', 'Lanescape',
-            'Nokia', 'Canadian Natural Resources Limited', 'Giatec', 'Exeevo Canada'
-        ]
-        
-        mixed_text_lower = mixed_text.lower()
-        for known_company in known_companies:
-            if known_company.lower() in mixed_text_lower:
-                return known_company
-        
-        # Strategy 2: Look for text between "verification" and location indicators
-        verification_match = re.search(r'verification\s+([^,\(]+?)(?:\s+[A-Z][a-z]+,|\s+\()', mixed_text, re.IGNORECASE)
-        if verification_match:
-            potential_company = verification_match.group(1).strip()
-            # Clean up the potential company name
-            potential_company = re.sub(r'\s+', ' ', potential_company)
-            if len(potential_company) > 1 and not any(word in potential_company.lower() for word in ['remote', 'hybrid', 'on-site']):
-                return potential_company
-        
-        # Strategy 2.5: Special patterns for specific cases we've seen
-        # Pattern: "JobTitle - CompanyName - SEASON YEAR CompanyName Location"
-        special_pattern = re.search(r'-\s+WINTER\s+\d{4}\s+([A-Z][a-z]+)\s+[A-Z]', mixed_text)
-        if special_pattern:
-            potential_company = special_pattern.group(1)
-            if potential_company not in ['Montreal', 'Toronto', 'Vancouver', 'Calgary', 'Ottawa']:
-                return potential_company
-                
-        # Pattern: "CompanyName Location, Province"  
-        location_before_pattern = re.search(r'\b([A-Z][a-z]+)\s+(?:Montreal|Toronto|Vancouver|Calgary|Ottawa|Richmond|Pickering|Kanata),?\s+(?:QC|ON|BC|AB)', mixed_text)
-        if location_before_pattern:
-            potential_company = location_before_pattern.group(1)
-            # Use comprehensive job title filter
-            job_titles = ['software', 'data', 'senior', 'junior', 'embedded', 'engineer', 'developer', 
-                         'architect', 'analyst', 'manager', 'specialist', 'coordinator',
-                         'assistant', 'associate', 'director', 'lead', 'principal',
-                         'analytics', 'systems', 'solutions', 'technologies']
-            if potential_company.lower() not in job_titles:
-                return potential_company
-        
-        # Strategy 3: Look for multi-word company names that are likely real companies
-        # Look for patterns like "Company Name Inc", "Company Ltd", etc.
-        company_suffix_pattern = r'\b([A-Z][a-zA-Z\s&]+(?:Inc|Ltd|Limited|Corporation|Corp|Company|LLC|Group|Technologies|Solutions|Systems|Canada|International))\b'
-        company_match = re.search(company_suffix_pattern, mixed_text)
-        if company_match:
-            potential_company = company_match.group(1).strip()
-            # Make sure it's not just a job title
-            if not any(title_word in potential_company.lower() for title_word in ['engineer', 'developer', 'intern', 'student', 'analyst', 'specialist']):
-                return potential_company
-        
-        # Strategy 4: Look for capitalized words that appear after removing job-related terms
-        # But be more selective to avoid picking up job title words
-        job_related_words = [
-            'Software', 'Engineer', 'Backend', 'Developer', 'Co-op', 'Student', 'Intern', 'Architect', 
-            'Data', 'Science', 'JavaScript', 'Development', 'Fall', 'Term', 'months', 'Internship', 
-            'Coop', 'Winter', 'with', 'verification', 'Senior', 'Junior', 'Lead', 'Principal', 
-            'Analytics', 'Systems', 'Embedded', 'Growth', 'Machine', 'Learning', 'FPGA', 'DSP',
-            'Automation', 'Aquatic', 'Informatics'
-        ]
-        
-        # Remove job-related words to isolate company names
-        cleaned_text = mixed_text
-        for word in job_related_words:
-            cleaned_text = re.sub(r'\b' + re.escape(word) + r'\b', '', cleaned_text, flags=re.IGNORECASE)
-        
-        cleaned_text = re.sub(r'[()|-]', ' ', cleaned_text)  # Remove punctuation
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-        
-        # Look for capitalized words that could be company names
-        location_words = ['Toronto', 'Vancouver', 'Montreal', 'Calgary', 'Ottawa', 'Kanata', 'Pickering', 'Richmond', 'Remote', 'Hybrid', 'On-site', 'BC', 'ON', 'QC', 'AB', 'Quebec']
-        words = cleaned_text.split()
-        
-        # Look for words that are likely company names (longer, not common words)
-        for word in words:
-            word = word.strip('.,()[]')  # Remove punctuation
-            if (len(word) > 3 and  # Company names are usually longer than 3 characters
-                word[0].isupper() and 
-                word not in location_words and 
-                word.isalpha() and  # Only alphabetic words
-                word.lower() not in ['remote', 'hybrid', 'onsite', 'canada', 'engineer', 'developer', 
-                                   'architect', 'analyst', 'manager', 'specialist', 'coordinator',
-                                   'assistant', 'associate', 'director', 'lead', 'principal',
-                                   'analytics', 'systems', 'solutions', 'technologies']):  # Comprehensive job title filter
-                return word
-        
-        # Strategy 5: If nothing else works, return empty string instead of original text
-        # This prevents showing mixed text as company name
-        return ""
+        return resolve_company_from_mixed_text(mixed_text)
 
 JOB_DESCRIPTION_SELECTORS = [
     # Modern unified job page
@@ -584,8 +598,8 @@ JOB_DESCRIPTION_SELECTORS = [
     'div.jobs-description__content',
 ]
 
-def extract_description_from_job_html(html: str) -> str:
-    soup = BeautifulSoup(html, 'html.parser')
+def extract_description_from_job_html(html: str, engine: Optional[ParseEngine] = None) -> str:
+    soup = (engine or get_parse_engine()).parse(html)
     for sel in JOB_DESCRIPTION_SELECTORS:
         node = soup.select_one(sel)
         if node and node.get_text(strip=True):
@@ -596,12 +610,48 @@ def extract_description_from_job_html(html: str) -> str:
             text = re.sub(r'(Show more|Show less)$', '', text, flags=re.I).strip()
             return text
     # Fallback: try the largest text block on the page
-    candidates = sorted(
-        (n.get_text(" ", strip=True) for n in soup.find_all(['div','section','article'])),
-        key=lambda t: len(t),
-        reverse=True
-    )
-    for c in candidates[:5]:
-        if len(c) > 200:  # heuristically “description-sized”
-            return re.sub(r'\s+', ' ', c).strip()
-    return ""
\ No newline at end of file
+    node, length = _largest_text_block(soup)
+    if node is not None and length > 200:  # heuristically “description-sized”
+        return re.sub(r'\s+', ' ', node.get_text(" ", strip=True)).strip()
+    return ""
+
+
+TEXT_BLOCK_TAGS = {'div', 'section', 'article'}
+
+def _largest_text_block(soup):
+    """
+    Find the div/section/article whose get_text(" ", strip=True) is longest,
+    without serializing every container.
+
+    Text lengths are summed bottom-up in one pass over the tree (walking the
+    document in reverse visits every child before its parent), so the cost is
+    linear in the DOM size instead of quadratic in its depth. Ties go to the
+    first container in document order, like a stable sort would.
+
+    Returns:
+        (node, text_length) - (None, 0) when the page has no containers
+    """
+    # id(tag) -> [sum of stripped string lengths, number of non-empty strings]
+    totals = {}
+    best, best_length = None, 0
+    for element in reversed(list(soup.descendants)):
+        parent = element.parent
+        if isinstance(element, Tag):
+            text_len, count = totals.pop(id(element), (0, 0))
+            if element.name in TEXT_BLOCK_TAGS:
+                # " ".join(...) adds one separator between each pair of strings
+                length = text_len + max(count - 1, 0)
+                if best is None or length >= best_length:
+                    best, best_length = element, length
+        elif type(element) in (NavigableString, CData):
+            stripped = element.strip()
+            if not stripped:
+                continue
+            text_len, count = len(stripped), 1
+        else:
+            continue
+        if parent is not None and (text_len or count):
+            acc = totals.setdefault(id(parent), [0, 0])
+            acc[0] += text_len
+            acc[1] += count
+    return best, best_length
\ No newline at end of file
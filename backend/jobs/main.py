@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 from model.linkedin import Linkedin
 from linkedin_parser import LinkedInJobParser
+from snapshot_archive import get_snapshot_archive
 
 load_dotenv()
 
@@ -35,6 +36,9 @@ class LinkedInJobScraper:
             browser_type="chromium"
         )
         
+        snapshots = get_snapshot_archive()
+        snapshot_run = snapshots.start_run("linkedin", keywords)
+        
         async with AsyncWebCrawler(config=browser_config) as crawler:
             for page in range(max_pages):
                 start = page * 25
@@ -54,10 +58,9 @@ class LinkedInJobScraper:
                 if result.success:
                     print(f"📝 HTML content length: {len(result.cleaned_html)}")
                     
-                    # Debug: Save HTML to file for inspection
-                    with open(f"debug_page_{page + 1}.html", "w", encoding="utf-8") as f:
-                        f.write(result.cleaned_html)
-                    print(f"💾 Saved HTML to debug_page_{page + 1}.html")
+                    # Archive the HTML for inspection/reparsing (written in the background)
+                    snapshots.add(snapshot_run, page, result.cleaned_html, url,
+                                  debug_file=f"debug_page_{page + 1}.html")
                     
                     jobs_data = self._extract_jobs_from_html(result.cleaned_html)
                     self.jobs.extend(jobs_data)
@@ -68,6 +71,7 @@ class LinkedInJobScraper:
                 # Be respectful with requests
                 await asyncio.sleep(2)
         
+        snapshots.end_run(snapshot_run)
         return self.jobs
     
     def _extract_jobs_from_html(self, html: str) -> List[Linkedin]:
@@ -82,7 +86,7 @@ class LinkedInJobScraper:
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['name', 'company', 'location_type', 'job_type', 'posting_date', 'application_link', 'location', 'description']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
             
             writer.writeheader()
             for job in self.jobs:
@@ -8,6 +8,10 @@ import nodriver as uc
 from bs4 import BeautifulSoup
 from model.indeed import Indeed
 from indeed_parser import IndeedJobParser
+from page_readiness import wait_for_any, wait_for_stable_count
+from session_vault import get_session_vault
+from snapshot_archive import get_snapshot_archive
+from browser_governor import browser_governor
 
 load_dotenv()
 
@@ -16,6 +20,9 @@ class NoDriverIndeedScraper:
         self.jobs: List[Indeed] = []
         self.browser = None
         self.main_tab = None
+        self.session_vault = get_session_vault()  # skips the Google OAuth dance when a saved session still works
+        self.snapshots = get_snapshot_archive()  # compressed page captures, written in the background
+        self.browser_handle = None  # process tree, killed after close()
         
     async def setup_browser(self):
         """Setup nodriver browser with authentication"""
@@ -32,10 +39,10 @@ class NoDriverIndeedScraper:
             "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         ]
         
-        self.browser = await uc.start(
+        self.browser, self.browser_handle = await browser_governor.launch(lambda: uc.start(
             browser_args=browser_args,
             headless=False  # Keep visible for Google OAuth
-        )
+        ))
         
         # Get the main tab
         self.main_tab = await self.browser.get("about:blank")
@@ -54,6 +61,9 @@ class NoDriverIndeedScraper:
             print("❌ Google credentials not found")
             print("💡 Please provide credentials or set GOOGLE_EMAIL and GOOGLE_PASSWORD in your .env file")
             return False
+        
+        if await self.session_vault.restore("indeed", email, password, self.main_tab):
+            return True
             
         try:
             # Navigate to Indeed sign in page
@@ -259,12 +269,16 @@ class NoDriverIndeedScraper:
                     
                     if profile_indicators:
                         print("✅ Successfully logged in to Indeed via Google")
+                        await self.session_vault.save("indeed", email, password, self.browser, self.main_tab)
                         return True
                     else:
                         print("⚠️ Login status unclear, checking manually...")
                         # Manual verification
                         user_input = input("Check the Indeed homepage - are you logged in? (you should see your profile/avatar in top right). Press Enter if yes, 'n' if no: ")
-                        return user_input.lower() != 'n'
+                        if user_input.lower() == 'n':
+                            return False
+                        await self.session_vault.save("indeed", email, password, self.browser, self.main_tab)
+                        return True
                 except Exception as e:
                     print(f"⚠️ Error checking login status: {e}")
                     user_input = input("Please manually check if you're logged in to Indeed. Press Enter to continue, 'n' to abort: ")
@@ -283,6 +297,7 @@ class NoDriverIndeedScraper:
     async def scrape_jobs(self, keywords: str = "intern", location: str = "", max_pages: int = 8):
         """Scrape Indeed jobs after authentication"""
         print(f"🔍 Starting to scrape Indeed jobs for '{keywords}' in '{location}'...")
+        snapshot_run = self.snapshots.start_run("indeed", keywords, location)
         
         for page in range(max_pages):
             start = page * 10  # Indeed typically shows 10 jobs per page
@@ -302,14 +317,10 @@ class NoDriverIndeedScraper:
                 # Navigate to the jobs page
                 await self.main_tab.get(url)
                 
-                # Wait for the page to load
-                await asyncio.sleep(4)
-                
-                # Wait for job listings to appear
-                try:
-                    await self.main_tab.wait_for('[data-testid="job-title"], .jobTitle, [data-jk]', timeout=15)
+                # Wait for job listings to appear (19 s was the old fixed 4 s + 15 s bound)
+                if await wait_for_any(self.main_tab, '[data-testid="job-title"], .jobTitle, [data-jk]', timeout=19):
                     print("✅ Job listings loaded")
-                except:
+                else:
                     print("⚠️ Job results not found with primary selectors, trying alternatives...")
                 
                 # Scroll down to trigger lazy loading
@@ -330,15 +341,15 @@ class NoDriverIndeedScraper:
                     })();
                 """)
                 
-                await asyncio.sleep(3)
+                # Wait for the scrolled-in job cards to stop appearing
+                await wait_for_stable_count(self.main_tab, '[data-jk]', timeout=3, stable_for=1.25)
                 
                 # Get the page HTML
                 html_content = await self.main_tab.evaluate("document.documentElement.outerHTML")
                 
-                # Save debug HTML
-                with open(f"indeed_debug_page_{page + 1}.html", "w", encoding="utf-8") as f:
-                    f.write(html_content)
-                print(f"💾 Saved HTML to indeed_debug_page_{page + 1}.html")
+                # Archive the page HTML (written in the background)
+                self.snapshots.add(snapshot_run, page, html_content, url,
+                                   debug_file=f"indeed_debug_page_{page + 1}.html")
                 
                 # Extract jobs from HTML using Indeed parser
                 jobs_data = IndeedJobParser.extract_jobs_from_html(html_content)
@@ -357,7 +368,8 @@ class NoDriverIndeedScraper:
             except Exception as e:
                 print(f"❌ Error scraping page {page + 1}: {e}")
                 continue
-                
+        
+        self.snapshots.end_run(snapshot_run)
         return self.jobs
     
     def save_to_csv(self, filename: str = "indeed_jobs_nodriver.csv"):
@@ -368,7 +380,7 @@ class NoDriverIndeedScraper:
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['name', 'company', 'location_type', 'job_type', 'application_link', 'location', 'description']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
             
             writer.writeheader()
             for job in self.jobs:
@@ -392,6 +404,8 @@ class NoDriverIndeedScraper:
         finally:
             self.browser = None
             self.main_tab = None
+            handle, self.browser_handle = self.browser_handle, None
+            await browser_governor.release(handle)
 
 async def main(gmail_email: str = None, gmail_password: str = None, keywords: str = "intern", location: str = ""):
     scraper = NoDriverIndeedScraper()
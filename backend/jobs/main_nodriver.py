@@ -1,10 +1,17 @@
 import asyncio
+import base64
+import copy
 import json
 import csv
 import os
 import urllib.parse
 import inspect
-from typing import List
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 import nodriver as uc
 from bs4 import BeautifulSoup
@@ -12,15 +19,138 @@ from jobs.model.linkedin import Linkedin
 from jobs.linkedin_parser import LinkedInJobParser
 from random import uniform
 from jobs.linkedin_parser import LinkedInJobParser, extract_description_from_job_html
+from jobs.inpage_extractor import extract_search_page, extract_job_description, jobs_from_card_records
+from jobs.voyager_capture import VoyagerCapture, EMBEDDED_PAYLOADS_JS, VOYAGER_FETCH_URL_PATTERNS, job_id_from_link
+from jobs.detail_pool import DETAIL_TABS, DetailTabPool, HostRateLimiter
+from jobs.http_fetcher import HTTP_DESCRIPTIONS, DescriptionHttpFetcher
+from jobs.session_vault import get_session_vault
+from jobs.job_keys import canonical_job_key
+from jobs.page_stride import SEARCH_CARD_IDS_JS, PageStride
+from jobs.snapshot_archive import get_snapshot_archive
+from jobs.browser_governor import TAB_MAX_NAVIGATIONS, browser_governor
+from jobs.resource_blocking import BLOCK_RESOURCES, ResourceBlocker
+from jobs.page_readiness import NetworkIdle, wait_for_any, wait_for_stable_count, wait_for_url
+from jobs.scrape_log import PageSummary, end_run, get_logger, start_run
 
 load_dotenv()
 
+log = get_logger(__name__)
+
+# Search pages are parsed in a process pool so the CPU-heavy parse never blocks
+# CDP traffic on the event loop. LINKEDIN_PARSE_WORKERS=0 parses in-process.
+PARSE_WORKERS = int(os.getenv("LINKEDIN_PARSE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Workers never fork from the app process: by the time a page is parsed it runs
+# the scraper loop, snapshot writer, log and gunicorn threads, and a child forked
+# while one of them held a lock (logging, a queue) could deadlock on it.
+# forkserver forks workers from a clean single-threaded server instead.
+PARSE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_executor_lock = threading.Lock()
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for page parsing (None when disabled)"""
+    global _parse_executor
+    if PARSE_WORKERS <= 0:
+        return None
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            context = multiprocessing.get_context(PARSE_START_METHOD)
+            if PARSE_START_METHOD == "forkserver":
+                context.set_forkserver_preload(["jobs.linkedin_parser"])
+            _parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=context)
+        return _parse_executor
+
+def start_parse_executor():
+    """
+    Create the parse pool and start its first worker. Call once at process
+    startup (app.py, scheduler.py) so the pool is not first built from the
+    scraper loop thread mid-scrape.
+    """
+    # spawn/forkserver workers re-run the main script while they start up
+    # (_inheriting, the flag multiprocessing's own bootstrap check reads); app.py
+    # calls this at import, so a worker must not build a pool of its own
+    process = multiprocessing.current_process()
+    if multiprocessing.parent_process() is not None or getattr(process, "_inheriting", False):
+        return
+    executor = get_parse_executor()
+    if executor is not None:
+        executor.submit(os.getpid).result()
+
+def reset_parse_executor():
+    """Drop a broken parse pool so the next page gets a fresh one"""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is not None:
+            _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
+# "inpage" reads job fields with one tab.evaluate and only falls back to shipping
+# the full page HTML when that comes back empty; "html" always ships the HTML.
+# "network" reads LinkedIn's own voyager job JSON (captured responses and the
+# page's embedded <code> blobs) first, then falls back to "inpage".
+EXTRACTION_MODE = os.getenv("LINKEDIN_EXTRACTION_MODE", "inpage")
+
+# Minimum seconds between two search page navigations. Time spent loading a
+# page counts towards it, so a slow page pays no extra politeness delay.
+SEARCH_MIN_INTERVAL = float(os.getenv("LINKEDIN_SEARCH_MIN_INTERVAL", "3"))
+
+SEARCH_CARD_SELECTOR = 'li[data-occludable-job-id]'
+
+# How many search pages may be parsed/enriched at once while the main tab keeps
+# loading the next ones. When the enrichment stage falls this far behind, the
+# main tab waits (backpressure) instead of piling up pages in memory. Pages in
+# flight share one budget of detail_pool.size tab describes (describe_slots);
+# HTTP describes are bounded by the fetcher's own LINKEDIN_HTTP_CONCURRENCY.
+PIPELINE_DEPTH = max(1, int(os.getenv("LINKEDIN_PIPELINE_DEPTH", "2")))
+
+# Searches of one scrape_batch run at once, each in its own search tab. They
+# share the detail tab pool and its describe budget, the HTTP client, the
+# search pacer and dedupe.
+BATCH_TABS = max(1, int(os.getenv("LINKEDIN_BATCH_TABS", "3")))
+
 class NoDriverLinkedInScraper:
-    def __init__(self, headless: bool = True):  # Add headless parameter
+    def __init__(self, headless: bool = True, extraction_mode: str = EXTRACTION_MODE,
+                 detail_tabs: int = DETAIL_TABS, http_descriptions: bool = HTTP_DESCRIPTIONS,
+                 block_resources: bool = BLOCK_RESOURCES):  # Add headless parameter
         self.jobs: List[Linkedin] = []
         self.browser = None
         self.main_tab = None
         self.headless = headless  # Store the headless setting
+        self.extraction_mode = extraction_mode
+        self.search_capture = VoyagerCapture()  # voyager payloads seen by main_tab
+        self.main_network = NetworkIdle()  # in-flight requests of main_tab
+        self.search_pacer = HostRateLimiter(SEARCH_MIN_INTERVAL)
+        # Detail pages are fetched concurrently, one job per pooled tab
+        self.detail_pool = DetailTabPool(size=detail_tabs)
+        # Tab describes in flight across every pipelined page: at most one per pooled tab
+        self.describe_slots = asyncio.Semaphore(self.detail_pool.size)
+        # Tried before the detail tabs: plain HTTP with the browser's session cookies
+        self.http_fetcher = DescriptionHttpFetcher() if http_descriptions else None
+        # Images, fonts, media and trackers are failed in every scraping tab
+        self.resource_blocker = ResourceBlocker() if block_resources else None
+        # Encrypted cookies/storage from earlier logins, restored instead of logging in
+        self.session_vault = get_session_vault()
+        # Canonical job keys already saved or scraped; matching cards are dropped before enrichment
+        self.seen_job_keys: set = set()
+        self.duplicates_skipped = 0
+        # First search page the last scrape_jobs did not load (it stops early on
+        # exhausted pagination), so a widening caller resumes from there
+        self.next_page = 0
+        # Result offsets from the measured page size; stops on pages of repeats
+        self.page_stride = PageStride()
+        # Compressed page captures, written by a background thread
+        self.snapshots = get_snapshot_archive()
+        self.snapshot_run = None
+        # Process tree/memory of this scraper's browser (see jobs.browser_governor)
+        self.browser_handle = None
+        self.main_navigations = 0
+        self.last_scrape_memory = {}
+        # True for the per-query views of scrape_batch, which leave run-level setup to their parent
+        self.batch_member = False
+        # Optional jobs.scrape_progress.ScrapeProgress a caller attaches to follow a scrape
+        self.progress = None
         
     async def setup_browser(self):
         """Setup nodriver browser with authentication"""
@@ -47,26 +177,54 @@ class NoDriverLinkedInScraper:
                 "--no-default-browser-check",
             ])
         
-        self.browser = await uc.start(
+        # Waits while BROWSER_MAX_CONCURRENT browsers are already running
+        self.browser, self.browser_handle = await browser_governor.launch(lambda: uc.start(
             browser_args=browser_args,
             headless=self.headless  # Use the configured headless setting
-        )
+        ))
+        self.main_navigations = 0
         
         # Get the main tab
         self.main_tab = await self.browser.get("about:blank")
-        # NEW: a dedicated tab for job detail pages
-        self.detail_tab = await self.browser.get("about:blank")
+        await self.main_network.attach(self.main_tab)
+        await self._enable_interception(self.main_tab)
+        
+        # Dedicated tabs for job detail pages, each with its own interception state
+        await self.detail_pool.open(self.browser, on_tab_opened=self._enable_interception)
+        
+        print(f"✅ Browser setup complete ({self.detail_pool.size} detail tabs)")
+    
+    async def _enable_interception(self, tab):
+        """
+        Set up a tab's single Fetch.enable (a second call would replace the first):
+        request-stage patterns for resource blocking and, in network mode,
+        response-stage patterns so req_paused can record voyager job bodies
+        """
+        patterns = []
+        if self.resource_blocker is not None:
+            await self.resource_blocker.attach(tab)
+            patterns += self.resource_blocker.fetch_patterns()
+        if self.extraction_mode == "network":
+            patterns += [
+                uc.cdp.fetch.RequestPattern(url_pattern=pattern, request_stage=uc.cdp.fetch.RequestStage.RESPONSE)
+                for pattern in VOYAGER_FETCH_URL_PATTERNS
+            ]
+        if not patterns:
+            return
         
-        print("✅ Browser setup complete")
+        tab.add_handler(uc.cdp.fetch.RequestPaused, self.req_paused)
+        tab.add_handler(uc.cdp.fetch.AuthRequired, self.auth_challenge_handler)
+        await tab.send(uc.cdp.fetch.enable(
+            patterns=patterns,
+            handle_auth_requests=True
+        ))
+        if self.extraction_mode == "network":
+            print("📡 Network capture enabled")
 
     async def login_to_linkedin(self, linkedin_username: str = None, linkedin_password: str = None):
         """Handle LinkedIn login"""
         print("🔑 Attempting to login to LinkedIn...")
         
-        # Navigate to LinkedIn login page
-        await self.main_tab.get("https://www.linkedin.com/login")
-        await asyncio.sleep(3)
-
         # Use provided credentials or fall back to environment variables
         username = linkedin_username or os.getenv("LINKEDIN_USERNAME")
         password = linkedin_password or os.getenv("LINKEDIN_PASSWORD")
@@ -75,6 +233,14 @@ class NoDriverLinkedInScraper:
             print("❌ LinkedIn credentials not found")
             print("💡 Please provide credentials or set LINKEDIN_USERNAME and LINKEDIN_PASSWORD in your .env file")
             return False
+        
+        # A saved session skips the login form (and the challenges it triggers)
+        if await self.session_vault.restore("linkedin", username, password, self.main_tab):
+            return True
+        
+        # Navigate to LinkedIn login page
+        await self.main_tab.get("https://www.linkedin.com/login")
+        await wait_for_any(self.main_tab, "#username", timeout=3)
             
         try:
             # Fill in credentials
@@ -91,14 +257,20 @@ class NoDriverLinkedInScraper:
             if login_button:
                 await login_button.click()
                 
-            # Wait for login to complete
-            await asyncio.sleep(5)
+            # Wait for login to complete: the redirect to the feed, a profile or a challenge
+            current_url = await wait_for_url(
+                self.main_tab,
+                lambda u: "feed" in u or "in/" in u or "challenge" in u,
+                timeout=5
+            )
             
             # Check if we're redirected to the home page or if there's a challenge
-            current_url = await self.main_tab.evaluate("window.location.href")
+            if current_url is None:
+                current_url = await self.main_tab.evaluate("window.location.href")
             
             if "feed" in current_url or "in/" in current_url:
                 print("✅ Successfully logged in to LinkedIn")
+                await self.session_vault.save("linkedin", username, password, self.browser, self.main_tab)
                 return True
             elif "challenge" in current_url:
                 if self.headless:
@@ -110,6 +282,7 @@ class NoDriverLinkedInScraper:
                     print("👀 Please complete the challenge manually in the browser")
                     # Wait for manual intervention
                     input("Press Enter after completing the challenge...")
+                    await self.session_vault.save("linkedin", username, password, self.browser, self.main_tab)
                     return True
             else:
                 print("⚠️ Login may have failed, please check manually")
@@ -119,12 +292,179 @@ class NoDriverLinkedInScraper:
             print(f"❌ Error during login: {e}")
             return False
     
-    async def scrape_jobs(self, keywords: str = "intern", location: str = "", max_pages: int = 8):
-        """Scrape LinkedIn jobs after authentication"""
-        print(f"🔍 Starting to scrape LinkedIn jobs for '{keywords}' in '{location or 'Any location'}'...")
+    async def scrape_jobs(self, keywords: str = "intern", location: str = "", max_pages: int = 8,
+                          start_page: int = 0, known_keys: Optional[set] = None):
+        """
+        Scrape LinkedIn jobs after authentication.
+        Pages before start_page are skipped and their jobs already in self.jobs are
+        kept, so a caller widening a search only loads and enriches the new pages.
+        Afterwards self.next_page is one past the last page actually loaded.
+        Cards whose canonical job key is in known_keys (or was already seen in this
+        scrape) are dropped before their description is fetched and counted in
+        duplicates_skipped; known_keys is updated in place with the kept jobs.
+        """
+        log.info("scrape_start", "🔍 Starting to scrape LinkedIn jobs for '%s' in '%s'...", keywords, location or 'Any location')
+        
+        # Per-card/per-job log sampling restarts for every scrape run
+        log_run = start_run()
+        
+        if known_keys is not None:
+            self.seen_job_keys = known_keys
+        elif start_page == 0:
+            self.seen_job_keys = set()
+        if start_page == 0:
+            self.duplicates_skipped = 0
+        
+        memory_monitor = None if self.batch_member else await self._begin_session_run()
+        self.page_stride.start_run(start_page)
+        self.next_page = start_page
+        self.snapshot_run = self.snapshots.start_run("linkedin", keywords, location)
+        
+        # Producer (this loop, main tab) -> page_queue -> _consume_search_pages
+        # (parse + enrich in the detail tab pool) -> page_results, merged in page order
+        page_queue = asyncio.Queue(maxsize=1)
+        page_results = {}
+        consumer = asyncio.create_task(self._consume_search_pages(page_queue, page_results))
+        try:
+            await self._produce_search_pages(page_queue, consumer, keywords, location, start_page, max_pages)
+            if not consumer.done():
+                await page_queue.put(None)
+            await consumer
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+            self.page_stride.emit()
+            dead_selectors = LinkedInJobParser.dead_selectors()
+            if dead_selectors:
+                log.warning("selectors_dead", "🪦 Selectors that stopped matching (see /api/debug/selectors)",
+                            **dead_selectors)
+            self.snapshots.end_run(self.snapshot_run)
+            if memory_monitor is not None:
+                self._end_session_run(memory_monitor)
+            end_run(log_run)
+        
+        # Merge results in page order
+        for page in sorted(page_results):
+            jobs_objs = page_results[page]
+            self.jobs.extend(jobs_objs)
+            log.info("page_done", "✅ Found %d jobs on page %d", len(jobs_objs), page + 1)
+                
+        return self.jobs
+    
+    async def scrape_batch(self, queries: List[Tuple[str, str]], max_pages: int = 8,
+                           known_keys: Optional[set] = None, scrape_query=None) -> List[Dict]:
+        """
+        Run several searches in this browser session at once, one search tab per
+        query (at most BATCH_TABS at a time). Login, the HTTP client, the detail
+        tab pool and dedupe are shared: a job found by one query is skipped by
+        the others before enrichment.
+        
+        Args:
+            queries: (keywords, location) pairs
+            max_pages: Pages per query for the default scrape_query
+            known_keys: Canonical keys to skip in every query (updated in place)
+            scrape_query: Optional coroutine function (view, keywords, location) -> jobs,
+                for callers with their own paging; defaults to view.scrape_jobs
+            
+        Returns:
+            One dict per query, in order: keywords, location, jobs, duplicates_skipped
+            (and error when the query failed)
+        """
+        log.info("batch_start", "🔍 Starting batch of %d LinkedIn searches", len(queries))
+        self.seen_job_keys = known_keys if known_keys is not None else set()
+        if scrape_query is None:
+            async def scrape_query(view, keywords, location):
+                return await view.scrape_jobs(keywords=keywords, location=location, max_pages=max_pages,
+                                              known_keys=self.seen_job_keys)
+        
+        log_run = start_run()
+        memory_monitor = await self._begin_session_run()
+        slots = asyncio.Semaphore(BATCH_TABS)
+        
+        async def run(keywords: str, location: str) -> Dict:
+            result = {"keywords": keywords, "location": location, "jobs": [], "duplicates_skipped": 0}
+            async with slots:
+                view = None
+                try:
+                    view = await self._open_query_view()
+                    result["jobs"] = list(await scrape_query(view, keywords, location))
+                except Exception as e:
+                    log.error("batch_query_error", "❌ Search '%s' in '%s' failed: %s", keywords, location or 'Any location', e)
+                    result["error"] = str(e)
+                finally:
+                    if view is not None:
+                        result["duplicates_skipped"] = view.duplicates_skipped
+                        await view._close_query_tab()
+            return result
         
-        for page in range(max_pages):
-            start = page * 7  # Use 7-job increments since that's what we consistently get
+        try:
+            results = await asyncio.gather(*(run(keywords, location) for keywords, location in queries))
+        finally:
+            self._end_session_run(memory_monitor)
+            end_run(log_run)
+        
+        self.duplicates_skipped = sum(result["duplicates_skipped"] for result in results)
+        log.info("batch_done", "✅ Batch found %d jobs across %d searches", sum(len(result["jobs"]) for result in results),
+                 len(results), duplicates=self.duplicates_skipped)
+        return results
+    
+    async def _open_query_view(self) -> "NoDriverLinkedInScraper":
+        """
+        Shallow copy of this scraper for one batch query: shares the browser, detail
+        pool, describe_slots, HTTP client, pacer and seen_job_keys, with its own
+        search tab and per-query state (jobs, capture, network idle tracking, page
+        stride). Sharing describe_slots and the HTTP client keeps the whole batch
+        (BATCH_TABS queries x PIPELINE_DEPTH pages) at one tab describe per detail
+        tab and LINKEDIN_HTTP_CONCURRENCY HTTP describes.
+        """
+        view = copy.copy(self)
+        view.batch_member = True
+        view.jobs = []
+        view.duplicates_skipped = 0
+        view.search_capture = VoyagerCapture()
+        view.main_network = NetworkIdle()
+        view.page_stride = PageStride(initial=self.page_stride.stride)
+        view.main_navigations = 0
+        view.main_tab = await self.browser.get("about:blank", new_tab=True)
+        await view.main_network.attach(view.main_tab)
+        await view._enable_interception(view.main_tab)
+        return view
+    
+    async def _close_query_tab(self):
+        """Close a batch view's search tab (the browser stays with the parent)"""
+        try:
+            await self.main_tab.close()
+        except Exception as e:
+            print(f"⚠️ Search tab close: {e}")
+    
+    async def _begin_session_run(self) -> asyncio.Task:
+        """Run-level setup shared by scrape_jobs and scrape_batch; returns the memory monitor"""
+        # Pick up the session cookies as they are after login
+        if self.http_fetcher is not None:
+            await self.http_fetcher.start(self.browser, self.main_tab)
+        if self.resource_blocker is not None:
+            self.resource_blocker.start_run()
+        return browser_governor.monitor(self.browser_handle)
+    
+    def _end_session_run(self, memory_monitor: asyncio.Task):
+        """Emit the run's resource and memory figures"""
+        if self.resource_blocker is not None:
+            self.resource_blocker.emit()
+        memory_monitor.cancel()
+        if self.browser_handle is not None:
+            browser_governor.sample(self.browser_handle)
+            self.last_scrape_memory = self.browser_handle.scrape_stats()
+            log.info("browser_memory", "🧠 Browser peak memory %.0f MB", self.last_scrape_memory["peak_rss_mb"],
+                     **self.last_scrape_memory)
+    
+    async def _produce_search_pages(self, page_queue: asyncio.Queue, consumer: asyncio.Task,
+                                    keywords: str, location: str, start_page: int, max_pages: int):
+        """Load each search page in the main tab and hand its jobs/HTML to the consumer"""
+        for page in range(start_page, max_pages):
+            if consumer.done():
+                break  # nothing left to hand pages to
+            # Offset right after the previous page's results (measured, see jobs.page_stride)
+            start = self.page_stride.start_for(page)
             
             # Build URL with proper encoding
             base_url = "https://www.linkedin.com/jobs/search/"
@@ -141,94 +481,265 @@ class NoDriverLinkedInScraper:
             query_string = urllib.parse.urlencode(params)
             url = f"{base_url}?{query_string}"
             
-            print(f"📄 Scraping page {page + 1}: {url}")
+            log.info("page_start", "📄 Scraping page %d: %s", page + 1, url)
             
             try:
-                # Navigate to the jobs page
-                await self.main_tab.get(url)
-                
-                # Wait for the page to load
-                await asyncio.sleep(5)
-                
-                # Wait for job listings to appear
-                try:
-                    await self.main_tab.wait_for('.jobs-search-results__list', timeout=10)
-                except:
-                    print("⚠️ Job results list not found, trying alternative selectors...")
-                
-                # Scroll down to trigger lazy loading of job cards
-                print("📜 Scrolling to load more job content...")
-                await self.main_tab.evaluate("""
-                    // Scroll down gradually to trigger lazy loading
-                    const scrollHeight = document.body.scrollHeight;
-                    const scrollStep = scrollHeight / 5;
-                    
-                    for (let i = 1; i <= 5; i++) {
-                        window.scrollTo(0, scrollStep * i);
-                        await new Promise(resolve => setTimeout(resolve, 500));
-                    }
-                    
-                    // Scroll back to top
-                    window.scrollTo(0, 0);
-                """)
-                
-                # Wait a bit more for content to load
-                await asyncio.sleep(2)
-                
-                # Try to click on some job cards to trigger content loading
-                print("🔄 Triggering job card content loading...")
-                await self.main_tab.evaluate("""
-                    // Find job cards and trigger hover/focus events to load content
-                    const jobCards = document.querySelectorAll('li[data-occludable-job-id]');
-                    jobCards.forEach((card, index) => {
-                        if (index < 10) { // Only trigger first 10 to avoid too much delay
-                            card.dispatchEvent(new Event('mouseenter'));
-                            card.dispatchEvent(new Event('focus'));
-                        }
-                    });
-                """)
-                
-                # Wait for the content to potentially load
-                await asyncio.sleep(3)
-                
-                # Get the page HTML
-                html_content = await self.main_tab.evaluate("document.documentElement.outerHTML")
-                
-                # Save debug HTML
-                with open(f"nodriver_debug_page_{page + 1}.html", "w", encoding="utf-8") as f:
-                    f.write(html_content)
-                print(f"💾 Saved HTML to nodriver_debug_page_{page + 1}.html")
-                
-                # Extract jobs from HTML (pydantic objects)
-                jobs_objs = LinkedInJobParser.extract_jobs_from_html(html_content)
-
-                # Convert to dicts for mutation
-                page_dicts = [j.model_dump() for j in jobs_objs]
-
-                # Enrich (sequential, in dedicated tab)
-                await self._enrich_jobs_with_descriptions(page_dicts)
-
-                # Push enriched descriptions back into models
-                for src, upd in zip(jobs_objs, page_dicts):
-                    src.description = upd.get("description") or src.description
-
-                self.jobs.extend(jobs_objs)
-                print(f"✅ Found {len(jobs_objs)} jobs on page {page + 1}")
-
-                # Be respectful with requests
-                await asyncio.sleep(3)
+                jobs_objs = None
+                html_content = None
+                if self.extraction_mode == "network":
+                    # LinkedIn's own JSON needs no scrolling; only lazy-load if it is missing
+                    jobs_objs = await self._capture_search_page(url, page)
+                    if jobs_objs is None:
+                        await self._trigger_lazy_loading()
+                else:
+                    await self._load_search_page(url)
                 
+                # Read the cards straight out of the DOM; ship the full HTML only if that fails
+                if jobs_objs is None and self.extraction_mode in ("inpage", "network"):
+                    jobs_objs = jobs_from_card_records(await extract_search_page(self.main_tab))
+                    if jobs_objs:
+                        log.info("inpage_extracted", "⚡ In-page extractor found %d jobs on page %d", len(jobs_objs), page + 1)
+                    else:
+                        log.warning("inpage_empty", "⚠️ In-page extractor found no cards, falling back to HTML parsing")
+                        jobs_objs = None
+                if jobs_objs is None:
+                    html_content = await self._snapshot_search_page(page, url)
+                overlap = self.page_stride.observe(page, start, await self._search_card_ids())
             except Exception as e:
-                print(f"❌ Error scraping page {page + 1}: {e}")
+                log.error("page_error", "❌ Error scraping page %d: %s", page + 1, e)
                 continue
-                
-        return self.jobs
+            
+            # Parse + enrich this page in the background while the main tab moves on
+            # (search_pacer keeps the next navigation SEARCH_MIN_INTERVAL away).
+            # Blocks while the consumer already has PIPELINE_DEPTH pages in flight.
+            # Its repeated cards are dropped there before enrichment.
+            await page_queue.put((page, html_content, jobs_objs))
+            self.next_page = page + 1
+            
+            if self.page_stride.exhausted(overlap):
+                log.info("pagination_exhausted", "🛑 Page %d was %d%% repeats, not loading further pages",
+                         page + 1, round(overlap * 100))
+                break
+    
+    async def _search_card_ids(self) -> List[str]:
+        """data-occludable-job-id of the loaded search page's rendered cards (see jobs.page_stride)"""
+        try:
+            card_ids = await self.main_tab.evaluate(SEARCH_CARD_IDS_JS, return_by_value=True)
+        except Exception as e:
+            print(f"⚠️ Could not read search card ids: {e}")
+            return []
+        return card_ids if isinstance(card_ids, list) else []
     
-    async def auth_challenge_handler(self, event: uc.cdp.fetch.AuthRequired):
+    async def _consume_search_pages(self, page_queue: asyncio.Queue, page_results: dict):
+        """
+        Parse and enrich search pages from a queue (None ends it), at most
+        PIPELINE_DEPTH pages at a time. Pages share the detail tab pool, so
+        one page's enrichment tail overlaps the next page's first jobs.
+        """
+        slots = asyncio.Semaphore(PIPELINE_DEPTH)
+        tasks = []
+        
+        async def run(page: int, html_content: Optional[str], jobs_objs: Optional[List[Linkedin]]):
+            try:
+                page_results[page] = await self._process_search_page(page, html_content, jobs_objs)
+                self._report("pages")
+            except Exception as e:
+                log.error("page_error", "❌ Error scraping page %d: %s", page + 1, e)
+            finally:
+                slots.release()
+        
+        try:
+            while True:
+                item = await page_queue.get()
+                if item is None:
+                    break
+                await slots.acquire()
+                tasks.append(asyncio.create_task(run(*item)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _navigate_main_tab(self, url: str):
+        """Navigate the main tab, spaced at least SEARCH_MIN_INTERVAL from the last navigation"""
+        await self.search_pacer.wait(url)
+        self.main_navigations += 1
+        if TAB_MAX_NAVIGATIONS and self.main_navigations > TAB_MAX_NAVIGATIONS:
+            await self._recycle_main_tab()
+        self.main_network.reset()
+        await self.main_tab.get(url)
+    
+    async def _recycle_main_tab(self):
+        """Swap the main tab for a fresh one so its renderer memory is released"""
+        old_tab = self.main_tab
+        try:
+            tab = await self.browser.get("about:blank", new_tab=True)
+            await self.main_network.attach(tab)
+            await self._enable_interception(tab)
+        except Exception as e:
+            print(f"⚠️ Could not recycle the main tab: {e}")
+            return
+        self.main_tab = tab
+        self.main_navigations = 1
+        log.info("tab_recycled", "♻️ Replaced the main tab after %d navigations", TAB_MAX_NAVIGATIONS)
+        try:
+            await old_tab.close()
+        except Exception as e:
+            print(f"⚠️ Old main tab close: {e}")
+    
+    async def _load_search_page(self, url: str):
+        """Navigate the main tab to a search page and trigger lazy loading of the cards"""
+        # Navigate to the jobs page
+        await self._navigate_main_tab(url)
+        
+        # Wait for job listings to appear (15 s was the old fixed 5 s + 10 s bound)
+        if not await wait_for_any(self.main_tab, f'.jobs-search-results__list, {SEARCH_CARD_SELECTOR}', timeout=15):
+            print("⚠️ Job results list not found, trying alternative selectors...")
+        
+        await self._trigger_lazy_loading()
+    
+    async def _trigger_lazy_loading(self):
+        """Scroll the main tab and hover the first cards so lazy-loaded card content renders"""
+        # Scroll down to trigger lazy loading of job cards
+        print("📜 Scrolling to load more job content...")
+        await self.main_tab.evaluate("""
+            // Scroll down gradually to trigger lazy loading
+            const scrollHeight = document.body.scrollHeight;
+            const scrollStep = scrollHeight / 5;
+            
+            for (let i = 1; i <= 5; i++) {
+                window.scrollTo(0, scrollStep * i);
+                await new Promise(resolve => setTimeout(resolve, 500));
+            }
+            
+            // Scroll back to top
+            window.scrollTo(0, 0);
+        """)
+        
+        # Wait for the scrolled-in cards to stop appearing
+        await wait_for_stable_count(self.main_tab, SEARCH_CARD_SELECTOR, timeout=2)
+        
+        # Try to click on some job cards to trigger content loading
+        print("🔄 Triggering job card content loading...")
+        await self.main_tab.evaluate("""
+            // Find job cards and trigger hover/focus events to load content
+            const jobCards = document.querySelectorAll('li[data-occludable-job-id]');
+            jobCards.forEach((card, index) => {
+                if (index < 10) { // Only trigger first 10 to avoid too much delay
+                    card.dispatchEvent(new Event('mouseenter'));
+                    card.dispatchEvent(new Event('focus'));
+                }
+            });
+        """)
+        
+        # Wait for the content the hover triggered to finish loading
+        await self.main_network.wait(timeout=3)
+    
+    async def _capture_search_page(self, url: str, page: int) -> Optional[List[Linkedin]]:
+        """
+        Navigate the main tab to a search page and build its jobs from the voyager
+        job cards payload (embedded in the page or captured by req_paused)
+        
+        Returns:
+            List of Linkedin jobs, or None when no job payload was seen
+        """
+        self.search_capture.clear()
+        await self._navigate_main_tab(url)
+        await wait_for_any(self.main_tab, f'{SEARCH_CARD_SELECTOR}, .job-search-card', timeout=10)
+        
+        try:
+            self.search_capture.add_embedded(await self.main_tab.evaluate(EMBEDDED_PAYLOADS_JS, return_by_value=True))
+        except Exception as e:
+            print(f"⚠️ Could not read embedded job payloads: {e}")
+        
+        jobs_objs = jobs_from_card_records(self.search_capture.take_search_records())
+        if not jobs_objs:
+            print("⚠️ No voyager job payload captured, falling back to the DOM")
+            return None
+        print(f"📡 Voyager payload had {len(jobs_objs)} jobs on page {page + 1}")
+        return jobs_objs
+    
+    async def _snapshot_search_page(self, page: int, url: str = "") -> str:
+        """Return the main tab's full HTML (queued for the snapshot archive)"""
+        # Get the page HTML
+        html_content = await self.main_tab.evaluate("document.documentElement.outerHTML")
+        
+        # Archive it off the event loop (see jobs.snapshot_archive)
+        self.snapshots.add(self.snapshot_run, page, html_content, url,
+                           debug_file=f"nodriver_debug_page_{page + 1}.html")
+        
+        return html_content
+    
+    async def _process_search_page(self, page: int, html_content: Optional[str],
+                                   extracted_jobs: Optional[List[Linkedin]] = None) -> List[Linkedin]:
+        """
+        Parse one search page in the parse process pool, then enrich its jobs.
+        Parsing runs while the main tab is already loading the next page; pages
+        share the detail tab pool, which hands out tabs first come first served.
+        Jobs already read by the in-page extractor skip parsing entirely.
+        """
+        loop = asyncio.get_running_loop()
+        jobs_objs = list(extracted_jobs or [])
+        stream_html = False
+        if extracted_jobs is None:
+            executor = get_parse_executor()
+            stream_html = executor is None
+            if executor is not None:
+                try:
+                    jobs_objs, selector_counts = await loop.run_in_executor(
+                        executor, LinkedInJobParser.parse_page_in_worker, html_content)
+                    # The worker's selector registries are its own: fold its counts into ours
+                    LinkedInJobParser.merge_selector_counts(selector_counts)
+                except BrokenProcessPool as e:
+                    print(f"⚠️ Parse pool broken, parsing page {page + 1} in-process: {e}")
+                    reset_parse_executor()
+                    stream_html = True
+        
+        # Bounded so a fast parse waits for free detail tabs instead of racing ahead
+        enrich_queue = asyncio.Queue(maxsize=self.detail_pool.size)
+        enrich_worker = asyncio.create_task(self._enrich_job_stream(enrich_queue, page=page))
+        try:
+            # No pool: stream jobs out of the HTML and start enriching
+            # the first cards while later ones are still being parsed
+            parsed = LinkedInJobParser.iter_jobs_from_html(html_content) if stream_html else jobs_objs
+            jobs_objs = []
+            for job in parsed:
+                # Dedupe before enrich: known jobs never cost a detail page visit
+                if not self._is_new_job(job):
+                    continue
+                jobs_objs.append(job)
+                self._report("found")
+                await enrich_queue.put(job)
+        finally:
+            await enrich_queue.put(None)
+            # Enrich (concurrently, in the detail tab pool)
+            await enrich_worker
+        
+        return jobs_objs
+    
+    def _is_new_job(self, job: Linkedin) -> bool:
+        """Record the job's canonical key; False when it was already known"""
+        key = canonical_job_key(job.application_link, source="linkedin")
+        if not key:
+            return True  # no link to compare on; keep it like before
+        if key in self.seen_job_keys:
+            self.duplicates_skipped += 1
+            self._report("duplicates")
+            log.sampled(logging.DEBUG, "job_duplicate", "🔄 Skipping known job before enrichment: %s", key)
+            return False
+        self.seen_job_keys.add(key)
+        return True
+    
+    def _report(self, name: str):
+        if self.progress is not None:
+            self.progress.incr(name)
+    
+    async def auth_challenge_handler(self, event: uc.cdp.fetch.AuthRequired, tab=None):
         """Handle authentication challenges"""
         print("🔐 Handling authentication challenge...")
         asyncio.create_task(
-            self.main_tab.send(
+            (tab or self.main_tab).send(
                 uc.cdp.fetch.continue_with_auth(
                     request_id=event.request_id,
                     auth_challenge_response=uc.cdp.fetch.AuthChallengeResponse(
@@ -240,15 +751,38 @@ class NoDriverLinkedInScraper:
             )
         )
 
-    async def req_paused(self, event: uc.cdp.fetch.RequestPaused):
-        """Handle paused requests"""
-        asyncio.create_task(
-            self.main_tab.send(
-                uc.cdp.fetch.continue_request(
-                    request_id=event.request_id
+    async def req_paused(self, event: uc.cdp.fetch.RequestPaused, tab=None):
+        """Handle paused requests: fail blocked resources, record voyager job responses, let the rest through"""
+        tab = tab or self.main_tab
+        if self.resource_blocker is not None and self.resource_blocker.should_block(event):
+            asyncio.create_task(
+                tab.send(
+                    uc.cdp.fetch.fail_request(
+                        request_id=event.request_id,
+                        error_reason=uc.cdp.network.ErrorReason.BLOCKED_BY_CLIENT
+                    )
+                )
+            )
+            return
+        try:
+            # Request-stage pauses that survived the blocking policy pass straight through
+            if event.response_status_code is not None and 200 <= event.response_status_code < 300:
+                body, base64_encoded = await tab.send(uc.cdp.fetch.get_response_body(request_id=event.request_id))
+                if base64_encoded:
+                    body = base64.b64decode(body).decode("utf-8", errors="replace")
+                capture = self.detail_pool.capture_for(tab) or self.search_capture
+                if capture.add(event.request.url, body):
+                    log.debug("voyager_captured", "📡 Captured voyager payload (%d bytes)", len(body))
+        except Exception as e:
+            log.sampled(logging.WARNING, "voyager_capture_error", "⚠️ Could not read paused response: %s", e)
+        finally:
+            asyncio.create_task(
+                tab.send(
+                    uc.cdp.fetch.continue_request(
+                        request_id=event.request_id
+                    )
                 )
             )
-        )
     
     def save_to_csv(self, filename: str = "linkedin_jobs_nodriver.csv"):
         """Save scraped jobs to CSV file"""
@@ -258,7 +792,7 @@ class NoDriverLinkedInScraper:
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['name', 'company', 'location_type', 'job_type', 'posting_date', 'application_link', 'location', 'description']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
             
             writer.writeheader()
             for job in self.jobs:
@@ -267,16 +801,21 @@ class NoDriverLinkedInScraper:
         print(f"💾 Saved {len(self.jobs)} jobs to {filename}")
     
     async def close(self):
+        """
+        Close the detail tabs, the HTTP client and the browser. Each step runs even
+        when an earlier one failed, and any Chromium process still alive afterwards
+        is killed by the browser governor.
+        """
+        steps = [("detail tabs", self.detail_pool.close)]
+        if self.http_fetcher is not None:
+            steps.append(("HTTP client", self.http_fetcher.close))
+        for name, step in steps:
+            try:
+                await step()
+            except Exception as e:
+                log.warning("close_error", "⚠️ Error closing %s: %s", name, e)
+        
         try:
-            # close detail tab (best-effort)
-            if getattr(self, "detail_tab", None):
-                try:
-                    if hasattr(self.detail_tab, "close") and callable(self.detail_tab.close):
-                        res = self.detail_tab.close()
-                        if inspect.isawaitable(res): await res
-                except Exception as e:
-                    print(f"⚠️ detail_tab close: {e}")
-
             if self.browser is not None:
                 if hasattr(self.browser, 'stop') and callable(self.browser.stop):
                     res = self.browser.stop()
@@ -285,23 +824,25 @@ class NoDriverLinkedInScraper:
             else:
                 print("🔒 Browser was not initialized")
         except Exception as e:
-            print(f"⚠️ Error closing browser (safe to ignore): {e}")
+            log.warning("close_error", "⚠️ Error stopping browser, killing its processes: %s", e)
         finally:
             self.browser = None
             self.main_tab = None
-            self.detail_tab = None
+            handle, self.browser_handle = self.browser_handle, None
+            await browser_governor.release(handle)
             
-    async def _fetch_job_description(self, url: str, timeout: int = 15, retries: int = 1) -> str:
+    async def _fetch_job_description(self, detail, url: str, timeout: int = 15, retries: int = 1) -> str:
         """
-        Navigate to the job detail page and extract the 'About the job' text.
-        Works for both right-rail and standalone job pages.
+        Navigate a borrowed detail tab to the job page and extract the
+        'About the job' text. Works for both right-rail and standalone job pages.
+        The caller paces the first navigation (detail_pool.rate_limiter).
         """
-        if not url:
-            return ""
-        tab = self.detail_tab  # <- use the dedicated tab
-
+        tab = detail.tab
         for attempt in range(retries + 1):
             try:
+                detail.capture.clear()
+                if attempt:
+                    await self.detail_pool.rate_limiter.wait(url)
                 await tab.get(url)
                 # wait for something meaningful to exist
                 try:
@@ -326,46 +867,108 @@ class NoDriverLinkedInScraper:
                 except Exception:
                     pass
 
+                if self.extraction_mode == "network":
+                    try:
+                        detail.capture.add_embedded(await tab.evaluate(EMBEDDED_PAYLOADS_JS, return_by_value=True))
+                    except Exception as e:
+                        print(f"⚠️ Could not read embedded job payloads: {e}")
+                    desc = detail.capture.take_description(job_id_from_link(url))
+                    if desc:
+                        return desc
+
+                if self.extraction_mode in ("inpage", "network"):
+                    desc = await extract_job_description(tab)
+                    if desc:
+                        return desc
+
                 html = await tab.evaluate("document.documentElement.outerHTML")
                 desc = extract_description_from_job_html(html)
                 if desc:
                     return desc
 
             except Exception as e:
-                print(f"⚠️ detail fetch attempt {attempt+1} failed: {e}")
+                log.sampled(logging.WARNING, "detail_fetch_error", "⚠️ detail fetch attempt %d failed: %s", attempt + 1, e)
 
             # gentle backoff
             await asyncio.sleep(0.8 + uniform(0, 0.6))
 
         return ""
 
-    async def _enrich_jobs_with_descriptions(self, jobs: list, limit: int | None = None, per_job_timeout: int = 25):
+    async def _describe_job(self, link: str, per_job_timeout: int) -> tuple:
         """
-        Visit each job's detail page in the dedicated detail tab and fill 'description'.
-        Sequential on purpose: avoids tab navigation races & CDP 'Invalid InterceptionId'.
+        Fetch one job's description over HTTP, or in a pooled detail tab when
+        that is blocked or comes back empty. Both requests are paced by the
+        detail pool's per-host rate limiter; HTTP fetches are bounded by the
+        fetcher's concurrency and tab fetches by describe_slots. The hard
+        timeout covers each fetch only: waiting for a slot or for the rate
+        limiter is not charged to the job.
+
+        Returns:
+            (description, outcome) where outcome is "described", "empty",
+            "timeouts" or "errors"
         """
-        target = jobs if limit is None else jobs[:max(0, limit)]
-        for idx, job in enumerate(target, 1):
-            link = job.get("application_link")
-            if not link:
-                job["description"] = ""
-                continue
+        try:
+            if self.http_fetcher is not None and self.http_fetcher.enabled:
+                await self.detail_pool.rate_limiter.wait(link)
+                description = await asyncio.wait_for(self.http_fetcher.fetch_description(link), timeout=per_job_timeout)
+                if description:
+                    log.sampled(logging.DEBUG, "desc_http", "⚡ [desc] fetched over HTTP: %s", link)
+                    return description, "described"
 
-            print(f"🧭 [desc] {idx}/{len(target)} -> {link}")
-            try:
+            async with self.describe_slots, self.detail_pool.acquire() as detail:  # <- borrow a dedicated tab
+                await self.detail_pool.rate_limiter.wait(link)
                 # hard timeout to prevent any single stuck job from hanging the whole run
-                job["description"] = await asyncio.wait_for(
-                    self._fetch_job_description(link),
+                description = await asyncio.wait_for(
+                    self._fetch_job_description(detail, link),
                     timeout=per_job_timeout
                 )
-            except asyncio.TimeoutError:
-                print(f"⏳ [desc] timeout for {link}")
-                job["description"] = ""
-            except Exception as e:
-                print(f"❌ [desc] error for {link}: {e}")
-                job["description"] = ""
-            # small pacing to be polite
-            await asyncio.sleep(0.3)
+            return description, "described" if description else "empty"
+        except asyncio.TimeoutError:
+            log.sampled(logging.WARNING, "desc_timeout", "⏳ [desc] timeout for %s", link)
+            return "", "timeouts"
+        except Exception as e:
+            log.sampled(logging.WARNING, "desc_error", "❌ [desc] error for %s: %s", link, e)
+            return "", "errors"
+
+    async def _enrich_job_stream(self, queue: asyncio.Queue, per_job_timeout: int = 25, page: Optional[int] = None):
+        """
+        Consume Linkedin jobs from a queue (None ends the stream) and fill their
+        description from the detail page as they arrive.
+        Enough workers per page to fill either the detail tabs or the HTTP
+        fetcher's concurrency. Pages in flight at once (PIPELINE_DEPTH) share
+        describe_slots and the fetcher, so together they never use more tabs
+        or HTTP requests than those allow; the pool's rate limiter does the pacing.
+        """
+        summary = PageSummary(log, "page_enriched", page=page + 1 if page is not None else None,
+                              tabs=self.detail_pool.size)
+        counter = 0
+
+        async def worker():
+            nonlocal counter
+            while True:
+                job = await queue.get()
+                if job is None:
+                    queue.put_nowait(None)  # wake the other workers
+                    return
+                counter += 1
+                summary.incr("jobs")
+
+                link = job.application_link
+                if not link:
+                    summary.incr("no_link")
+                    continue
+
+                log.sampled(logging.DEBUG, "desc_fetch", "🧭 [desc] %d -> %s", counter, link)
+                description, outcome = await self._describe_job(link, per_job_timeout)
+                summary.incr(outcome)
+                job.description = description or job.description
+                self._report("enriched")
+
+        workers = self.detail_pool.size
+        if self.http_fetcher is not None and self.http_fetcher.enabled:
+            workers = max(workers, self.http_fetcher.concurrency)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        summary.emit("🧭 Enriched page descriptions")
 
 async def main(linkedin_username: str = None, linkedin_password: str = None, location: str = "", headless: bool = True):
     scraper = NoDriverLinkedInScraper(headless=headless)  # Pass headless parameter
@@ -13,4 +13,8 @@ class Linkedin(BaseModel):
     posting_date: str
     application_link: str
     location: str
-    description: str
\ No newline at end of file
+    description: str
+    # True when company was read from a dedicated field (in-page card subtitle or
+    # voyager JSON) rather than guessed from mixed card text; only these names
+    # are learned into the company gazetteer
+    company_verified: bool = False
@@ -0,0 +1,158 @@
+"""
+Page Readiness - Wait on concrete page signals instead of fixed sleeps
+
+The scrapers used to sleep a fixed few seconds after every navigation, scroll
+and hover. These helpers return as soon as the page is actually ready, and
+use the old sleep lengths only as upper bounds:
+  * wait_for_any: one of the known containers is in the DOM
+  * wait_for_stable_count: the number of matching elements stopped changing
+  * NetworkIdle: no CDP network request in flight for a short quiet window
+  * wait_for_url: the tab's URL matches a predicate (e.g. login redirect)
+
+No helper raises on timeout, so callers can carry on exactly as they did
+after the old sleep.
+
+Environment:
+  SCRAPE_NETWORK_QUIET  seconds without network activity that count as idle (default 0.5)
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Optional
+
+import nodriver as uc
+
+NETWORK_QUIET = float(os.getenv("SCRAPE_NETWORK_QUIET", "0.5"))
+POLL_INTERVAL = 0.25
+
+
+async def wait_for_any(tab, selector: str, timeout: float) -> bool:
+    """True once an element matching selector exists, False after timeout"""
+    try:
+        await tab.wait_for(selector, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def count_elements(tab, selector: str) -> int:
+    """Number of elements matching selector (-1 when the page cannot be read)"""
+    try:
+        count = await tab.evaluate(f"document.querySelectorAll({json.dumps(selector)}).length")
+    except Exception:
+        return -1
+    return count if isinstance(count, int) else -1
+
+
+async def wait_for_stable_count(tab, selector: str, timeout: float, stable_for: float = 0.75,
+                                minimum: int = 1) -> int:
+    """
+    Poll the number of elements matching selector until it holds still
+
+    Args:
+        tab: nodriver Tab
+        selector: CSS selector to count
+        timeout: Upper bound in seconds
+        stable_for: How long the count must stay unchanged (and >= minimum)
+        minimum: Smallest count that counts as loaded
+
+    Returns:
+        The last count seen (whether or not it settled in time)
+    """
+    deadline = time.monotonic() + timeout
+    last_count = await count_elements(tab, selector)
+    stable_since = time.monotonic()
+    while time.monotonic() < deadline:
+        if last_count >= minimum and time.monotonic() - stable_since >= stable_for:
+            break
+        await asyncio.sleep(min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+        count = await count_elements(tab, selector)
+        if count != last_count:
+            last_count = count
+            stable_since = time.monotonic()
+    return last_count
+
+
+async def wait_for_url(tab, predicate: Callable[[str], bool], timeout: float) -> Optional[str]:
+    """
+    Poll the tab's URL until predicate(url) is true
+
+    Returns:
+        The matching URL, or None after timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            url = await tab.evaluate("window.location.href")
+        except Exception:
+            url = None
+        if isinstance(url, str) and predicate(url):
+            return url
+        if time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+class NetworkIdle:
+    """
+    Tracks in-flight requests of one tab through CDP Network events.
+
+    Attach once per tab (attach() enables the Network domain), then call
+    wait() after a navigation or an action that triggers loading.
+    """
+
+    def __init__(self, quiet: float = NETWORK_QUIET):
+        self.quiet = quiet
+        self._in_flight = set()
+        self._last_activity = time.monotonic()
+        self.attached = False
+
+    async def attach(self, tab) -> bool:
+        """Subscribe to the tab's network events (False if CDP refused)"""
+        try:
+            tab.add_handler(uc.cdp.network.RequestWillBeSent, self._on_request)
+            tab.add_handler(uc.cdp.network.LoadingFinished, self._on_done)
+            tab.add_handler(uc.cdp.network.LoadingFailed, self._on_done)
+            await tab.send(uc.cdp.network.enable())
+            self.attached = True
+        except Exception as e:
+            print(f"⚠️ Network idle tracking unavailable: {e}")
+            self.attached = False
+        return self.attached
+
+    def _on_request(self, event, tab=None):
+        self._in_flight.add(event.request_id)
+        self._last_activity = time.monotonic()
+
+    def _on_done(self, event, tab=None):
+        self._in_flight.discard(event.request_id)
+        self._last_activity = time.monotonic()
+
+    def reset(self):
+        """Forget requests from a previous page (call right before navigating)"""
+        self._in_flight.clear()
+        self._last_activity = time.monotonic()
+
+    async def wait(self, timeout: float, max_in_flight: int = 2) -> bool:
+        """
+        Wait until at most max_in_flight requests are pending and nothing has
+        started or finished for `quiet` seconds (a couple of long-poll and
+        tracking connections never finish, hence the default of 2)
+
+        Returns:
+            True when the network went idle, False after timeout (or when not attached,
+            in which case it simply sleeps for timeout like the old code did)
+        """
+        if not self.attached:
+            await asyncio.sleep(timeout)
+            return False
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if len(self._in_flight) <= max_in_flight and now - self._last_activity >= self.quiet:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(min(POLL_INTERVAL, deadline - now))
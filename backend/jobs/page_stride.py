@@ -0,0 +1,132 @@
+"""
+Page Stride - Measured LinkedIn search page size and page-to-page overlap
+
+LinkedIn's search URL pages by result offset (start=N). An authenticated
+page lists 25 results (LINKEDIN_SETTINGS["jobs_per_page"] in
+linkedin/config.py), but only the first few cards (7 in the saved
+nodriver_debug_page_*.html captures) are rendered; the rest are empty
+data-occludable-job-id placeholders that no extractor can read. The next
+page therefore has to start right after the last rendered card, or the
+placeholders' results are never scraped. PageStride reads the ids of the
+rendered cards (those with a job link or a title) to:
+  * advance start by the number of results the page really yielded
+  * keep a stride estimate (most common page size) for pages not loaded yet
+  * measure how many of a page's ids were already seen this run, and tell the
+    scraper to stop once a page is mostly repeats (LinkedIn ran out of results)
+
+Environment:
+  LINKEDIN_PAGE_STRIDE         results per page assumed before one is measured (default 7)
+  LINKEDIN_PAGE_OVERLAP_LIMIT  repeated share of a page that ends pagination (default 0.7)
+"""
+
+import os
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from jobs.scrape_log import PageSummary, get_logger
+
+log = get_logger(__name__)
+
+PAGE_STRIDE = max(1, int(os.getenv("LINKEDIN_PAGE_STRIDE", "7")))
+PAGE_OVERLAP_LIMIT = float(os.getenv("LINKEDIN_PAGE_OVERLAP_LIMIT", "0.7"))
+
+CARD_SELECTOR = "li[data-occludable-job-id]"
+CARD_ID_ATTRIBUTE = "data-occludable-job-id"
+# A card is rendered once it has a job link or a title; placeholders are empty
+RENDERED_CARD_SELECTOR = "a[href*='/jobs/view/'], h3, [class*='job-card-list__title']"
+
+# Ids of the loaded search page's rendered cards, in page order
+SEARCH_CARD_IDS_JS = f"""
+Array.from(document.querySelectorAll("{CARD_SELECTOR}"))
+    .filter(card => card.querySelector("{RENDERED_CARD_SELECTOR}"))
+    .map(card => card.getAttribute("{CARD_ID_ATTRIBUTE}"))
+"""
+
+
+def rendered_card_ids(html: str) -> List[str]:
+    """SEARCH_CARD_IDS_JS for saved page HTML (snapshots, debug pages)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html or "", "lxml")
+    return [card.get(CARD_ID_ATTRIBUTE) for card in soup.select(CARD_SELECTOR)
+            if card.select_one(RENDERED_CARD_SELECTOR)]
+
+
+class PageStride:
+    """
+    Start offsets and overlap counters for one scraper's search pagination.
+
+    Usage:
+        stride.start_run(start_page)
+        start = stride.start_for(page)           # build the search URL
+        overlap = stride.observe(page, start, card_ids)
+        if stride.exhausted(overlap): ...        # stop loading further pages
+        stride.emit()
+    """
+
+    def __init__(self, initial: int = PAGE_STRIDE, overlap_limit: float = PAGE_OVERLAP_LIMIT):
+        self.stride = max(1, initial)
+        self.overlap_limit = overlap_limit
+        self._sizes = Counter()  # measured page sizes
+        self._starts: Dict[int, int] = {}  # page index -> start offset, learned from earlier pages
+        self._seen_ids = set()
+        self.summary = PageSummary(log, "pagination")
+
+    def start_run(self, start_page: int = 0):
+        """Begin a scrape; start_page > 0 continues the previous run's pages and ids"""
+        if start_page == 0:
+            self._starts.clear()
+            self._seen_ids.clear()
+        self.summary = PageSummary(log, "pagination")
+
+    def start_for(self, page: int) -> int:
+        """Result offset of a page: measured when the page before it was loaded, else estimated"""
+        if page in self._starts:
+            return self._starts[page]
+        known = [known_page for known_page in self._starts if known_page < page]
+        if known:
+            last = max(known)
+            return self._starts[last] + (page - last) * self.stride
+        return page * self.stride
+
+    def observe(self, page: int, start: int, card_ids: Iterable) -> float:
+        """
+        Record the card ids a page showed
+
+        Args:
+            page: Page index
+            start: Offset the page was requested with
+            card_ids: data-occludable-job-id values of the rendered cards, in page order
+
+        Returns:
+            Share of the page's ids already seen this run (0.0 when none were read)
+        """
+        ids = list(dict.fromkeys(str(card_id) for card_id in card_ids or [] if card_id))
+        if not ids:
+            self._starts.setdefault(page + 1, start + self.stride)
+            return 0.0
+
+        repeats = sum(1 for card_id in ids if card_id in self._seen_ids)
+        overlap = repeats / len(ids)
+        self._seen_ids.update(ids)
+
+        # The page covered len(ids) results, so the next one starts right after them
+        self._starts[page + 1] = start + len(ids)
+        self._sizes[len(ids)] += 1
+        self.stride = self._sizes.most_common(1)[0][0]
+
+        self.summary.incr("pages")
+        self.summary.incr("cards", len(ids))
+        self.summary.incr("repeats", repeats)
+        log.info("page_overlap", "📐 Page %d had %d cards, %d already seen", page + 1, len(ids), repeats,
+                 start=start, overlap=round(overlap, 2), stride=self.stride)
+        return overlap
+
+    def exhausted(self, overlap: float) -> bool:
+        """Whether a page was repeats enough that further pages are not worth loading"""
+        return self.overlap_limit > 0 and overlap >= self.overlap_limit
+
+    def emit(self):
+        """Log the run's page/card/repeat counters and the stride as one event"""
+        self.summary.set(stride=self.stride)
+        self.summary.emit("📐 Pagination summary")
@@ -0,0 +1,95 @@
+"""
+HTML Parse Engines - Pluggable tree builders for the job parsers
+"""
+
+import os
+from typing import Dict, Optional
+from bs4 import BeautifulSoup
+
+
+class ParseEngine:
+    """Builds a BeautifulSoup tree from raw HTML using a specific tree builder"""
+
+    name = "base"
+    features = "html.parser"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the underlying tree builder can be used in this environment"""
+        return True
+
+    def parse(self, html_content: str) -> BeautifulSoup:
+        """
+        Parse raw HTML into a soup tree
+
+        Args:
+            html_content: Raw HTML string
+
+        Returns:
+            BeautifulSoup tree (CSS selectors are evaluated by soupsieve,
+            so every engine supports the same selector syntax)
+        """
+        return BeautifulSoup(html_content, self.features)
+
+
+class HtmlParserEngine(ParseEngine):
+    """Pure-Python engine using the stdlib html.parser (always available)"""
+
+    name = "html.parser"
+    features = "html.parser"
+
+
+class LxmlEngine(ParseEngine):
+    """C-backed engine using libxml2 via lxml (roughly 2x faster tree building)"""
+
+    name = "lxml"
+    features = "lxml"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+
+PARSE_ENGINES: Dict[str, type] = {
+    LxmlEngine.name: LxmlEngine,
+    HtmlParserEngine.name: HtmlParserEngine,
+}
+
+# Preference order when no engine is requested explicitly
+DEFAULT_ENGINE_ORDER = [LxmlEngine.name, HtmlParserEngine.name]
+
+_engine_cache: Dict[str, ParseEngine] = {}
+
+
+def get_parse_engine(name: Optional[str] = None) -> ParseEngine:
+    """
+    Resolve a parse engine by name, falling back to BeautifulSoup's html.parser
+
+    Args:
+        name: Engine name ("lxml" or "html.parser"). Defaults to the
+              JOBS_PARSE_ENGINE environment variable, then the fastest
+              available engine.
+
+    Returns:
+        ParseEngine instance
+    """
+    name = name or os.getenv("JOBS_PARSE_ENGINE")
+    candidates = [name] if name else []
+    candidates += DEFAULT_ENGINE_ORDER
+
+    for candidate in candidates:
+        if candidate in _engine_cache:
+            return _engine_cache[candidate]
+        engine_cls = PARSE_ENGINES.get(candidate)
+        if engine_cls and engine_cls.is_available():
+            engine = engine_cls()
+            _engine_cache[candidate] = engine
+            return engine
+        if candidate == name:
+            print(f"⚠️ Parse engine '{name}' not available, falling back")
+
+    return HtmlParserEngine()
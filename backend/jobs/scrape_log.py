@@ -0,0 +1,238 @@
+"""
+Scrape Log - Leveled, lazy, sampled logging for the scraper and parser hot loops
+
+Built on the stdlib logging module so gunicorn/Flask handlers keep working:
+  * messages use %-style args, so nothing is formatted unless the level is on
+  * per-card/per-job events are sampled per run (first N, then 1 in K)
+  * records are written to stderr by a background thread, never by the caller
+  * each parsed/enriched page emits one summary event with its counters
+
+Environment:
+  SCRAPE_LOG_LEVEL        DEBUG/INFO/WARNING/... (default INFO)
+  SCRAPE_LOG_FORMAT       "text" (default) or "json"
+  SCRAPE_LOG_SAMPLE_FIRST sampled events always kept per run and event (default 5)
+  SCRAPE_LOG_SAMPLE_EVERY keep 1 in K sampled events after that (default 20, 0 = drop)
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+ROOT_LOGGER_NAME = "jobs"
+
+LOG_LEVEL = os.getenv("SCRAPE_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("SCRAPE_LOG_FORMAT", "text").lower()
+SAMPLE_FIRST = int(os.getenv("SCRAPE_LOG_SAMPLE_FIRST", "5"))
+SAMPLE_EVERY = int(os.getenv("SCRAPE_LOG_SAMPLE_EVERY", "20"))
+
+
+class TextFormatter(logging.Formatter):
+    """'<message> key=value ...' - keeps the familiar emoji lines readable"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class BackgroundHandler(logging.Handler):
+    """
+    Queue records and format/write them on a daemon thread.
+
+    The thread is (re)started lazily per process, so records logged inside
+    parse-pool workers forked from the web process are not lost.
+    """
+
+    def __init__(self, target: logging.Handler):
+        super().__init__()
+        self.target = target
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._drain, name="scrape-log", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _drain(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            try:
+                self.target.handle(record)
+            except Exception:
+                self.handleError(record)
+
+    def emit(self, record: logging.LogRecord):
+        self._ensure_thread()
+        self._queue.put(record)
+
+    def flush(self):
+        """Wait for queued records to be written (stops the thread)"""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._pid = None
+        try:
+            self.target.flush()
+        except (ValueError, OSError):
+            pass  # stream already closed at interpreter exit (e.g. captured stderr)
+
+
+_configure_lock = threading.Lock()
+_handler: Optional[BackgroundHandler] = None
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> logging.Logger:
+    """
+    Attach the background stderr handler to the "jobs" logger (idempotent)
+
+    Args:
+        level: Log level name (defaults to SCRAPE_LOG_LEVEL)
+        fmt: "text" or "json" (defaults to SCRAPE_LOG_FORMAT)
+
+    Returns:
+        The root "jobs" logger
+    """
+    global _handler
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    with _configure_lock:
+        root.setLevel(getattr(logging, (level or LOG_LEVEL).upper(), logging.INFO))
+        if _handler is None:
+            target = logging.StreamHandler(sys.stderr)
+            _handler = BackgroundHandler(target)
+            root.addHandler(_handler)
+            root.propagate = False
+            atexit.register(_handler.flush)
+        _handler.target.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT) == "json" else TextFormatter())
+    return root
+
+
+def flush_logs():
+    """Write out everything queued so far"""
+    if _handler is not None:
+        _handler.flush()
+
+
+# Per-run sampling counters (event name -> count); a contextvar so concurrent
+# scrapes in different threads/tasks sample independently
+_run_counters: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar("scrape_log_run", default=None)
+_process_counters: Dict[str, int] = {}
+
+
+def start_run() -> contextvars.Token:
+    """Reset sampling for a new scrape run (returns a token for end_run)"""
+    return _run_counters.set({})
+
+
+def end_run(token: contextvars.Token):
+    _run_counters.reset(token)
+
+
+class ScrapeLogger:
+    """Thin wrapper adding event names, structured fields and sampling to a stdlib logger"""
+
+    def __init__(self, name: str):
+        if _handler is None:
+            configure_logging()
+        self._logger = logging.getLogger(name)
+
+    def enabled(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def log(self, level: int, event: str, msg: str, *args, **fields):
+        # Cheap level check first: nothing below is paid for when the level is off
+        if not self._logger.isEnabledFor(level):
+            return
+        self._logger.log(level, msg, *args, extra={"event": event, "fields": fields})
+
+    def debug(self, event: str, msg: str, *args, **fields):
+        self.log(logging.DEBUG, event, msg, *args, **fields)
+
+    def info(self, event: str, msg: str, *args, **fields):
+        self.log(logging.INFO, event, msg, *args, **fields)
+
+    def warning(self, event: str, msg: str, *args, **fields):
+        self.log(logging.WARNING, event, msg, *args, **fields)
+
+    def error(self, event: str, msg: str, *args, **fields):
+        self.log(logging.ERROR, event, msg, *args, **fields)
+
+    def sampled(self, level: int, event: str, msg: str, *args, **fields):
+        """Log a high-volume event: the first SAMPLE_FIRST per run, then 1 in SAMPLE_EVERY"""
+        if not self._logger.isEnabledFor(level):
+            return
+        counters = _run_counters.get()
+        if counters is None:
+            counters = _process_counters
+        count = counters.get(event, 0) + 1
+        counters[event] = count
+        if count > SAMPLE_FIRST and (SAMPLE_EVERY <= 0 or (count - SAMPLE_FIRST) % SAMPLE_EVERY):
+            return
+        self._logger.log(level, msg, *args, extra={"event": event, "fields": dict(fields, n=count)})
+
+
+class PageSummary:
+    """Counters for one page, emitted as a single summary event"""
+
+    def __init__(self, logger: ScrapeLogger, event: str, **fields: Any):
+        self.logger = logger
+        self.event = event
+        self.fields: Dict[str, Any] = dict(fields)
+        self.counts: Dict[str, int] = {}
+        self._start = time.perf_counter()
+
+    def incr(self, key: str, amount: int = 1):
+        self.counts[key] = self.counts.get(key, 0) + amount
+
+    def set(self, **fields: Any):
+        self.fields.update(fields)
+
+    def emit(self, msg: str, level: int = logging.INFO):
+        elapsed_ms = round((time.perf_counter() - self._start) * 1000, 1)
+        self.logger.log(level, self.event, msg, **self.fields, **self.counts, ms=elapsed_ms)
+
+
+def get_logger(name: str) -> ScrapeLogger:
+    """ScrapeLogger for a module (use __name__; modules outside jobs.* are nested under it)"""
+    if not name.startswith(ROOT_LOGGER_NAME + ".") and name != ROOT_LOGGER_NAME:
+        name = f"{ROOT_LOGGER_NAME}.{name}"
+    return ScrapeLogger(name)
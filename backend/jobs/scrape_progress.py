@@ -0,0 +1,38 @@
+"""
+Scrape Progress - Live counters of one running scrape, readable from other threads
+
+The scraper runs on the scraper loop thread while a request thread polls its
+task for status. A ScrapeProgress attached to a scraper (scraper.progress)
+is bumped from the scrape pipeline:
+  * pages     search pages parsed and enriched
+  * found     new jobs kept (after dedupe)
+  * duplicates  cards skipped as already saved or seen
+  * enriched  jobs whose detail page was visited
+Batch views share their parent's progress, so a batch reports one total.
+"""
+
+import threading
+import time
+from typing import Dict
+
+
+class ScrapeProgress:
+    """Thread-safe counters plus the time they last changed"""
+
+    FIELDS = ("pages", "found", "duplicates", "enriched")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+        self.updated_at = time.time()
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+            self.updated_at = time.time()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = dict(self._counts)
+        counts["updated_at"] = self.updated_at
+        return counts
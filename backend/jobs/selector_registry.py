@@ -0,0 +1,148 @@
+"""
+Selector Registry - Adaptive ordering and hit telemetry for CSS selector fallbacks
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class SelectorRegistry:
+    """
+    Ordered list of fallback CSS selectors that learns which ones actually hit.
+
+    Selectors are tried in this order:
+      1. the selector that won on the previous card/page (if promote_winner)
+      2. the remaining selectors in their declared priority order
+      3. selectors that never hit after `demote_after` attempts (still tried, just last)
+
+    Registries whose selectors overlap (an earlier selector is preferred even
+    when a later one also matches) should set promote_winner=False so only
+    dead selectors are reordered.
+
+    Per-selector attempt/hit counts are kept so a LinkedIn layout change that
+    kills a selector shows up in get_stats(). A registry in a parse worker
+    process hands its new counts to the parent with take_unreported(), which
+    adds them to its own registry with merge().
+    """
+
+    def __init__(self, name: str, selectors: List[str], demote_after: int = 25, promote_winner: bool = True):
+        self.name = name
+        self.selectors = list(selectors)
+        self.demote_after = demote_after
+        self.promote_winner = promote_winner
+        self.last_winner: Optional[str] = None
+        self._stats: Dict[str, Dict[str, int]] = {
+            selector: {"attempts": 0, "hits": 0} for selector in self.selectors
+        }
+        self._unreported: Dict[str, Dict[str, int]] = {}  # counts since the last take_unreported()
+        self._lock = threading.Lock()
+
+    def ordered(self) -> List[str]:
+        """Selectors in the order they should be tried right now"""
+        with self._lock:
+            winner = self.last_winner if self.promote_winner else None
+            active, demoted = [], []
+            for selector in self.selectors:
+                if selector == winner:
+                    continue
+                stats = self._stats[selector]
+                if stats["hits"] == 0 and stats["attempts"] >= self.demote_after:
+                    demoted.append(selector)
+                else:
+                    active.append(selector)
+        return ([winner] if winner else []) + active + demoted
+
+    def record(self, selector: str, hit: bool):
+        """Record one attempt of a selector"""
+        with self._lock:
+            stats = self._stats[selector]
+            unreported = self._unreported.setdefault(selector, {"attempts": 0, "hits": 0})
+            stats["attempts"] += 1
+            unreported["attempts"] += 1
+            if hit:
+                stats["hits"] += 1
+                unreported["hits"] += 1
+                self.last_winner = selector
+
+    def select_first(self, node, extract: Callable[[Any], Any]) -> Tuple[Any, Optional[str]]:
+        """
+        Run select_one for each selector until extract() returns a truthy value
+
+        Args:
+            node: BeautifulSoup element to search within
+            extract: Callable turning the matched element into a value (falsy = miss)
+
+        Returns:
+            (value, selector) - ("", None) when nothing matched
+        """
+        for selector in self.ordered():
+            elem = node.select_one(selector)
+            value = extract(elem) if elem else None
+            self.record(selector, bool(value))
+            if value:
+                return value, selector
+        return "", None
+
+    def select_all(self, node) -> Tuple[list, Optional[str]]:
+        """
+        Run select for each selector until one returns a non-empty list
+
+        Returns:
+            (elements, selector) - ([], None) when nothing matched
+        """
+        for selector in self.ordered():
+            elems = node.select(selector)
+            self.record(selector, bool(elems))
+            if elems:
+                return elems, selector
+        return [], None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of the hit statistics, in current try order"""
+        order = self.ordered()
+        with self._lock:
+            return {
+                "name": self.name,
+                "last_winner": self.last_winner,
+                "selectors": [
+                    {
+                        "selector": selector,
+                        "attempts": self._stats[selector]["attempts"],
+                        "hits": self._stats[selector]["hits"],
+                        "demoted": (self._stats[selector]["hits"] == 0 and
+                                    self._stats[selector]["attempts"] >= self.demote_after),
+                    }
+                    for selector in order
+                ],
+            }
+
+    def take_unreported(self) -> Dict[str, Dict[str, int]]:
+        """Counts recorded since the previous call (for a parse worker to send back)"""
+        with self._lock:
+            counts, self._unreported = self._unreported, {}
+        return counts
+
+    def merge(self, counts: Dict[str, Dict[str, int]]):
+        """Add counts taken from another process's registry"""
+        with self._lock:
+            for selector, delta in counts.items():
+                stats = self._stats.get(selector)
+                if stats is None:
+                    continue
+                stats["attempts"] += delta.get("attempts", 0)
+                stats["hits"] += delta.get("hits", 0)
+
+    def dead_selectors(self) -> List[str]:
+        """Selectors that never hit in demote_after attempts"""
+        with self._lock:
+            return [selector for selector in self.selectors
+                    if self._stats[selector]["hits"] == 0 and self._stats[selector]["attempts"] >= self.demote_after]
+
+    def reset(self):
+        """Forget all learned ordering and statistics"""
+        with self._lock:
+            self.last_winner = None
+            self._unreported = {}
+            for stats in self._stats.values():
+                stats["attempts"] = 0
+                stats["hits"] = 0
@@ -0,0 +1,329 @@
+"""
+Session Pool - Warm, logged-in LinkedIn browser sessions reused across requests
+
+Launching Chromium and logging in is a large share of a small scrape. This
+module keeps logged-in NoDriverLinkedInScraper instances alive per account so
+repeat /api/jobs requests skip both:
+  * sessions are keyed by username + a hash of the password, so a session is
+    only handed to a caller that presented the same credentials
+  * a health check (tab responds, li_at cookie present, browser within its
+    BROWSER_MAX_RSS_MB budget) runs before reuse; unhealthy sessions are closed
+    and replaced by a fresh login
+  * sessions idle for longer than LINKEDIN_SESSION_IDLE_TTL are closed by a reaper
+  * at most LINKEDIN_MAX_SESSIONS browsers are alive; the least recently used
+    idle one is evicted to make room
+  * with an account_lock set (job_store sets jobs.account_leases), a session is
+    lent only while this process holds the account's cross-process lease, so the
+    web app and the scheduler never scrape one account at the same time
+
+nodriver connections belong to the event loop that opened them, and Flask
+handlers used to call asyncio.run (a new loop per request). All scraping
+therefore runs on one long-lived loop in a background thread: call
+run_scraper_coroutine(coro) from request threads.
+
+Environment:
+  LINKEDIN_MAX_SESSIONS      browsers kept alive per process (default 2, 0 = no reuse)
+  LINKEDIN_SESSION_IDLE_TTL  seconds an unused session stays open (default 600)
+  LINKEDIN_SESSION_WAIT_TIMEOUT  seconds to wait for a busy account's session, its lease
+                             or a free slot before giving up with SessionBusyError (default 600)
+"""
+
+import asyncio
+import atexit
+import hashlib
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from jobs.browser_governor import browser_governor
+from jobs.main_nodriver import NoDriverLinkedInScraper
+from jobs.scrape_log import get_logger
+
+log = get_logger(__name__)
+
+MAX_SESSIONS = max(0, int(os.getenv("LINKEDIN_MAX_SESSIONS", "2")))
+SESSION_IDLE_TTL = float(os.getenv("LINKEDIN_SESSION_IDLE_TTL", "600"))
+SESSION_WAIT_TIMEOUT = float(os.getenv("LINKEDIN_SESSION_WAIT_TIMEOUT", "600"))
+HEALTH_CHECK_TIMEOUT = 5.0
+AUTH_COOKIE = "li_at"  # LinkedIn's session cookie; gone once the login expires
+
+
+# ---------------------------------------------------------------------------
+# Scraper event loop
+# ---------------------------------------------------------------------------
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_scraper_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop all browser sessions live on (started on first use)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="scraper-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_scraper_coroutine(coro, timeout: Optional[float] = None):
+    """Run a coroutine on the scraper loop and block the calling thread for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_scraper_loop()).result(timeout)
+
+
+# ---------------------------------------------------------------------------
+# Session pool
+# ---------------------------------------------------------------------------
+
+def session_key(username: str, password: str) -> Tuple[str, str]:
+    return (username or "").strip().lower(), hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+
+
+class BrowserSession:
+    """One logged-in scraper and its bookkeeping"""
+
+    def __init__(self, key: Tuple[str, str], scraper):
+        self.key = key
+        self.scraper = scraper
+        self.in_use = False
+        self.last_used = time.monotonic()
+        self.uses = 0
+
+    async def is_healthy(self) -> bool:
+        """Tab still answers, the LinkedIn auth cookie is still set and memory is within budget"""
+        scraper = self.scraper
+        if scraper.browser is None or scraper.main_tab is None:
+            return False
+        handle = scraper.browser_handle
+        browser_governor.sample(handle)
+        if handle is not None and handle.over_budget:
+            return False
+        try:
+            await asyncio.wait_for(scraper.main_tab.evaluate("document.readyState"), timeout=HEALTH_CHECK_TIMEOUT)
+            cookies = await asyncio.wait_for(scraper.browser.cookies.get_all(), timeout=HEALTH_CHECK_TIMEOUT)
+        except Exception:
+            return False
+        return any(getattr(cookie, "name", None) == AUTH_COOKIE for cookie in cookies or [])
+
+    async def close(self):
+        try:
+            await self.scraper.close()
+        except Exception as e:
+            print(f"⚠️ Session close failed (ignoring): {e}")
+
+
+class SessionBusyError(Exception):
+    """The account's session, lease (or every pool slot) stayed busy for the whole wait timeout"""
+
+
+class BrowserSessionPool:
+    """
+    Logged-in scrapers keyed by account. Use from the scraper loop:
+
+        async with browser_sessions.session(username, password) as scraper:
+            if scraper is None: ...  # login failed
+            await scraper.scrape_jobs(...)
+    """
+
+    def __init__(self, scraper_factory: Callable, max_sessions: int = MAX_SESSIONS,
+                 idle_ttl: float = SESSION_IDLE_TTL, wait_timeout: float = SESSION_WAIT_TIMEOUT,
+                 account_lock=None):
+        self.scraper_factory = scraper_factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.wait_timeout = wait_timeout
+        # Cross-process lock with hold(username, timeout), e.g. jobs.account_leases.AccountLeases
+        self.account_lock = account_lock
+        self._sessions: Dict[Tuple[str, str], BrowserSession] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_idle())
+        return self._changed
+
+    @asynccontextmanager
+    async def session(self, username: str, password: str):
+        """
+        Lend a logged-in scraper for one request (None when the login failed).
+        Raises SessionBusyError when the account stays busy for wait_timeout seconds.
+        """
+        if self.account_lock is None:
+            async with self._lend(username, password) as scraper:
+                yield scraper
+            return
+        async with self.account_lock.hold(username, self.wait_timeout) as held:
+            if not held:
+                log.warning("session_lease_timeout", "⏳ LinkedIn account in use by another process, giving up",
+                            waited=round(self.wait_timeout))
+                raise SessionBusyError(
+                    f"LinkedIn account is in use by another process and stayed busy for {self.wait_timeout:.0f}s")
+            async with self._lend(username, password) as scraper:
+                yield scraper
+
+    @asynccontextmanager
+    async def _lend(self, username: str, password: str):
+        if self.max_sessions <= 0:
+            # Pooling disabled: a throwaway browser per request, as before
+            scraper = await self._login(username, password)
+            try:
+                yield scraper
+            finally:
+                if scraper is not None:
+                    await scraper.close()
+            return
+
+        session = await self._checkout(username, password)
+        if session is None:
+            yield None
+            return
+        broken = True
+        try:
+            yield session.scraper
+            broken = False
+        finally:
+            await self._checkin(session, broken)
+
+    async def _login(self, username: str, password: str):
+        """Fresh browser + login (returns None and closes the browser when login fails)"""
+        scraper = self.scraper_factory()
+        try:
+            await scraper.setup_browser()
+            if await scraper.login_to_linkedin(username, password):
+                return scraper
+        except Exception as e:
+            print(f"❌ Error starting browser session: {e}")
+        await scraper.close()
+        return None
+
+    async def _checkout(self, username: str, password: str) -> Optional[BrowserSession]:
+        key = session_key(username, password)
+        changed = self._condition()
+        deadline = time.monotonic() + self.wait_timeout
+        async with changed:
+            while True:
+                session = self._sessions.get(key)
+                if session is not None and not session.in_use:
+                    session.in_use = True
+                    break
+                if session is None and (len(self._sessions) < self.max_sessions or self._evictable()):
+                    break
+                # Same account busy, or pool full of busy sessions
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    log.warning("session_wait_timeout", "⏳ LinkedIn session still busy, giving up",
+                             waited=round(self.wait_timeout))
+                    raise SessionBusyError(
+                        f"LinkedIn session for this account was busy for {self.wait_timeout:.0f}s") from None
+            evicted = None
+            if session is None:
+                if len(self._sessions) >= self.max_sessions:
+                    evicted = self._evictable()
+                    del self._sessions[evicted.key]
+                # Reserve the slot while logging in
+                session = BrowserSession(key, None)
+                session.in_use = True
+                self._sessions[key] = session
+
+        if evicted is not None:
+            log.info("session_evicted", "♻️ Closing least recently used browser session to make room")
+            await evicted.close()
+
+        try:
+            if session.scraper is not None:
+                if await session.is_healthy():
+                    session.uses += 1
+                    log.info("session_reused", "♻️ Reusing warm browser session", uses=session.uses)
+                    return session
+                log.info("session_unhealthy", "🩺 Browser session unhealthy, logging in again")
+                await session.close()
+
+            session.scraper = await self._login(username, password)
+        except BaseException:
+            session.scraper = None
+            await self._drop(session)
+            raise
+        if session.scraper is None:
+            await self._drop(session)
+            return None
+        session.uses = 1
+        return session
+
+    def _evictable(self) -> Optional[BrowserSession]:
+        """Least recently used idle session"""
+        idle = [session for session in self._sessions.values() if not session.in_use]
+        return min(idle, key=lambda session: session.last_used) if idle else None
+
+    async def _checkin(self, session: BrowserSession, broken: bool):
+        handle = session.scraper.browser_handle
+        if broken or (handle is not None and handle.over_budget):
+            # A scrape that raised may have left tabs mid-navigation, and a browser over
+            # its memory budget should give its RSS back; don't hand either out again
+            await session.close()
+            await self._drop(session)
+            return
+        session.scraper.jobs = []
+        session.last_used = time.monotonic()
+        async with self._changed:
+            session.in_use = False
+            self._changed.notify_all()
+
+    async def _drop(self, session: BrowserSession):
+        async with self._changed:
+            if self._sessions.get(session.key) is session:
+                del self._sessions[session.key]
+            self._changed.notify_all()
+
+    async def _reap_idle(self):
+        """Close sessions that sat unused for longer than idle_ttl"""
+        interval = max(1.0, min(60.0, self.idle_ttl / 2))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            async with self._changed:
+                expired = [session for session in self._sessions.values()
+                           if not session.in_use and now - session.last_used > self.idle_ttl]
+                for session in expired:
+                    del self._sessions[session.key]
+                if expired:
+                    self._changed.notify_all()
+            for session in expired:
+                log.info("session_expired", "💤 Closing idle browser session")
+                await session.close()
+
+    async def close_all(self):
+        """Close every idle session (busy ones are closed by their request)"""
+        sessions = [session for session in self._sessions.values() if not session.in_use]
+        for session in sessions:
+            self._sessions.pop(session.key, None)
+            await session.close()
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": len(self._sessions),
+            "in_use": sum(1 for session in self._sessions.values() if session.in_use),
+            "max_sessions": self.max_sessions,
+            **browser_governor.stats(),
+        }
+
+
+browser_sessions = BrowserSessionPool(NoDriverLinkedInScraper)
+
+
+@atexit.register
+def _close_sessions_at_exit():
+    if _loop is not None and _loop.is_running():
+        try:
+            run_scraper_coroutine(browser_sessions.close_all(), timeout=15)
+        except Exception:
+            pass
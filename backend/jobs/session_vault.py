@@ -0,0 +1,340 @@
+"""
+Session Vault - Encrypted, per-user browser sessions that skip the login form
+
+Logging in on every run is slow and is what trips LinkedIn's (and Google's)
+security challenges in headless mode. After a successful login the vault saves
+the browser's cookies and the site's localStorage, encrypted with Fernet
+(AES-128-CBC + HMAC). On the next run they are restored into the new browser
+and validated before the login form is ever opened:
+  1. no network: the site's auth cookie must be present and unexpired
+  2. one navigation: the signed-in check page must not bounce to a login wall
+Only when either check fails does the scraper fall back to a full login.
+
+Entries are keyed by site + account, and store a hash of the password the
+session was created with, so a caller must present the same credentials to
+get the session back.
+
+Seed the vault from an exported cookie file (e.g. linkedin/linkedin_cookies.json):
+    python -m jobs.session_vault import linkedin you@example.com ../linkedin/linkedin_cookies.json
+
+This module only depends on nodriver and cryptography so the Indeed scraper's
+flat imports can use it too. Use get_session_vault() for the process-wide vault
+rather than building one per scraper.
+
+Environment:
+  SESSION_VAULT_DIR       where encrypted entries live (default backend/.session_vault)
+  SESSION_VAULT_KEY       Fernet key; when unset one is generated into SESSION_VAULT_DIR/.key (0600),
+                          next to the ciphertext it protects (a warning is printed; set it in production)
+  SESSION_VAULT_DISABLED  "1" to always log in
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import nodriver as uc
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # optional: without it every run logs in
+    Fernet = None
+    InvalidToken = Exception
+
+VAULT_DIR = os.getenv("SESSION_VAULT_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".session_vault"))
+VAULT_DISABLED = os.getenv("SESSION_VAULT_DISABLED", "0") == "1"
+VALIDATION_TIMEOUT = 10.0
+
+
+class SiteProfile:
+    """Where a site's session lives and how to tell it is still signed in"""
+
+    def __init__(self, name: str, origin: str, cookie_domain: str, auth_cookies: List[str],
+                 check_url: str, signed_in: Callable[[str], bool], signed_out: Callable[[str], bool]):
+        self.name = name
+        self.origin = origin
+        self.cookie_domain = cookie_domain
+        self.auth_cookies = auth_cookies
+        self.check_url = check_url
+        self.signed_in = signed_in
+        self.signed_out = signed_out
+
+
+SITES: Dict[str, SiteProfile] = {
+    "linkedin": SiteProfile(
+        name="linkedin",
+        origin="https://www.linkedin.com",
+        cookie_domain="linkedin.com",
+        auth_cookies=["li_at"],
+        check_url="https://www.linkedin.com/feed/",
+        signed_in=lambda url: "/feed" in url,
+        signed_out=lambda url: any(marker in url for marker in ("/login", "/authwall", "/checkpoint", "/uas/")),
+    ),
+    "indeed": SiteProfile(
+        name="indeed",
+        origin="https://www.indeed.com",
+        cookie_domain="indeed.com",
+        auth_cookies=[],  # Indeed rotates its auth cookie names; rely on the check page
+        check_url="https://secure.indeed.com/settings/account",
+        signed_in=lambda url: "/settings" in url,
+        signed_out=lambda url: any(marker in url for marker in ("/auth", "/account/login")),
+    ),
+}
+
+LOCAL_STORAGE_DUMP_JS = "JSON.stringify(Object.entries(window.localStorage))"
+
+
+def secret_hash(secret: str) -> str:
+    return hashlib.sha256((secret or "").encode("utf-8")).hexdigest()
+
+
+def _entry_name(site: str, account: str) -> str:
+    return hashlib.sha256(f"{site}:{(account or '').strip().lower()}".encode("utf-8")).hexdigest() + ".vault"
+
+
+def _cookie_param(cookie: Dict):
+    """CDP CookieParam from a saved cookie (CDP or browser-extension export format)"""
+    same_site = cookie.get("sameSite")
+    same_site = {"no_restriction": "None", "lax": "Lax", "strict": "Strict"}.get(str(same_site).lower(), same_site)
+    expires = cookie.get("expires", cookie.get("expirationDate"))
+    return uc.cdp.network.CookieParam(
+        name=cookie["name"],
+        value=cookie["value"],
+        domain=cookie.get("domain"),
+        path=cookie.get("path") or "/",
+        secure=cookie.get("secure"),
+        http_only=cookie.get("httpOnly"),
+        same_site=uc.cdp.network.CookieSameSite(same_site) if same_site in ("Strict", "Lax", "None") else None,
+        expires=uc.cdp.network.TimeSinceEpoch(expires) if isinstance(expires, (int, float)) and expires > 0 else None,
+    )
+
+
+class SessionVault:
+    """Encrypted store of browser sessions, one file per site + account"""
+
+    def __init__(self, directory: str = VAULT_DIR, key: Optional[str] = None):
+        self.directory = directory
+        self._fernet = None
+        if VAULT_DISABLED:
+            return
+        if Fernet is None:
+            print("⚠️ cryptography not installed, session vault disabled (every run logs in)")
+            return
+        self._fernet = Fernet(key or os.getenv("SESSION_VAULT_KEY") or self._load_or_create_key())
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def _load_or_create_key(self) -> bytes:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        key_path = os.path.join(self.directory, ".key")
+        print(f"⚠️ SESSION_VAULT_KEY is not set: the session vault key is kept in {key_path}, next to "
+              "the sessions it encrypts. Set SESSION_VAULT_KEY to keep it off disk.")
+        if os.path.exists(key_path):
+            return self._read_key(key_path)
+        # Written to a private temp file, then linked into place: another process
+        # racing us either wins the link (we read its key) or sees a complete file
+        key = Fernet.generate_key()
+        tmp_path = f"{key_path}.tmp.{os.getpid()}"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        try:
+            os.link(tmp_path, key_path)
+        except FileExistsError:
+            return self._read_key(key_path)
+        finally:
+            os.remove(tmp_path)
+        print(f"🔐 Generated session vault key at {key_path}")
+        return key
+
+    @staticmethod
+    def _read_key(key_path: str) -> bytes:
+        with open(key_path, "rb") as f:
+            return f.read().strip()
+
+    def encrypt_secret(self, secret: str) -> Optional[str]:
+        """Encrypt a credential for storage elsewhere (e.g. a saved search); None when the vault is disabled"""
+        if not self.enabled:
+            return None
+        return self._fernet.encrypt((secret or "").encode("utf-8")).decode("ascii")
+
+    def decrypt_secret(self, token: str) -> Optional[str]:
+        """Reverse of encrypt_secret; None when the vault is disabled or the token is not ours"""
+        if not self.enabled or not token:
+            return None
+        try:
+            return self._fernet.decrypt(token.encode("ascii")).decode("utf-8")
+        except (InvalidToken, ValueError):
+            return None
+
+    def _path(self, site: str, account: str) -> str:
+        return os.path.join(self.directory, _entry_name(site, account))
+
+    def load(self, site: str, account: str, secret: str) -> Optional[Dict]:
+        """Decrypted entry for site + account, None when missing, unreadable or for other credentials"""
+        if not self.enabled or not account:
+            return None
+        try:
+            with open(self._path(site, account), "rb") as f:
+                entry = json.loads(self._fernet.decrypt(f.read()))
+        except FileNotFoundError:
+            return None
+        except (InvalidToken, ValueError, OSError) as e:
+            print(f"⚠️ Could not read saved {site} session: {e}")
+            return None
+        if entry.get("secret") != secret_hash(secret):
+            return None
+        return entry
+
+    def store(self, site: str, account: str, secret: str, cookies: List[Dict],
+              local_storage: Optional[List] = None):
+        """Encrypt and write an entry (atomically replaces the previous one)"""
+        if not self.enabled or not account:
+            return
+        entry = {
+            "site": site,
+            "secret": secret_hash(secret),
+            "saved_at": time.time(),
+            "cookies": cookies,
+            "local_storage": local_storage or [],
+        }
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        path = self._path(site, account)
+        # Per-process temp name: the web app and the scheduler both write the vault
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self._fernet.encrypt(json.dumps(entry).encode("utf-8")))
+        os.replace(tmp_path, path)
+
+    def forget(self, site: str, account: str):
+        try:
+            os.remove(self._path(site, account))
+        except FileNotFoundError:
+            pass
+
+    async def save(self, site: str, account: str, secret: str, browser, tab) -> bool:
+        """Save the browser's cookies for the site and the tab's localStorage after a login"""
+        if not self.enabled or not account:
+            return False
+        profile = SITES[site]
+        try:
+            cookies = [cookie.to_json() for cookie in await browser.cookies.get_all()
+                       if (cookie.domain or "").lstrip(".").endswith(profile.cookie_domain)]
+        except Exception as e:
+            print(f"⚠️ Could not export {site} cookies: {e}")
+            return False
+        local_storage = []
+        try:
+            dumped = await tab.evaluate(LOCAL_STORAGE_DUMP_JS)
+            if isinstance(dumped, str):
+                local_storage = json.loads(dumped)
+        except Exception:
+            pass
+        self.store(site, account, secret, cookies, local_storage)
+        print(f"🔐 Saved {site} session ({len(cookies)} cookies)")
+        return True
+
+    async def restore(self, site: str, account: str, secret: str, tab) -> bool:
+        """
+        Restore a saved session into the browser and validate it
+
+        Args:
+            site: Key of SITES ("linkedin" or "indeed")
+            account: Username/email the session belongs to
+            secret: Password the caller logged in with (must match the saved hash)
+            tab: Tab to set cookies through and navigate for the check
+
+        Returns:
+            True when the tab is signed in and the login form can be skipped
+        """
+        entry = self.load(site, account, secret)
+        if entry is None:
+            return False
+        profile = SITES[site]
+
+        # 1. no network: the auth cookie must still be there and unexpired
+        now = time.time()
+        cookies = [cookie for cookie in entry.get("cookies") or []
+                   if not (isinstance(cookie.get("expires"), (int, float)) and 0 < cookie["expires"] < now)]
+        names = {cookie.get("name") for cookie in cookies}
+        if any(name not in names for name in profile.auth_cookies):
+            print(f"⌛ Saved {site} session expired, logging in")
+            self.forget(site, account)
+            return False
+
+        try:
+            await tab.send(uc.cdp.network.set_cookies([_cookie_param(cookie) for cookie in cookies]))
+
+            # 2. one navigation: the signed-in page must not bounce to a login wall
+            await tab.get(profile.check_url)
+            url = await self._settled_url(tab, profile)
+            if url is None or not profile.signed_in(url):
+                print(f"🔑 Saved {site} session no longer accepted, logging in")
+                self.forget(site, account)
+                return False
+
+            if entry.get("local_storage"):
+                await tab.evaluate(
+                    "(function(entries){ for (const [k, v] of entries) { try { localStorage.setItem(k, v); } catch (e) {} } })(%s)"
+                    % json.dumps(entry["local_storage"])
+                )
+        except Exception as e:
+            print(f"⚠️ Could not restore saved {site} session: {e}")
+            return False
+
+        print(f"✅ Restored saved {site} session, skipping login")
+        return True
+
+    @staticmethod
+    async def _settled_url(tab, profile: SiteProfile) -> Optional[str]:
+        """Poll the tab's URL until it is clearly signed in or signed out"""
+        deadline = time.monotonic() + VALIDATION_TIMEOUT
+        url = None
+        while time.monotonic() < deadline:
+            try:
+                url = await tab.evaluate("window.location.href")
+            except Exception:
+                url = None
+            if isinstance(url, str) and (profile.signed_in(url) or profile.signed_out(url)):
+                return url
+            await asyncio.sleep(0.25)
+        return url if isinstance(url, str) else None
+
+
+_vault: Optional[SessionVault] = None
+_vault_lock = threading.Lock()
+
+
+def get_session_vault() -> SessionVault:
+    """The process-wide vault (built on first use, so the key is loaded or generated once)"""
+    global _vault
+    with _vault_lock:
+        if _vault is None:
+            _vault = SessionVault()
+        return _vault
+
+
+def import_cookie_file(site: str, account: str, path: str, secret: str, vault: Optional[SessionVault] = None):
+    """Seed the vault from an exported cookie file (list of cookies or {'cookies': [...]})"""
+    vault = vault or get_session_vault()
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    cookies = data.get("cookies", []) if isinstance(data, dict) else data
+    cookies = [dict(cookie, expires=cookie.get("expires", cookie.get("expirationDate"))) for cookie in cookies]
+    vault.store(site, account, secret, cookies)
+    print(f"🔐 Imported {len(cookies)} {site} cookies for {account}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] != "import" or sys.argv[2] not in SITES:
+        print("usage: python -m jobs.session_vault import <linkedin|indeed> <account> <cookies.json>")
+        sys.exit(2)
+    import getpass
+    import_cookie_file(sys.argv[2], sys.argv[3], sys.argv[4], getpass.getpass("Password for this account: "))
@@ -0,0 +1,354 @@
+"""
+Snapshot Archive - Compressed search page captures, written off the event loop
+
+Every scraper used to write each search page's HTML (about 1.3 MB) into the
+current directory with a blocking open/write, overwriting the previous run
+(nodriver_debug_page_*.html, indeed_debug_page_*.html, debug_page_*.html).
+The archive keeps them instead:
+  * content-addressed: objects/<sha[:2]>/<sha256>.html.zst (gzip without zstandard),
+    so a page that did not change between runs is stored once
+  * written by a background thread; the scraper only enqueues the HTML
+  * indexed in index.jsonl by run, source, query, location and page
+  * pruned to SCRAPE_SNAPSHOT_MAX_RUNS runs / SCRAPE_SNAPSHOT_MAX_MB after each run
+
+Parser fixes can then be backfilled without a browser:
+    python -m jobs.snapshot_archive list
+    python -m jobs.snapshot_archive reparse [--run RUN] [--query Q] [--out jobs.json]
+
+This module does not import jobs.* at import time so the Indeed scraper's
+flat imports can use it too.
+
+Environment:
+  SCRAPE_SNAPSHOTS            "archive" (default), "debug" (old per-page files in the cwd) or "off"
+  SCRAPE_SNAPSHOT_DIR         archive location (default backend/.snapshots)
+  SCRAPE_SNAPSHOT_MAX_RUNS    runs kept (default 20)
+  SCRAPE_SNAPSHOT_MAX_MB      compressed size kept (default 500)
+  SCRAPE_SNAPSHOT_LEVEL       compression level (default 10 for zstd, 6 for gzip)
+"""
+
+import argparse
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used instead
+    zstandard = None
+
+SNAPSHOT_MODE = os.getenv("SCRAPE_SNAPSHOTS", "archive").lower()
+SNAPSHOT_DIR = os.getenv("SCRAPE_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".snapshots"))
+SNAPSHOT_MAX_RUNS = int(os.getenv("SCRAPE_SNAPSHOT_MAX_RUNS", "20"))
+SNAPSHOT_MAX_MB = float(os.getenv("SCRAPE_SNAPSHOT_MAX_MB", "500"))
+SNAPSHOT_LEVEL = os.getenv("SCRAPE_SNAPSHOT_LEVEL")
+
+# Pages waiting for the writer; when it falls this far behind new pages are dropped
+QUEUE_SIZE = 16
+
+CODEC_EXTENSIONS = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+
+def _compress(data: bytes, level: Optional[int]) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=level or 10).compress(data), "zstd"
+    return gzip.compress(data, compresslevel=level or 6), "gzip"
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed, cannot read zstd snapshots")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class SnapshotArchive:
+    """
+    Page captures of scrape runs. Use from the scrapers:
+
+        run_id = archive.start_run("linkedin", keywords, location)
+        archive.add(run_id, page, html, url, debug_file="nodriver_debug_page_1.html")
+        archive.end_run(run_id)        # queues retention pruning
+    """
+
+    def __init__(self, directory: str = SNAPSHOT_DIR, mode: str = SNAPSHOT_MODE,
+                 max_runs: int = SNAPSHOT_MAX_RUNS, max_mb: float = SNAPSHOT_MAX_MB,
+                 level: Optional[int] = int(SNAPSHOT_LEVEL) if SNAPSHOT_LEVEL else None):
+        self.directory = directory
+        self.mode = mode if mode in ("archive", "debug", "off") else "archive"
+        self.max_runs = max_runs
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.level = level
+        self._runs: Dict[str, Dict] = {}
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, "index.jsonl")
+
+    # ------------------------------------------------------------------
+    # Scraper side (never blocks on disk)
+    # ------------------------------------------------------------------
+
+    def start_run(self, source: str, query: str = "", location: str = "") -> str:
+        """New run id; its pages are indexed under source/query/location"""
+        run_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        self._runs[run_id] = {"source": source, "query": query, "location": location}
+        return run_id
+
+    def add(self, run_id: Optional[str], page: int, html: str, url: str = "",
+            debug_file: Optional[str] = None):
+        """
+        Queue one page capture
+
+        Args:
+            run_id: From start_run
+            page: Page index (0-based)
+            html: Page HTML
+            url: Search URL the page was loaded from
+            debug_file: File name written in "debug" mode (the old per-page file)
+        """
+        if self.mode == "off" or not html:
+            return
+        if self.mode == "debug":
+            if debug_file:
+                self._enqueue(("debug", debug_file, html))
+            return
+        meta = dict(self._runs.get(run_id) or {}, run=run_id, page=page, url=url, ts=round(time.time(), 3))
+        self._enqueue(("page", meta, html))
+
+    def end_run(self, run_id: Optional[str]):
+        """Forget the run's metadata and prune old runs in the background"""
+        self._runs.pop(run_id, None)
+        if self.mode == "archive":
+            self._enqueue(("prune", run_id, None))
+
+    def flush(self, timeout: float = 10.0):
+        """Wait until every queued capture is on disk"""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done, None))
+        done.wait(timeout)
+
+    def _enqueue(self, item):
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            print(f"⚠️ Snapshot writer is behind, dropping a {item[0]} capture")
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+            self._thread = threading.Thread(target=self._drain, name="snapshot-writer", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _drain(self):
+        while True:
+            kind, meta, html = self._queue.get()
+            try:
+                if kind == "page":
+                    self._write_page(meta, html)
+                elif kind == "debug":
+                    with open(meta, "w", encoding="utf-8") as f:
+                        f.write(html)
+                    print(f"💾 Saved HTML to {meta}")
+                elif kind == "prune":
+                    self.prune(keep_run=meta)
+                elif kind == "flush":
+                    meta.set()
+            except Exception as e:
+                print(f"⚠️ Snapshot writer: {e}")
+
+    def _write_page(self, meta: Dict, html: str):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._find_object(digest)
+        if existing is not None:
+            codec, stored_size = existing
+        else:
+            compressed, codec = _compress(data, self.level)
+            path = self._object_path(digest, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            stored_size = len(compressed)
+
+        entry = dict(meta, sha256=digest, codec=codec, size=len(data), stored_size=stored_size)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"💾 Archived page {meta.get('page', 0) + 1} ({len(data) // 1024} KB -> {stored_size // 1024} KB {codec})")
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest + CODEC_EXTENSIONS[codec])
+
+    def _find_object(self, digest: str) -> Optional[Tuple[str, int]]:
+        for codec in CODEC_EXTENSIONS:
+            path = self._object_path(digest, codec)
+            if os.path.exists(path):
+                return codec, os.path.getsize(path)
+        return None
+
+    def prune(self, keep_run: Optional[str] = None):
+        """Drop the oldest runs beyond max_runs / max_mb and the objects only they used"""
+        entries = list(self.entries())
+        if not entries:
+            return
+        runs: List[str] = []
+        for entry in entries:
+            if entry.get("run") not in runs:
+                runs.append(entry.get("run"))
+
+        def stored_bytes(kept_runs) -> int:
+            return sum({entry["sha256"]: entry.get("stored_size", 0)
+                        for entry in entries if entry.get("run") in kept_runs}.values())
+
+        kept = runs[-self.max_runs:] if self.max_runs > 0 else list(runs)
+        while len(kept) > 1 and self.max_bytes > 0 and stored_bytes(kept) > self.max_bytes:
+            kept.pop(0 if kept[0] != keep_run else 1)
+        if len(kept) == len(runs):
+            return
+
+        kept_entries = [entry for entry in entries if entry.get("run") in kept]
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in kept_entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+        referenced = {entry["sha256"] for entry in kept_entries}
+        removed = 0
+        for entry in entries:
+            digest = entry["sha256"]
+            if digest in referenced:
+                continue
+            referenced.add(digest)  # only try each object once
+            try:
+                os.remove(self._object_path(digest, entry.get("codec", "gzip")))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        print(f"🧹 Snapshot archive: kept {len(kept)} runs, removed {len(runs) - len(kept)} runs ({removed} pages)")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def entries(self, run: Optional[str] = None, source: Optional[str] = None,
+                query: Optional[str] = None, page: Optional[int] = None) -> Iterator[Dict]:
+        """Index entries in capture order, optionally filtered"""
+        try:
+            f = open(self.index_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if run is not None and entry.get("run") != run:
+                    continue
+                if source is not None and entry.get("source") != source:
+                    continue
+                if query is not None and (entry.get("query") or "").lower() != query.lower():
+                    continue
+                if page is not None and entry.get("page") != page:
+                    continue
+                yield entry
+
+    def runs(self) -> List[Dict]:
+        """One summary per archived run, oldest first"""
+        runs: Dict[str, Dict] = {}
+        for entry in self.entries():
+            summary = runs.setdefault(entry.get("run"), {
+                "run": entry.get("run"), "source": entry.get("source"), "query": entry.get("query"),
+                "location": entry.get("location"), "pages": 0, "ts": entry.get("ts"),
+            })
+            summary["pages"] += 1
+        return list(runs.values())
+
+    def read(self, entry: Dict) -> str:
+        """HTML of an index entry"""
+        with open(self._object_path(entry["sha256"], entry.get("codec", "gzip")), "rb") as f:
+            return _decompress(f.read(), entry.get("codec", "gzip")).decode("utf-8")
+
+
+_archive: Optional[SnapshotArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_snapshot_archive() -> SnapshotArchive:
+    """Process-wide archive shared by the scrapers"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = SnapshotArchive()
+            atexit.register(_archive.flush)  # the writer is a daemon thread
+        return _archive
+
+
+def reparse(archive: SnapshotArchive, run: Optional[str] = None, query: Optional[str] = None,
+            out: Optional[str] = None) -> int:
+    """Re-run LinkedInJobParser over archived LinkedIn pages; returns the number of jobs"""
+    from jobs.linkedin_parser import LinkedInJobParser
+
+    results = []
+    total = 0
+    for entry in archive.entries(run=run, source="linkedin", query=query):
+        try:
+            jobs = LinkedInJobParser.extract_jobs_from_html(archive.read(entry))
+        except Exception as e:
+            print(f"❌ Run {entry.get('run')} page {entry.get('page', 0) + 1}: {e}")
+            continue
+        total += len(jobs)
+        print(f"✅ Run {entry.get('run')} '{entry.get('query')}' page {entry.get('page', 0) + 1}: {len(jobs)} jobs")
+        for job in jobs:
+            results.append(dict(job.model_dump(), snapshot_run=entry.get("run"), snapshot_page=entry.get("page")))
+
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Wrote {len(results)} jobs to {out}")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m jobs.snapshot_archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="archived runs")
+    reparse_parser = commands.add_parser("reparse", help="re-run the LinkedIn parser over archived pages")
+    reparse_parser.add_argument("--run")
+    reparse_parser.add_argument("--query")
+    reparse_parser.add_argument("--out", help="write the parsed jobs to this JSON file")
+    args = parser.parse_args()
+
+    snapshot_archive = get_snapshot_archive()
+    if args.command == "list":
+        for summary in snapshot_archive.runs():
+            print(f"{summary['run']}  {summary['source']:<8}  {summary['pages']:>3} pages  "
+                  f"'{summary['query']}' {summary['location'] or ''}")
+    else:
+        reparse(snapshot_archive, run=args.run, query=args.query, out=args.out)
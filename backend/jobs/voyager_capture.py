@@ -0,0 +1,251 @@
+"""
+Voyager Capture - Reads LinkedIn's own job JSON instead of the rendered DOM
+
+LinkedIn pages get their job data from "voyager" API responses. Server-rendered
+pages embed those responses in hidden <code> blobs, and client-side navigation
+fetches them over XHR. Both carry exact titles, company names and job ids.
+This module turns those payloads into the same card records the in-page
+extractor produces, so LinkedInJobParser.job_from_card_record builds the jobs.
+"""
+
+import html as html_lib
+import json
+import re
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Voyager endpoints worth keeping (substring match on the request URL)
+VOYAGER_SEARCH_PATTERNS = ['voyagerJobsDashJobCards', 'jobs/search']
+VOYAGER_POSTING_PATTERNS = ['voyagerJobsDashJobPostings', 'voyagerJobsDashJobPostingDetailSections',
+                            'jobs/jobPostings']
+
+# Fetch.enable patterns: pause voyager responses so req_paused can read their body
+VOYAGER_FETCH_URL_PATTERNS = ['*voyager/api/*jobs*', '*voyager/api/*Jobs*']
+
+JOB_ID_PATTERN = re.compile(r'(?:jobPosting|jobPostingCard|jobDescription):\(?(\d+)')
+JOB_LINK_ID_PATTERN = re.compile(r'/jobs/view/(?:[^/?]*-)?(\d+)')
+CODE_BLOCK_PATTERN = re.compile(r'<code\b[^>]*?\bid="([^"]+)"[^>]*>(.*?)</code>', re.S)
+
+EMBEDDED_PAYLOADS_JS = """
+(function(patterns) {
+    const payloads = [];
+    for (const meta of document.querySelectorAll('code[id^="datalet-"]')) {
+        let info;
+        try { info = JSON.parse(meta.textContent); } catch (e) { continue; }
+        if (!info || !info.request || !patterns.some(p => info.request.includes(p))) continue;
+        const body = document.getElementById(info.body);
+        if (body) payloads.push({request: info.request, body: body.textContent});
+    }
+    return JSON.stringify(payloads);
+})(%s)
+""" % json.dumps(VOYAGER_SEARCH_PATTERNS + VOYAGER_POSTING_PATTERNS)
+
+
+def embedded_payloads_from_html(html: str) -> List[Dict]:
+    """
+    Python twin of EMBEDDED_PAYLOADS_JS for pages fetched without a browser
+
+    Args:
+        html: Raw page HTML
+
+    Returns:
+        [{'request': ..., 'body': ...}] for every voyager job payload embedded in the page
+    """
+    blocks = {block_id: content for block_id, content in CODE_BLOCK_PATTERN.findall(html or "")}
+    payloads = []
+    for block_id, content in blocks.items():
+        if not block_id.startswith("datalet-"):
+            continue
+        try:
+            info = json.loads(html_lib.unescape(content))
+        except ValueError:
+            continue
+        request = info.get("request") if isinstance(info, dict) else None
+        if not request or not (is_search_request(request) or is_posting_request(request)):
+            continue
+        body = blocks.get(info.get("body") or "")
+        if body is not None:
+            payloads.append({"request": request, "body": html_lib.unescape(body).strip()})
+    return payloads
+
+
+def is_search_request(url: str) -> bool:
+    return any(pattern in url for pattern in VOYAGER_SEARCH_PATTERNS)
+
+
+def is_posting_request(url: str) -> bool:
+    return any(pattern in url for pattern in VOYAGER_POSTING_PATTERNS)
+
+
+def job_id_from_urn(urn: str) -> str:
+    """'urn:li:fsd_jobPostingCard:(4289666418,JOBS_SEARCH)' -> '4289666418'"""
+    match = JOB_ID_PATTERN.search(urn or "")
+    return match.group(1) if match else ""
+
+
+def job_id_from_link(url: str) -> str:
+    """'https://www.linkedin.com/jobs/view/some-title-at-acme-4277872414?...' -> '4277872414'"""
+    match = JOB_LINK_ID_PATTERN.search(url or "")
+    return match.group(1) if match else ""
+
+
+def _text(view_model) -> str:
+    """Text of a voyager TextViewModel ({'text': ...}) or plain string"""
+    if isinstance(view_model, dict):
+        return view_model.get("text") or ""
+    return view_model if isinstance(view_model, str) else ""
+
+
+def _listed_date(posting: Dict) -> str:
+    """Posting date from listedAt/originalListedAt (epoch ms), "" when absent"""
+    listed_at = posting.get("listedAt") or posting.get("originalListedAt")
+    if not isinstance(listed_at, (int, float)):
+        return ""
+    return datetime.fromtimestamp(listed_at / 1000).strftime("%Y-%m-%d")
+
+
+def parse_job_cards(payload: Dict) -> List[Dict]:
+    """
+    Map a voyagerJobsDashJobCards response to card records
+
+    Args:
+        payload: Decoded response ({'data': ..., 'included': [...]})
+
+    Returns:
+        Card records (id, title, company, location, link, date) in result order
+    """
+    included = payload.get("included") or []
+    by_urn = {entity.get("entityUrn"): entity for entity in included if isinstance(entity, dict)}
+
+    # Result order comes from data.elements; fall back to the included order
+    card_urns = []
+    for element in (payload.get("data") or {}).get("elements") or []:
+        if not isinstance(element, dict):
+            continue
+        urn = (element.get("jobCardUnion") or {}).get("*jobPostingCard")
+        if urn:
+            card_urns.append(urn)
+    if not card_urns:
+        card_urns = [urn for urn, entity in by_urn.items()
+                     if str(entity.get("$type", "")).endswith("JobPostingCard")]
+
+    records = []
+    seen = set()
+    for urn in card_urns:
+        card = by_urn.get(urn) or {}
+        title = card.get("jobPostingTitle") or _text(card.get("title"))
+        job_id = job_id_from_urn(card.get("jobPostingUrn") or urn)
+        if not title or not job_id or job_id in seen:
+            continue  # JOB_DETAILS prefetch stubs carry no fields
+        seen.add(job_id)
+        posting = by_urn.get(card.get("*jobPosting") or card.get("jobPostingUrn")) or {}
+        records.append({
+            "id": job_id,
+            "title": title,
+            "company": _text(card.get("primaryDescription")),
+            "location": _text(card.get("secondaryDescription")),
+            "link": f"https://www.linkedin.com/jobs/view/{job_id}/",
+            "date": _listed_date(posting),
+        })
+    return records
+
+
+def parse_job_descriptions(payload: Dict) -> Dict[str, str]:
+    """
+    Pull description text out of a job posting response
+
+    Args:
+        payload: Decoded response ({'data': ..., 'included': [...]})
+
+    Returns:
+        Dict of job id -> description text
+    """
+    entities = list(payload.get("included") or [])
+    data = payload.get("data")
+    if isinstance(data, dict):
+        entities.append(data)
+
+    descriptions = {}
+    for entity in entities:
+        if not isinstance(entity, dict):
+            continue
+        description = _text(entity.get("description")) or _text(entity.get("descriptionText"))
+        job_id = job_id_from_urn(entity.get("entityUrn") or entity.get("jobPostingUrn") or "")
+        if description and job_id:
+            descriptions[job_id] = re.sub(r'\s+', ' ', description).strip()
+    return descriptions
+
+
+class VoyagerCapture:
+    """
+    Buffer of voyager job payloads seen on one tab, fed by the Fetch.requestPaused
+    hook (XHR) and by the embedded <code> blobs of server-rendered pages.
+    """
+
+    def __init__(self, max_payloads: int = 50):
+        self._search = deque(maxlen=max_payloads)
+        self._postings = deque(maxlen=max_payloads)
+
+    def add(self, url: str, body: str) -> bool:
+        """
+        Keep a response body if it is a job search or job posting payload
+
+        Returns:
+            True when the payload was kept
+        """
+        if not (is_search_request(url) or is_posting_request(url)):
+            return False
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return False
+        if not isinstance(payload, dict):
+            return False
+        (self._search if is_search_request(url) else self._postings).append(payload)
+        return True
+
+    def add_embedded(self, result) -> int:
+        """
+        Keep the payloads returned by EMBEDDED_PAYLOADS_JS
+
+        Args:
+            result: Raw tab.evaluate result (a JSON string on success)
+
+        Returns:
+            Number of payloads kept
+        """
+        if not isinstance(result, str):
+            return 0
+        try:
+            blobs = json.loads(result)
+        except ValueError:
+            return 0
+        return self.add_payloads(blobs)
+
+    def add_payloads(self, blobs: List[Dict]) -> int:
+        """Keep [{'request': ..., 'body': ...}] payloads (see embedded_payloads_from_html)"""
+        return sum(1 for blob in blobs if isinstance(blob, dict)
+                   and self.add(blob.get("request") or "", blob.get("body") or ""))
+
+    def take_search_records(self) -> List[Dict]:
+        """Card records from every search payload captured so far (buffer is cleared)"""
+        records = []
+        seen = set()
+        while self._search:
+            for record in parse_job_cards(self._search.popleft()):
+                if record["id"] not in seen:
+                    seen.add(record["id"])
+                    records.append(record)
+        return records
+
+    def take_description(self, job_id: str) -> Optional[str]:
+        """Description for one job from the captured posting payloads (buffer is cleared)"""
+        description = None
+        while self._postings:
+            description = parse_job_descriptions(self._postings.popleft()).get(job_id) or description
+        return description
+
+    def clear(self):
+        self._search.clear()
+        self._postings.clear()
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import logging
 import os
 
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
@@ -15,6 +16,9 @@ from utils.scraper_utils import (
 
 load_dotenv()
 
+# Per-job lines from fetch_and_process_page are DEBUG; SCRAPE_LOG_LEVEL=DEBUG shows them
+logging.basicConfig(level=os.getenv("SCRAPE_LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
 # Load storage state for LinkedIn session
 try:
     with open("linkedin_storage.json", "r") as f:
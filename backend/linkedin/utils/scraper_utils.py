@@ -1,5 +1,7 @@
 import json
+import logging
 import os
+import time
 from typing import List, Set, Tuple
 
 from crawl4ai import (
@@ -14,6 +16,9 @@ from crawl4ai import (
 from models.jobs import Jobs
 from utils.data_utils import is_complete_job, is_duplicate_job
 
+# Per-job lines are DEBUG (formatted lazily); each page ends with one INFO summary
+logger = logging.getLogger(__name__)
+
 
 def get_browser_config(storage_state=None) -> BrowserConfig:
     """
@@ -283,8 +288,11 @@ async def fetch_and_process_page(
 
         # Process jobs
         complete_jobs = []
+        incomplete_count = 0
+        duplicate_count = 0
+        process_start = time.perf_counter()
         for i, job in enumerate(extracted_data):
-            print(f"🔍 Processing job {i+1}/{len(extracted_data)}: {job.get('name', 'Unknown')}")
+            logger.debug("🔍 Processing job %d/%d: %s", i + 1, len(extracted_data), job.get('name', 'Unknown'))
 
             # Handle error field that might be added by LLM
             if job.get("error") is False:
@@ -292,22 +300,29 @@ async def fetch_and_process_page(
 
             # Check if job has required fields
             if not is_complete_job(job, required_keys):
-                missing_keys = [key for key in required_keys if key not in job or not job[key]]
-                print(f"   ⚠️ Incomplete job (missing: {missing_keys})")
+                incomplete_count += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    missing_keys = [key for key in required_keys if key not in job or not job[key]]
+                    logger.debug("   ⚠️ Incomplete job (missing: %s)", missing_keys)
                 continue
 
             # Check for duplicates using application_link
             job_link = job.get("application_link", "")
             if is_duplicate_job(job_link, seen_links):
-                print(f"   🔄 Duplicate job: {job.get('name', 'Unknown')}")
+                duplicate_count += 1
+                logger.debug("   🔄 Duplicate job: %s", job.get('name', 'Unknown'))
                 continue
 
             # Add job to results
             seen_links.add(job_link)
             complete_jobs.append(job)
-            print(f"   ✅ Added: {job.get('name')} at {job.get('company')}")
+            logger.debug("   ✅ Added: %s at %s", job.get('name'), job.get('company'))
 
-        print(f"📋 Found {len(complete_jobs)} complete, unique jobs on page {page_number}")
+        logger.info(
+            "📋 Found %d complete, unique jobs on page %d extracted=%d incomplete=%d duplicates=%d ms=%.1f",
+            len(complete_jobs), page_number, len(extracted_data), incomplete_count, duplicate_count,
+            (time.perf_counter() - process_start) * 1000,
+        )
         return complete_jobs, False
 
     except Exception as e:
@@ -0,0 +1,299 @@
+# saved_searches.py
+"""
+Saved Searches - Per-user searches that scheduler.py scrapes in the background
+
+Rows live in the saved_searches table (schema in the README). The LinkedIn
+password is stored Fernet-encrypted with the session vault key, so the
+scheduler (which needs it to log in) and the web app must share
+SESSION_VAULT_KEY. Every run records the links of the jobs it saved, newest
+first, so /api/jobs can answer from them without a browser while the last run
+is recent (within the search's interval plus the scheduler's jitter).
+"""
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from flask import Blueprint, jsonify, request
+
+from job_store import get_jobs_by_links, job_from_record, supabase
+from jobs.session_vault import get_session_vault
+
+load_dotenv()
+saved_searches_bp = Blueprint("saved_searches_bp", __name__)
+
+vault = get_session_vault()
+
+DEFAULT_INTERVAL_MINUTES = 360
+MIN_INTERVAL_MINUTES = 60
+MAX_SAVED_SEARCHES = 15  # per user
+RUN_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))  # share of the interval added at random to next_run_at
+KEPT_JOB_LINKS = 200  # links remembered per saved search
+
+# Columns safe to return to clients (never linkedin_secret)
+PUBLIC_COLUMNS = "id,user_id,search_title,location,num_jobs,interval_minutes,linkedin_username,enabled,next_run_at,last_run_at,last_result,created_at"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """A timestamptz column value as an aware datetime (None when missing or unparseable)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Data access (used by the routes below and by scheduler.py)
+# ---------------------------------------------------------------------------
+
+def due_searches(limit: int = 50) -> List[Dict]:
+    """Enabled saved searches whose next_run_at has passed, oldest first"""
+    if not supabase:
+        return []
+
+    try:
+        result = supabase.table("saved_searches").select("*").eq("enabled", True).lte("next_run_at", _now().isoformat()).order("next_run_at").limit(limit).execute()
+        return result.data or []
+    except Exception as e:
+        print(f"❌ Error fetching due saved searches: {e}")
+        return []
+
+
+def claim_search(search: Dict):
+    """Push next_run_at a full interval out before running, so a crash mid-run does not retry in a loop"""
+    interval = search.get("interval_minutes") or DEFAULT_INTERVAL_MINUTES
+    _update(search["id"], {"next_run_at": (_now() + timedelta(minutes=interval)).isoformat()})
+
+
+def record_run(search: Dict, saved_links: List[str], found: int, error: Optional[str] = None):
+    """Store a run's outcome and schedule the next one (interval plus up to RUN_JITTER of it)"""
+    interval = search.get("interval_minutes") or DEFAULT_INTERVAL_MINUTES
+    now = _now()
+    previous_links = (search.get("last_result") or {}).get("job_links") or []
+    job_links = list(dict.fromkeys(list(saved_links) + previous_links))[:KEPT_JOB_LINKS]
+    _update(search["id"], {
+        "last_run_at": now.isoformat(),
+        "next_run_at": (now + timedelta(minutes=interval * (1 + random.uniform(0, RUN_JITTER)))).isoformat(),
+        "last_result": {
+            "found": found,
+            "saved": len(saved_links),
+            "error": error,
+            "job_links": job_links,
+        },
+    })
+
+
+def search_credentials(search: Dict) -> Optional[str]:
+    """Decrypted LinkedIn password of a saved search (None when it cannot be decrypted)"""
+    return vault.decrypt_secret(search.get("linkedin_secret"))
+
+
+def find_saved_search(user_id: str, search_title: str, location: str = "") -> Optional[Dict]:
+    """The user's saved search for this title/location (case-insensitive), if any"""
+    if not supabase or not user_id:
+        return None
+
+    try:
+        # At most MAX_SAVED_SEARCHES rows per user, compared here
+        result = supabase.table("saved_searches").select(PUBLIC_COLUMNS).eq("user_id", user_id).execute()
+    except Exception as e:
+        print(f"❌ Error looking up saved search: {e}")
+        return None
+    wanted = ((search_title or "").strip().lower(), (location or "").strip().lower())
+    for search in result.data or []:
+        if ((search.get("search_title") or "").strip().lower(), (search.get("location") or "").strip().lower()) == wanted:
+            return search
+    return None
+
+
+def cached_search_jobs(user_id: str, search_title: str, location: str = "", num_jobs: int = 56) -> Optional[Dict]:
+    """
+    Jobs the scheduler already scraped for a matching saved search
+
+    Returns:
+        {"jobs", "scraped_at", "saved_search_id"} or None when there is no saved search
+        for this title/location, it has not run yet, its last run is older than
+        its interval (plus jitter) or it has no saved jobs to return
+    """
+    search = find_saved_search(user_id, search_title, location)
+    if not search:
+        return None
+    last_run = _parse_time(search.get("last_run_at"))
+    interval = search.get("interval_minutes") or DEFAULT_INTERVAL_MINUTES
+    if last_run is None or _now() - last_run > timedelta(minutes=interval * (1 + RUN_JITTER)):
+        return None
+    links = ((search.get("last_result") or {}).get("job_links") or [])[:num_jobs]
+    if not links:
+        return None
+    jobs = [job_from_record(record) for record in get_jobs_by_links(user_id, links)]
+    if not jobs:
+        return None
+    return {"jobs": jobs, "scraped_at": search["last_run_at"], "saved_search_id": search["id"]}
+
+
+def cached_jobs_response(cached: Dict) -> Dict:
+    """/api/jobs response for jobs a saved search already scraped"""
+    return {
+        "success": True,
+        "cached": True,
+        "scraped_at": cached["scraped_at"],
+        "saved_search_id": cached["saved_search_id"],
+        "message": f"Returning {len(cached['jobs'])} jobs scraped in the background",
+        "total_jobs": len(cached["jobs"]),
+        "jobs": cached["jobs"],
+        "database": {
+            "saved": 0,
+            "duplicates": 0,
+            "errors": 0,
+            "message": "Jobs were saved when the saved search ran"
+        }
+    }
+
+
+def _update(search_id: int, fields: Dict):
+    if not supabase:
+        return
+    try:
+        supabase.table("saved_searches").update(fields).eq("id", search_id).execute()
+    except Exception as e:
+        print(f"❌ Error updating saved search {search_id}: {e}")
+
+
+def _valid_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+@saved_searches_bp.route('/api/saved-searches/<user_id>', methods=['GET'])
+def list_saved_searches(user_id):
+    """List a user's saved searches (without credentials)"""
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not available"}), 500
+    if not _valid_uuid(user_id):
+        return jsonify({"success": False, "error": "user_id must be a valid UUID"}), 400
+
+    try:
+        result = supabase.table("saved_searches").select(PUBLIC_COLUMNS).eq("user_id", user_id).order("created_at").execute()
+        searches = result.data or []
+        for search in searches:
+            # The link list is for /api/jobs, clients only need the counts
+            (search.get("last_result") or {}).pop("job_links", None)
+        return jsonify({"success": True, "searches": searches})
+    except Exception as e:
+        print(f"❌ Error in list_saved_searches: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@saved_searches_bp.route('/api/saved-searches', methods=['POST'])
+def create_saved_search():
+    """Save a search for background scraping; its first run is scheduled right away"""
+    try:
+        data = request.json or {}
+        user_id = data.get("user_id", "")
+        search_title = (data.get("searchTitle") or "").strip()
+        location = (data.get("location") or "").strip()
+        linkedin_username = (data.get("linkedin_username") or "").strip()
+        linkedin_password = data.get("linkedin_password") or ""
+
+        if not supabase:
+            return jsonify({"success": False, "error": "Database not available"}), 500
+        if not _valid_uuid(user_id):
+            return jsonify({"success": False, "error": "user_id must be a valid UUID"}), 400
+        if not search_title:
+            return jsonify({"success": False, "error": "searchTitle is required"}), 400
+        if not linkedin_username or not linkedin_password:
+            return jsonify({"success": False, "error": "LinkedIn username and password are required"}), 400
+
+        secret = vault.encrypt_secret(linkedin_password)
+        if secret is None:
+            return jsonify({"success": False, "error": "Credential encryption is not available (session vault disabled)"}), 500
+
+        try:
+            num_jobs = min(max(int(data.get("num_jobs", 25)), 1), 140)
+        except (ValueError, TypeError):
+            num_jobs = 25
+        try:
+            interval_minutes = max(int(data.get("interval_minutes", DEFAULT_INTERVAL_MINUTES)), MIN_INTERVAL_MINUTES)
+        except (ValueError, TypeError):
+            interval_minutes = DEFAULT_INTERVAL_MINUTES
+
+        existing = supabase.table("saved_searches").select("id", count="exact").eq("user_id", user_id).execute()
+        if (existing.count or 0) >= MAX_SAVED_SEARCHES:
+            return jsonify({"success": False, "error": f"At most {MAX_SAVED_SEARCHES} saved searches per user"}), 400
+        if find_saved_search(user_id, search_title, location):
+            return jsonify({"success": False, "error": "This search is already saved"}), 409
+
+        result = supabase.table("saved_searches").insert({
+            "user_id": user_id,
+            "search_title": search_title,
+            "location": location,
+            "num_jobs": num_jobs,
+            "interval_minutes": interval_minutes,
+            "linkedin_username": linkedin_username,
+            "linkedin_secret": secret,
+            "enabled": True,
+            "next_run_at": _now().isoformat(),
+        }).execute()
+        if not result.data:
+            return jsonify({"success": False, "error": "Failed to save search"}), 500
+
+        search = {key: value for key, value in result.data[0].items() if key != "linkedin_secret"}
+        print(f"💾 Saved search '{search_title}' in '{location or 'Any location'}' for user {user_id[:8]}")
+        return jsonify({"success": True, "search": search})
+    except Exception as e:
+        print(f"❌ Error in create_saved_search: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@saved_searches_bp.route('/api/saved-searches/<int:search_id>', methods=['DELETE'])
+def delete_saved_search(search_id):
+    """Delete one of the user's saved searches (?user_id=...)"""
+    user_id = request.args.get("user_id", "")
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not available"}), 500
+    if not _valid_uuid(user_id):
+        return jsonify({"success": False, "error": "user_id must be a valid UUID"}), 400
+
+    try:
+        result = supabase.table("saved_searches").delete().eq("id", search_id).eq("user_id", user_id).execute()
+        if not result.data:
+            return jsonify({"success": False, "error": "Saved search not found"}), 404
+        return jsonify({"success": True})
+    except Exception as e:
+        print(f"❌ Error in delete_saved_search: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@saved_searches_bp.route('/api/saved-searches/<int:search_id>/run', methods=['POST'])
+def run_saved_search_now(search_id):
+    """Ask the scheduler to run a saved search on its next poll ({"user_id": ...})"""
+    user_id = (request.json or {}).get("user_id", "")
+    if not supabase:
+        return jsonify({"success": False, "error": "Database not available"}), 500
+    if not _valid_uuid(user_id):
+        return jsonify({"success": False, "error": "user_id must be a valid UUID"}), 400
+
+    try:
+        result = supabase.table("saved_searches").update({"next_run_at": _now().isoformat(), "enabled": True}).eq("id", search_id).eq("user_id", user_id).execute()
+        if not result.data:
+            return jsonify({"success": False, "error": "Saved search not found"}), 404
+        return jsonify({"success": True, "message": "Search queued for the next scheduler run"})
+    except Exception as e:
+        print(f"❌ Error in run_saved_search_now: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
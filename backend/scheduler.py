@@ -0,0 +1,151 @@
+# scheduler.py
+"""
+Scheduler - Runs users' saved searches in the background
+
+Run it as its own process next to the web app (one instance):
+    python scheduler.py
+
+Every SCHEDULER_POLL_SECONDS it loads the saved searches that are due and
+groups them by user + LinkedIn account. Each group is one scrape_batch in one
+warm browser session: login, saved-job dedupe and the detail tab pool are paid
+once per account, not per search. Groups run one after another:
+  * two runs start at least SCHEDULER_STAGGER_SECONDS apart
+  * one LinkedIn account is used at most once per SCHEDULER_ACCOUNT_MIN_GAP
+    minutes, counting live /api/jobs and scrape-task runs of the web app (from
+    the account's lease, see jobs.account_leases); its searches wait for the
+    next poll otherwise
+  * a group whose account is scraping in the web app waits for its lease
+    (up to LINKEDIN_SESSION_WAIT_TIMEOUT), then is recorded as failed
+  * next_run_at gets up to SCHEDULER_JITTER of the interval added, so searches
+    saved together drift apart
+New jobs go straight into user_jobs, and the links are recorded on the saved
+search so /api/jobs can return them without starting a browser.
+
+Environment:
+  SCHEDULER_POLL_SECONDS     how often due searches are looked up (default 60)
+  SCHEDULER_STAGGER_SECONDS  minimum gap between two runs starting (default 90)
+  SCHEDULER_ACCOUNT_MIN_GAP  minutes between two runs on one LinkedIn account (default 30)
+  SCHEDULER_JITTER           share of the interval added at random to next_run_at (default 0.1)
+"""
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from job_store import load_known_keys, save_jobs_to_supabase, scrape_new_jobs
+from jobs.main_nodriver import start_parse_executor
+from jobs.session_pool import SessionBusyError, browser_sessions
+from saved_searches import claim_search, due_searches, record_run, search_credentials
+
+load_dotenv()
+
+POLL_SECONDS = float(os.getenv("SCHEDULER_POLL_SECONDS", "60"))
+STAGGER_SECONDS = float(os.getenv("SCHEDULER_STAGGER_SECONDS", "90"))
+ACCOUNT_MIN_GAP = float(os.getenv("SCHEDULER_ACCOUNT_MIN_GAP", "30")) * 60
+
+
+class SearchScheduler:
+    """Polls for due saved searches and runs them, paced per account"""
+
+    def __init__(self, poll_seconds: float = POLL_SECONDS, stagger_seconds: float = STAGGER_SECONDS,
+                 account_min_gap: float = ACCOUNT_MIN_GAP):
+        self.poll_seconds = poll_seconds
+        self.stagger_seconds = stagger_seconds
+        self.account_min_gap = account_min_gap
+        self._last_start = 0.0
+        self._account_last_run: Dict[str, float] = {}  # epoch seconds, this process's runs
+
+    async def run_forever(self):
+        print(f"⏰ Saved-search scheduler started (poll {self.poll_seconds:.0f}s, stagger {self.stagger_seconds:.0f}s, "
+              f"account gap {self.account_min_gap / 60:.0f}min)")
+        try:
+            while True:
+                try:
+                    await self.run_due()
+                except Exception as e:
+                    print(f"❌ Scheduler poll failed: {e}")
+                await asyncio.sleep(self.poll_seconds)
+        finally:
+            await browser_sessions.close_all()
+
+    async def run_due(self):
+        """Run every due group whose account is not resting"""
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for search in due_searches():
+            account = (search.get("linkedin_username") or "").strip().lower()
+            groups.setdefault((search["user_id"], account), []).append(search)
+
+        for (user_id, account), searches in groups.items():
+            last_run = await self._last_run(account)
+            if last_run is not None and time.time() - last_run < self.account_min_gap:
+                continue  # account pacing: picked up again on a later poll
+
+            # Stagger: never start two runs closer than stagger_seconds
+            wait = self._last_start + self.stagger_seconds - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_start = time.monotonic()
+            self._account_last_run[account] = time.time()
+
+            await self.run_group(user_id, searches)
+
+    async def _last_run(self, account: str) -> Optional[float]:
+        """Latest start of a scrape on this account by the scheduler or the web app (epoch seconds)"""
+        runs = [self._account_last_run.get(account)]
+        if browser_sessions.account_lock is not None:
+            runs.append(await browser_sessions.account_lock.last_started(account))
+        runs = [run for run in runs if run is not None]
+        return max(runs) if runs else None
+
+    async def run_group(self, user_id: str, searches: List[Dict]):
+        """Scrape one user's due searches on one LinkedIn account as a single batch"""
+        for search in searches:
+            claim_search(search)
+
+        username = searches[0].get("linkedin_username")
+        password = search_credentials(searches[0])
+        if not password:
+            print(f"❌ Cannot decrypt LinkedIn credentials for user {user_id[:8]}, skipping {len(searches)} searches")
+            for search in searches:
+                record_run(search, [], 0, error="credentials could not be decrypted")
+            return
+
+        print(f"⏰ Running {len(searches)} saved searches for user {user_id[:8]}")
+        queries = [(search["search_title"], search.get("location") or "") for search in searches]
+        num_jobs = {query: search.get("num_jobs") or 25 for query, search in zip(queries, searches)}
+
+        try:
+            async with browser_sessions.session(username, password) as scraper:
+                if scraper is None:
+                    for search in searches:
+                        record_run(search, [], 0, error="LinkedIn login failed")
+                    return
+
+                # Shared by every search of the batch: saved jobs plus what the batch finds
+                known_keys = await load_known_keys(user_id)
+
+                async def scrape_query(view, search_title, location):
+                    return await scrape_new_jobs(view, num_jobs[(search_title, location)], search_title, location,
+                                                 known_keys=known_keys)
+
+                results = await scraper.scrape_batch(queries, known_keys=known_keys, scrape_query=scrape_query)
+        except SessionBusyError as e:
+            # This account is still scraping in this process or in the web app (its lease);
+            # claim_search already pushed next_run_at out
+            for search in searches:
+                record_run(search, [], 0, error=str(e))
+            return
+
+        # Off the loop: the scheduler's warm sessions (health checks, reaper) share it
+        loop = asyncio.get_running_loop()
+        for search, result in zip(searches, results):
+            db_result = await loop.run_in_executor(None, save_jobs_to_supabase, user_id, result["jobs"], 'linkedin')
+            record_run(search, db_result["saved_links"], len(result["jobs"]), error=result.get("error"))
+            print(f"✅ Saved search '{search['search_title']}': {len(result['jobs'])} new jobs, {db_result['saved']} saved")
+
+
+if __name__ == '__main__':
+    start_parse_executor()
+    asyncio.run(SearchScheduler().run_forever())
@@ -0,0 +1,449 @@
+# scrape_tasks.py
+"""
+Scrape Tasks - Submit a LinkedIn scrape, get a task id back, poll for progress and the result
+
+/api/jobs holds a request thread for the whole scrape. Scrapes take minutes
+while gunicorn has a handful of threads and a 180 s timeout, so a few
+concurrent scrapes starve every other endpoint. Here a scrape is a task:
+  * POST /api/scrape-tasks validates like /api/jobs and answers 202 with the
+    task id right away
+  * the scrape runs on a dedicated thread pool of SCRAPE_TASK_WORKERS
+    threads. Each worker drives the coroutine on the scraper loop (warm
+    sessions, jobs.session_pool) and saves the jobs to user_jobs; tasks
+    beyond the pool wait as "queued"
+  * GET /api/scrape-tasks/<id> reports status and live progress (pages done,
+    jobs found, duplicates, enriched); GET /api/scrape-tasks/<id>/result
+    returns the /api/jobs response once the task finished
+  * DELETE /api/scrape-tasks/<id> cancels a queued or running scrape
+  * POST /api/jobs/batch submits several searches as one batch task
+    (jobs.main_nodriver scrape_batch) and is polled the same way
+Tasks live in this process's memory, so the app must run as a single
+gunicorn worker (see the dockerfile). Finished tasks are dropped after
+SCRAPE_TASK_TTL seconds.
+
+Environment:
+  SCRAPE_TASK_WORKERS     scrapes running at once (default 2)
+  SCRAPE_TASK_MAX_QUEUED  queued + running tasks accepted before 429 (default 20)
+  SCRAPE_TASK_TIMEOUT     seconds a scrape may run before it is cancelled (default 1800)
+  SCRAPE_TASK_TTL         seconds a finished task is kept for polling (default 3600)
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from flask import Blueprint, jsonify, request
+
+from job_store import save_jobs_to_supabase, scrape_linkedin_batch_async, scrape_linkedin_jobs_async
+from jobs.scrape_progress import ScrapeProgress
+from jobs.session_pool import get_scraper_loop
+from saved_searches import cached_jobs_response, cached_search_jobs
+
+scrape_tasks_bp = Blueprint("scrape_tasks_bp", __name__)
+
+TASK_WORKERS = max(1, int(os.getenv("SCRAPE_TASK_WORKERS", "2")))
+MAX_QUEUED = max(1, int(os.getenv("SCRAPE_TASK_MAX_QUEUED", "20")))
+TASK_TIMEOUT = float(os.getenv("SCRAPE_TASK_TIMEOUT", "1800"))
+TASK_TTL = float(os.getenv("SCRAPE_TASK_TTL", "3600"))
+
+MAX_BATCH_QUERIES = 20
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+SEARCH, BATCH = "search", "batch"
+
+
+class ScrapeTask:
+    """One submitted scrape: its request, state, progress and result"""
+
+    def __init__(self, user_id: str, params: Dict, kind: str = SEARCH):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.params = params
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = ScrapeProgress()
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+        self.future: Optional[concurrent.futures.Future] = None  # slot in the task pool
+        self.scrape: Optional[concurrent.futures.Future] = None  # coroutine on the scraper loop
+
+    def to_dict(self) -> Dict:
+        if self.kind == BATCH:
+            searches = {"searches": [{"searchTitle": title, "location": location}
+                                     for title, location in self.params["queries"]]}
+        else:
+            searches = {"searchTitle": self.params["search_title"], "location": self.params["location"]}
+        return {
+            "task_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            **searches,
+            "num_jobs": self.params["num_jobs"],
+            "progress": self.progress.snapshot(),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ScrapeTaskManager:
+    """In-process task table plus the thread pool the scrapes run on"""
+
+    def __init__(self, workers: int = TASK_WORKERS, max_queued: int = MAX_QUEUED,
+                 timeout: float = TASK_TIMEOUT, ttl: float = TASK_TTL):
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.ttl = ttl
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-task")
+        self._tasks: Dict[str, ScrapeTask] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user_id: str, params: Dict, kind: str = SEARCH) -> Tuple[Optional[ScrapeTask], Optional[str]]:
+        """
+        Queue a scrape (kind SEARCH: one search, BATCH: params["queries"] in one session)
+
+        Returns:
+            (task, None), or (existing task, "busy") when the user already has one
+            queued or running, or (None, "full") when the queue is full
+        """
+        with self._lock:
+            self._prune()
+            active = [task for task in self._tasks.values() if task.status not in FINISHED]
+            for task in active:
+                if task.user_id == user_id:
+                    return task, "busy"
+            if len(active) >= self.max_queued:
+                return None, "full"
+            task = ScrapeTask(user_id, params, kind)
+            self._tasks[task.id] = task
+        task.future = self._executor.submit(self._run, task)
+        print(f"📥 Queued scrape task {task.id[:8]} for user {user_id[:8]} ({len(active) + 1} active)")
+        return task, None
+
+    def get(self, task_id: str, user_id: str) -> Optional[ScrapeTask]:
+        """The task, if it exists and belongs to user_id"""
+        with self._lock:
+            self._prune()
+            task = self._tasks.get(task_id)
+        if task is None or task.user_id != user_id:
+            return None
+        return task
+
+    def cancel(self, task: ScrapeTask) -> bool:
+        """Cancel a queued or running task; False when it already finished"""
+        if task.status in FINISHED:
+            return False
+        task.cancel_requested = True
+        if task.future is not None and task.future.cancel():
+            self._finish(task, CANCELLED)  # never started
+        elif task.scrape is not None:
+            task.scrape.cancel()  # the worker records the cancellation
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            tasks = list(self._tasks.values())
+        return {status: sum(1 for task in tasks if task.status == status)
+                for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+
+    def _run(self, task: ScrapeTask):
+        """Worker thread: scrape on the scraper loop, then save; never raises"""
+        if task.cancel_requested:
+            self._finish(task, CANCELLED)
+            return
+        task.status = RUNNING
+        task.started_at = time.time()
+        params = task.params
+        try:
+            if task.kind == SEARCH and not params["live"]:
+                cached = cached_search_jobs(task.user_id, params["search_title"], params["location"], params["num_jobs"])
+                if cached is not None:
+                    self._finish(task, DONE, result=cached_jobs_response(cached))
+                    return
+
+            task.scrape = asyncio.run_coroutine_threadsafe(_scrape_coroutine(task), get_scraper_loop())
+            if task.cancel_requested:
+                task.scrape.cancel()
+            scraper_result = task.scrape.result(self.timeout)
+        except concurrent.futures.CancelledError:
+            self._finish(task, CANCELLED)
+            return
+        except concurrent.futures.TimeoutError:
+            task.scrape.cancel()
+            self._finish(task, FAILED, error=f"Scrape did not finish within {self.timeout:.0f}s")
+            return
+        except Exception as e:
+            print(f"❌ Scrape task {task.id[:8]} failed: {e}")
+            self._finish(task, FAILED, error=f"Server error: {str(e)}")
+            return
+
+        if not scraper_result.get("success"):
+            self._finish(task, FAILED, error=scraper_result.get("error", "Unknown error"))
+            return
+
+        try:
+            if task.kind == BATCH:
+                result = _batch_response(task.user_id, scraper_result)
+            else:
+                result = _search_response(task.user_id, scraper_result)
+        except Exception as e:
+            print(f"❌ Saving scrape task {task.id[:8]} failed: {e}")
+            self._finish(task, FAILED, error=f"Server error: {str(e)}")
+            return
+        self._finish(task, DONE, result=result)
+
+    def _finish(self, task: ScrapeTask, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        task.result = result
+        task.error = error
+        task.finished_at = time.time()
+        task.status = status
+        task.params["linkedin_password"] = None  # not kept past the scrape
+        print(f"{'✅' if status == DONE else '⚠️'} Scrape task {task.id[:8]} {status}" + (f": {error}" if error else ""))
+
+    def _prune(self):
+        """Drop finished tasks older than ttl (caller holds the lock)"""
+        cutoff = time.time() - self.ttl
+        for task_id in [task_id for task_id, task in self._tasks.items()
+                        if task.status in FINISHED and task.finished_at < cutoff]:
+            del self._tasks[task_id]
+
+
+scrape_tasks = ScrapeTaskManager()
+
+
+def _scrape_coroutine(task: ScrapeTask):
+    """The scraper-loop coroutine of a task"""
+    params = task.params
+    if task.kind == BATCH:
+        return scrape_linkedin_batch_async(
+            linkedin_username=params["linkedin_username"],
+            linkedin_password=params["linkedin_password"],
+            queries=params["queries"],
+            num_jobs=params["num_jobs"],
+            user_id=task.user_id,
+            progress=task.progress,
+        )
+    return scrape_linkedin_jobs_async(
+        linkedin_username=params["linkedin_username"],
+        linkedin_password=params["linkedin_password"],
+        num_jobs=params["num_jobs"],
+        search_title=params["search_title"],
+        location=params["location"],
+        user_id=task.user_id,
+        progress=task.progress,
+    )
+
+
+def _database_summary(db_result: Dict) -> Dict:
+    return {
+        "saved": db_result["saved"],
+        "duplicates": db_result["duplicates"],
+        "errors": db_result["errors"],
+        "message": f"Saved {db_result['saved']} new jobs, {db_result['duplicates']} were duplicates"
+    }
+
+
+def _search_response(user_id: str, scraper_result: Dict) -> Dict:
+    """Save a search task's jobs; the /api/jobs response"""
+    jobs_data = scraper_result.get("jobs", [])
+    db_result = save_jobs_to_supabase(user_id, jobs_data, source='linkedin')
+    return {
+        "success": True,
+        "message": f"Successfully scraped {len(jobs_data)} new jobs",
+        "total_jobs": len(jobs_data),
+        "jobs": jobs_data,
+        "database": _database_summary(db_result),
+    }
+
+
+def _batch_response(user_id: str, scraper_result: Dict) -> Dict:
+    """Save every search's jobs of a batch in one pass (dedupe against the database once), grouped by search"""
+    results = scraper_result["results"]
+    all_jobs = [job for result in results for job in result["jobs"]]
+    db_result = save_jobs_to_supabase(user_id, all_jobs, source='linkedin')
+    return {
+        "success": True,
+        "message": scraper_result["message"],
+        "total_jobs": len(all_jobs),
+        "browser_memory": scraper_result.get("browser_memory", {}),
+        "results": [
+            {
+                "searchTitle": result["keywords"],
+                "location": result["location"],
+                "total_jobs": len(result["jobs"]),
+                "duplicates": result["duplicates_skipped"],
+                "jobs": result["jobs"],
+                **({"error": result["error"]} if result.get("error") else {}),
+            }
+            for result in results
+        ],
+        "database": _database_summary(db_result),
+    }
+
+
+def _account_params(data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """Validated credentials and user_id of a request body, or an error message"""
+    linkedin_username = data.get('linkedin_username', '')
+    linkedin_password = data.get('linkedin_password', '')
+    user_id = data.get('user_id', '')
+    if not linkedin_username or not linkedin_password:
+        return None, "LinkedIn username and password are required"
+    if not user_id:
+        return None, "user_id is required for saving jobs to database"
+    try:
+        uuid.UUID(user_id)
+    except (ValueError, TypeError, AttributeError):
+        return None, "user_id must be a valid UUID"
+    return {"user_id": user_id, "linkedin_username": linkedin_username, "linkedin_password": linkedin_password}, None
+
+
+def _scrape_params(data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """Validated scrape parameters of a request body, or an error message"""
+    params, error = _account_params(data)
+    if error:
+        return None, error
+
+    try:
+        num_jobs = int(data.get('num_jobs', 56))
+        if num_jobs <= 0:
+            num_jobs = 7  # Default to 1 page
+        elif num_jobs > 140:  # Reasonable upper limit (20 pages)
+            num_jobs = 140
+    except (ValueError, TypeError):
+        num_jobs = 56
+
+    return {
+        **params,
+        "num_jobs": num_jobs,
+        "search_title": data.get('searchTitle', 'intern'),
+        "location": data.get('location', ''),
+        "live": bool(data.get('live')),
+    }, None
+
+
+def _batch_queries(data: Dict) -> list:
+    """
+    (search title, location) pairs of a batch request: an explicit "queries" list of
+    {searchTitle, location} objects, or every combination of "searchTitles" x "locations"
+    """
+    if data.get('queries'):
+        pairs = [(str(query.get('searchTitle', '')).strip(), str(query.get('location', '')).strip())
+                 for query in data['queries'] if isinstance(query, dict)]
+    else:
+        locations = data.get('locations') or ['']
+        pairs = [(str(title).strip(), str(location).strip())
+                 for title in data.get('searchTitles') or [] for location in locations]
+    # Drop empty titles and repeated pairs, keep the request's order
+    return list(dict.fromkeys(pair for pair in pairs if pair[0]))
+
+
+def _batch_params(data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """Validated batch parameters of a request body, or an error message"""
+    params, error = _account_params(data)
+    if error:
+        return None, error
+
+    queries = _batch_queries(data)
+    if not queries:
+        return None, "At least one search title is required"
+    if len(queries) > MAX_BATCH_QUERIES:
+        return None, f"At most {MAX_BATCH_QUERIES} searches per batch"
+
+    # num_jobs applies to each search
+    try:
+        num_jobs = min(max(int(data.get('num_jobs', 25)), 1), 140)
+    except (ValueError, TypeError):
+        num_jobs = 25
+
+    return {**params, "queries": queries, "num_jobs": num_jobs}, None
+
+
+def _task_urls(task: ScrapeTask) -> Dict:
+    return {
+        "status_url": f"/api/scrape-tasks/{task.id}?user_id={task.user_id}",
+        "result_url": f"/api/scrape-tasks/{task.id}/result?user_id={task.user_id}",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+def _submit(params: Dict, kind: str):
+    """Queue a validated task and build the 202/409/429 response"""
+    user_id = params.pop("user_id")
+    task, reason = scrape_tasks.submit(user_id, params, kind)
+    if reason == "full":
+        return jsonify({"success": False, "error": "Too many scrapes in progress, try again in a few minutes"}), 429
+    if reason == "busy":
+        return jsonify({"success": False, "error": "A scrape is already in progress for this user",
+                        "task": task.to_dict(), **_task_urls(task)}), 409
+    return jsonify({"success": True, "task_id": task.id, "task": task.to_dict(), **_task_urls(task)}), 202
+
+
+@scrape_tasks_bp.route('/api/scrape-tasks', methods=['POST'])
+def submit_scrape_task():
+    """Start a scrape in the background (same body as /api/jobs); answers 202 with the task id"""
+    params, error = _scrape_params(request.json or {})
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+
+    print(f"🔍 Scrape task: {params['num_jobs']} jobs for '{params['search_title']}' in '{params['location'] or 'Any location'}'")
+    return _submit(params, SEARCH)
+
+
+@scrape_tasks_bp.route('/api/jobs/batch', methods=['POST'])
+def submit_batch_task():
+    """
+    Scrape several searches in one browser session in the background and save the
+    new jobs; answers 202 with the task id. The result (from /result) is grouped by search.
+    """
+    print("🔍 /api/jobs/batch POST endpoint called")
+    params, error = _batch_params(request.json or {})
+    if error:
+        return jsonify({"success": False, "error": error, "results": []}), 400
+
+    print(f"🔍 Batch task: {len(params['queries'])} searches, {params['num_jobs']} jobs each")
+    return _submit(params, BATCH)
+
+
+@scrape_tasks_bp.route('/api/scrape-tasks/<task_id>', methods=['GET'])
+def get_scrape_task(task_id):
+    """Status and progress of a task (?user_id=...)"""
+    task = scrape_tasks.get(task_id, request.args.get("user_id", ""))
+    if task is None:
+        return jsonify({"success": False, "error": "Task not found"}), 404
+    return jsonify({"success": True, "task": task.to_dict()})
+
+
+@scrape_tasks_bp.route('/api/scrape-tasks/<task_id>/result', methods=['GET'])
+def get_scrape_task_result(task_id):
+    """The /api/jobs response of a finished task; 202 with the status while it still runs"""
+    task = scrape_tasks.get(task_id, request.args.get("user_id", ""))
+    if task is None:
+        return jsonify({"success": False, "error": "Task not found"}), 404
+    if task.status not in FINISHED:
+        return jsonify({"success": True, "task": task.to_dict()}), 202
+    if task.status != DONE:
+        return jsonify({"success": False, "error": task.error or f"Task {task.status}", "task": task.to_dict(), "jobs": []}), 500 if task.status == FAILED else 410
+    return jsonify({**task.result, "task": task.to_dict()})
+
+
+@scrape_tasks_bp.route('/api/scrape-tasks/<task_id>', methods=['DELETE'])
+def cancel_scrape_task(task_id):
+    """Cancel a queued or running task (?user_id=...)"""
+    task = scrape_tasks.get(task_id, request.args.get("user_id", ""))
+    if task is None:
+        return jsonify({"success": False, "error": "Task not found"}), 404
+    if not scrape_tasks.cancel(task):
+        return jsonify({"success": False, "error": f"Task already {task.status}", "task": task.to_dict()}), 409
+    return jsonify({"success": True, "task": task.to_dict()})
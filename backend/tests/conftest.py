@@ -0,0 +1,19 @@
+"""
+Shared pytest setup: tests import backend modules the way app.py does
+(jobs.*, job_store, ...), so the backend directory goes on sys.path.
+Run from the backend directory: python -m pytest tests
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+DEBUG_PAGES_DIR = os.path.join(BACKEND_DIR, "jobs")
+
+
+def debug_page(number: int) -> str:
+    """HTML of a checked-in jobs/nodriver_debug_page_<number>.html capture"""
+    with open(os.path.join(DEBUG_PAGES_DIR, f"nodriver_debug_page_{number}.html"), encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,107 @@
+"""AccountLeases against an in-memory stand-in for the linkedin_account_leases table"""
+import asyncio
+
+from jobs.account_leases import UNIQUE_VIOLATION, AccountLeases
+
+
+class DuplicateKey(Exception):
+    code = UNIQUE_VIOLATION
+
+
+class FakeQuery:
+    """The slice of the supabase-py query builder AccountLeases uses"""
+
+    def __init__(self, rows, op, values=None):
+        self.rows, self.op, self.values, self.filters = rows, op, values, []
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) < value)
+        return self
+
+    def execute(self):
+        if self.op == "insert":
+            if self.values["account_hash"] in self.rows:
+                raise DuplicateKey("duplicate key")
+            self.rows[self.values["account_hash"]] = dict(self.values)
+            return type("Result", (), {"data": [self.values]})
+        matched = [row for row in self.rows.values() if all(check(row) for check in self.filters)]
+        if self.op == "update":
+            for row in matched:
+                row.update(self.values)
+        return type("Result", (), {"data": [dict(row) for row in matched]})
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def insert(self, values):
+        return FakeQuery(self.rows, "insert", values)
+
+    def update(self, values):
+        return FakeQuery(self.rows, "update", values)
+
+    def select(self, columns):
+        return FakeQuery(self.rows, "select")
+
+
+class FakeClient:
+    def __init__(self):
+        self.rows = {}
+
+    def table(self, name):
+        return FakeTable(self.rows)
+
+
+def test_second_process_waits_for_the_lease():
+    client = FakeClient()
+    web, scheduler = AccountLeases(client, poll=0.01), AccountLeases(client, poll=0.01)
+
+    async def scenario():
+        async with web.hold("me@example.com", timeout=1) as held:
+            assert held
+            async with scheduler.hold("Me@Example.com ", timeout=0.05) as busy:
+                assert not busy
+        async with scheduler.hold("me@example.com", timeout=0.05) as held:
+            assert held
+
+    asyncio.run(scenario())
+
+
+def test_other_accounts_are_not_blocked():
+    client = FakeClient()
+    leases = AccountLeases(client, poll=0.01)
+
+    async def scenario():
+        async with leases.hold("a@example.com", timeout=1) as first:
+            async with leases.hold("b@example.com", timeout=0.05) as second:
+                assert first and second
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_of_a_crashed_holder_is_taken_over():
+    client = FakeClient()
+    leases = AccountLeases(client, ttl=0, poll=0.01)
+    crashed = AccountLeases(client, ttl=0)
+    assert crashed._try_acquire("key", "crashed-holder")
+
+    assert leases._try_acquire("key", "new-holder")
+    assert client.rows["key"]["holder"] == "new-holder"
+
+
+def test_last_started_is_shared_between_processes():
+    client = FakeClient()
+    web, scheduler = AccountLeases(client), AccountLeases(client)
+
+    async def scenario():
+        assert await scheduler.last_started("me@example.com") is None
+        async with web.hold("me@example.com", timeout=1):
+            pass
+        return await scheduler.last_started("me@example.com")
+
+    assert asyncio.run(scenario()) is not None
@@ -0,0 +1,86 @@
+"""BrowserGovernor process tracking and kills, on real child processes"""
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+
+import jobs.browser_governor as governor_module
+from jobs.browser_governor import BrowserGovernor, BrowserHandle
+
+psutil = pytest.importorskip("psutil")
+
+# A browser stand-in: a root process with one child, like Chromium's tree
+TREE_CMD = [sys.executable, "-c",
+            "import subprocess, sys, time; subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); time.sleep(30)"]
+
+
+class FakeBrowser:
+    def __init__(self):
+        self._process = subprocess.Popen(TREE_CMD)
+
+
+def wait_for_children(pid, count=1, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(psutil.Process(pid).children(recursive=True)) >= count:
+            return
+        time.sleep(0.05)
+    raise AssertionError("child process did not start")
+
+
+def exited(process):
+    """Gone, or a zombie its (container init) parent has not reaped yet"""
+    try:
+        return process.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+@pytest.fixture
+def fast_exit(monkeypatch):
+    monkeypatch.setattr(governor_module, "EXIT_GRACE", 0.3)
+
+
+def test_release_kills_the_whole_tree(fast_exit):
+    governor = BrowserGovernor(max_browsers=1, max_rss_mb=0)
+
+    async def run():
+        async def start():
+            return FakeBrowser()
+        browser, handle = await governor.launch(start)
+        wait_for_children(handle.pid)
+        handle.refresh()
+        assert len(handle.pids) == 2
+        tree = list(handle.tree.values())
+        killed = await governor.release(handle)
+        browser._process.wait(timeout=5)
+        return killed, tree
+
+    killed, tree = asyncio.run(run())
+    assert killed == 2
+    assert all(exited(process) for process in tree)
+    assert governor.stats()["browsers"] == 0
+
+
+def test_refresh_forgets_exited_processes():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    handle = BrowserHandle(process.pid)
+    handle.refresh()
+    assert handle.pids == {process.pid}
+
+    process.kill()
+    process.wait(timeout=5)
+    handle.refresh()
+    # The PID is free for reuse now; the handle must not hold on to it
+    assert handle.pids == set()
+
+
+def test_kill_without_psutil_returns_once_processes_exit(monkeypatch):
+    monkeypatch.setattr(governor_module, "EXIT_GRACE", 5.0)
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+    started = time.monotonic()
+    killed = BrowserGovernor._kill_pids_without_psutil({process.pid})
+    assert killed == 0
+    assert time.monotonic() - started < 2.0
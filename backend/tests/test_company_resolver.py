@@ -0,0 +1,82 @@
+"""CompanyGazetteer matching, learning and persistence"""
+import json
+import time
+
+import pytest
+
+from jobs.company_resolver import CompanyGazetteer
+
+
+@pytest.fixture
+def seed_path(tmp_path):
+    path = tmp_path / "known_companies.json"
+    path.write_text(json.dumps({"seed": ["GPTZero", "Feroot Security"]}), encoding="utf-8")
+    return path
+
+
+def gazetteer(seed_path, tmp_path, **kwargs):
+    return CompanyGazetteer(path=str(seed_path), learned_path=str(tmp_path / "learned.json"), **kwargs)
+
+
+def test_seed_matches_inside_glued_text(seed_path, tmp_path):
+    companies = gazetteer(seed_path, tmp_path)
+    assert companies.find("Software InternGPTZero Toronto, ON") == "GPTZero"
+    assert companies.find("Analyst feroot security Remote") == "Feroot Security"
+    assert companies.find("Data Analyst Acme Toronto") == ""
+
+
+def test_learned_company_is_promoted_at_min_count_and_matches_whole_words(seed_path, tmp_path):
+    companies = gazetteer(seed_path, tmp_path, min_count=2)
+    assert companies.learn(["Nova"]) == 0
+    assert companies.find("Developer Nova Toronto") == ""
+    assert companies.learn(["Nova"]) == 1
+    assert companies.find("Developer Nova Toronto") == "Nova"
+    assert companies.find("Supernova Developer") == ""
+
+
+def test_generic_words_are_never_counted(seed_path, tmp_path):
+    companies = gazetteer(seed_path, tmp_path, min_count=1)
+    assert companies.learn(["Unknown Company", "Engineering", "Intern", "AB", ""]) == 0
+    assert companies.candidates == {}
+
+
+def test_candidates_are_capped_by_count(seed_path, tmp_path):
+    companies = gazetteer(seed_path, tmp_path, min_count=100, max_candidates=2)
+    companies.learn(["Alpha Corp", "Alpha Corp", "Beta Corp", "Beta Corp", "Gamma Corp"])
+    assert set(companies.candidates) == {"Alpha Corp", "Beta Corp"}
+
+
+def test_stale_candidates_are_forgotten(seed_path, tmp_path):
+    companies = gazetteer(seed_path, tmp_path, min_count=2, candidate_ttl=60)
+    companies.learn(["Alpha Corp"])
+    companies.candidates["Alpha Corp"]["seen"] = time.time() - 120
+    companies.learn(["Beta Corp"])
+    assert set(companies.candidates) == {"Beta Corp"}
+    # Forgotten: the next sighting starts the count over instead of promoting
+    assert companies.learn(["Alpha Corp"]) == 0
+
+
+def test_save_writes_only_the_learned_file(seed_path, tmp_path):
+    seed_before = seed_path.read_text(encoding="utf-8")
+    companies = gazetteer(seed_path, tmp_path, min_count=1)
+    companies.learn(["Nova", "Alpha Corp"])
+    companies.save()
+
+    assert seed_path.read_text(encoding="utf-8") == seed_before
+    learned = json.loads((tmp_path / "learned.json").read_text(encoding="utf-8"))
+    assert learned["learned"] == ["Nova", "Alpha Corp"]
+    assert "seed" not in learned
+
+    reloaded = gazetteer(seed_path, tmp_path)
+    assert reloaded.find("Developer Nova Toronto") == "Nova"
+    assert reloaded.find("InternGPTZero") == "GPTZero"
+
+
+def test_only_structured_company_fields_are_verified():
+    from jobs.linkedin_parser import LinkedInJobParser
+
+    record = {"title": "Software Intern", "company": "Nova", "location": "Toronto, ON", "link": "/jobs/view/1/"}
+    assert LinkedInJobParser.job_from_card_record(record).company_verified
+    assert not LinkedInJobParser.job_from_card_record(dict(record, company="")).company_verified
+    guessed = LinkedInJobParser.build_job("Software Intern", "Nova", "Toronto, ON", "https://www.linkedin.com/jobs/view/1/")
+    assert not guessed.company_verified
@@ -0,0 +1,55 @@
+"""Selector registries of LinkedInJobParser"""
+from bs4 import BeautifulSoup
+
+from jobs.linkedin_parser import LinkedInJobParser
+
+
+def title_of(html):
+    card = BeautifulSoup(html, "lxml").select_one("li")
+    title, _ = LinkedInJobParser.title_selectors.select_first(card, lambda elem: elem.get_text(strip=True))
+    return title
+
+
+def test_a_fallback_title_selector_does_not_outrank_precise_ones():
+    LinkedInJobParser.reset_selectors()
+    # Only the broad 'h3' matches here, so it wins this card...
+    assert title_of("<li><h3>Software Intern</h3></li>") == "Software Intern"
+    # ...but the next card still prefers the precise title span over the whole h3
+    card = '<li><h3><a><span title="Data Analyst">Data Analyst</span></a> <span>Nova</span></h3></li>'
+    assert title_of(card) == "Data Analyst"
+
+
+def test_no_field_registry_promotes_its_winner():
+    registries = [LinkedInJobParser.card_selectors, LinkedInJobParser.title_selectors,
+                  LinkedInJobParser.company_selectors, LinkedInJobParser.location_selectors,
+                  LinkedInJobParser.date_selectors]
+    assert not any(registry.promote_winner for registry in registries)
+
+
+def total_attempts(stats):
+    return sum(entry["attempts"] for registry in stats.values() for entry in registry["selectors"])
+
+
+def test_selector_counts_from_a_parse_worker_reach_the_parent():
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from conftest import debug_page
+
+    LinkedInJobParser.reset_selectors()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        jobs, counts = executor.submit(LinkedInJobParser.parse_page_in_worker, debug_page(1)).result()
+    assert jobs
+    assert total_attempts(LinkedInJobParser.get_selector_stats()) == 0  # parsed in the worker
+
+    LinkedInJobParser.merge_selector_counts(counts)
+    stats = LinkedInJobParser.get_selector_stats()
+    assert total_attempts(stats) > 0
+    assert sum(entry["hits"] for entry in stats["title"]["selectors"]) == len(jobs)
+
+
+def test_counts_are_taken_once():
+    LinkedInJobParser.reset_selectors()
+    title_of("<li><h3>Software Intern</h3></li>")
+    assert LinkedInJobParser.take_selector_counts()["title"]
+    assert LinkedInJobParser.take_selector_counts()["title"] == {}
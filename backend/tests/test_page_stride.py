@@ -0,0 +1,70 @@
+"""PageStride over the checked-in search page captures (jobs/nodriver_debug_page_*.html)"""
+import pytest
+from bs4 import BeautifulSoup
+
+from conftest import debug_page
+from jobs.page_stride import CARD_ID_ATTRIBUTE, CARD_SELECTOR, PageStride, rendered_card_ids
+
+# Captures 3-6 are consecutive pages of one search, requested 7 results apart
+CONSECUTIVE_PAGES = [3, 4, 5, 6]
+
+
+def all_card_ids(html):
+    """Every card id on the page, placeholders included"""
+    return [card.get(CARD_ID_ATTRIBUTE) for card in BeautifulSoup(html, "lxml").select(CARD_SELECTOR)]
+
+
+@pytest.mark.parametrize("number", [1, 3, 4, 5, 6])
+def test_only_rendered_cards_are_counted(number):
+    html = debug_page(number)
+    assert len(all_card_ids(html)) == 25
+    assert len(rendered_card_ids(html)) == 7
+
+
+def test_empty_pages_have_no_cards():
+    assert rendered_card_ids(debug_page(7)) == []
+
+
+def test_stride_is_measured_from_rendered_cards():
+    stride = PageStride(initial=25)
+    stride.start_run()
+    stride.observe(0, 0, rendered_card_ids(debug_page(1)))
+    assert stride.stride == 7
+    assert stride.start_for(1) == 7
+    assert stride.start_for(3) == 21
+
+
+def test_consecutive_pages_neither_overlap_nor_leave_gaps():
+    stride = PageStride()
+    stride.start_run()
+    for page, (number, next_number) in enumerate(zip(CONSECUTIVE_PAGES, CONSECUTIVE_PAGES[1:])):
+        html = debug_page(number)
+        rendered = rendered_card_ids(html)
+        overlap = stride.observe(page, stride.start_for(page), rendered)
+        assert overlap == 0.0
+        assert not stride.exhausted(overlap)
+
+        # The next page starts with the result right after this page's last rendered card
+        next_rendered = rendered_card_ids(debug_page(next_number))
+        assert next_rendered[0] == all_card_ids(html)[len(rendered)]
+        assert stride.start_for(page + 1) - stride.start_for(page) == len(rendered)
+
+
+def test_repeated_page_exhausts_pagination():
+    stride = PageStride()
+    stride.start_run()
+    ids = rendered_card_ids(debug_page(3))
+    stride.observe(0, 0, ids)
+    overlap = stride.observe(1, stride.start_for(1), ids)
+    assert overlap == 1.0
+    assert stride.exhausted(overlap)
+
+
+def test_continued_run_keeps_measured_offsets():
+    stride = PageStride()
+    stride.start_run()
+    stride.observe(0, 0, rendered_card_ids(debug_page(3)))
+    stride.start_run(start_page=1)
+    assert stride.start_for(1) == 7
+    overlap = stride.observe(1, 7, rendered_card_ids(debug_page(4)))
+    assert overlap == 0.0
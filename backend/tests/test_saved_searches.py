@@ -0,0 +1,57 @@
+"""cached_search_jobs: when /api/jobs may answer from a saved search's last run"""
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("supabase")
+
+import saved_searches
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+LINKS = ["https://www.linkedin.com/jobs/view/1/", "https://www.linkedin.com/jobs/view/2/"]
+
+
+def saved_search(minutes_ago, job_links=LINKS, interval_minutes=60):
+    last_run = saved_searches._now() - timedelta(minutes=minutes_ago)
+    return {
+        "id": 7,
+        "interval_minutes": interval_minutes,
+        "last_run_at": last_run.isoformat(),
+        "last_result": {"job_links": list(job_links)},
+    }
+
+
+@pytest.fixture
+def cached(monkeypatch):
+    """Call cached_search_jobs against one saved search and the user_jobs rows for LINKS"""
+    def run(search, num_jobs=56):
+        monkeypatch.setattr(saved_searches, "find_saved_search", lambda *args: search)
+        monkeypatch.setattr(saved_searches, "get_jobs_by_links", lambda user_id, links: [
+            {"job_name": f"Job {link[-2]}", "company": "Nova", "application_link": link} for link in links
+        ])
+        return saved_searches.cached_search_jobs(USER_ID, "Software Intern", "Toronto", num_jobs)
+    return run
+
+
+def test_recent_run_is_returned(cached):
+    result = cached(saved_search(minutes_ago=30))
+    assert [job["application_link"] for job in result["jobs"]] == LINKS
+    assert result["saved_search_id"] == 7
+
+
+def test_num_jobs_limits_the_links(cached):
+    assert len(cached(saved_search(minutes_ago=30), num_jobs=1)["jobs"]) == 1
+
+
+def test_run_older_than_the_interval_is_stale(cached):
+    assert cached(saved_search(minutes_ago=120)) is None
+
+
+def test_run_without_jobs_falls_through_to_a_scrape(cached):
+    assert cached(saved_search(minutes_ago=30, job_links=[])) is None
+
+
+def test_missing_or_unrun_search_is_not_cached(cached):
+    assert cached(None) is None
+    assert cached(dict(saved_search(minutes_ago=30), last_run_at=None)) is None
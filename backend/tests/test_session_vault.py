@@ -0,0 +1,50 @@
+"""SessionVault key handling when SESSION_VAULT_KEY is not set"""
+import os
+
+import pytest
+
+pytest.importorskip("nodriver")
+pytest.importorskip("cryptography")
+
+from jobs import session_vault
+from jobs.session_vault import SessionVault
+
+
+@pytest.fixture(autouse=True)
+def no_env_key(monkeypatch):
+    monkeypatch.delenv("SESSION_VAULT_KEY", raising=False)
+    monkeypatch.setattr(session_vault, "VAULT_DISABLED", False)
+
+
+def test_generated_key_is_reused_and_private(tmp_path, capsys):
+    first = SessionVault(str(tmp_path))
+    token = first.encrypt_secret("hunter2")
+    assert "next to the sessions it encrypts" in capsys.readouterr().out
+
+    assert SessionVault(str(tmp_path)).decrypt_secret(token) == "hunter2"
+    assert os.stat(tmp_path / ".key").st_mode & 0o777 == 0o600
+    assert [name for name in os.listdir(tmp_path) if name != ".key"] == []
+
+
+def test_losing_the_key_race_reads_the_winners_key(tmp_path, monkeypatch):
+    winner = SessionVault(str(tmp_path))
+    token = winner.encrypt_secret("hunter2")
+    # The loser checked for the key before the winner wrote it
+    real_exists = os.path.exists
+    monkeypatch.setattr(session_vault.os.path, "exists",
+                        lambda path: False if path.endswith(".key") else real_exists(path))
+
+    assert SessionVault(str(tmp_path)).decrypt_secret(token) == "hunter2"
+
+
+def test_process_wide_vault_is_built_once(monkeypatch):
+    monkeypatch.setattr(session_vault, "_vault", None)
+    assert session_vault.get_session_vault() is session_vault.get_session_vault()
+
+
+def test_store_leaves_only_the_entry(tmp_path):
+    vault = SessionVault(str(tmp_path))
+    vault.store("linkedin", "me@example.com", "hunter2", [{"name": "li_at", "value": "x"}])
+
+    assert vault.load("linkedin", "me@example.com", "hunter2")["cookies"][0]["name"] == "li_at"
+    assert sorted(os.listdir(tmp_path)) == sorted([".key", session_vault._entry_name("linkedin", "me@example.com")])
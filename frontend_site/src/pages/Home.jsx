@@ -60,6 +60,9 @@ const STATUS_CONFIG = {
 const truncate = (text = '', max = 260) =>
   text.length > max ? text.slice(0, max).trim() + '…' : text;
 
+const TASK_POLL_MS = 2000;
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
 const badge = (label) => (
   <span className="inline-flex items-center rounded-full px-2 py-0.5 text-[11px] font-medium bg-gray-100 text-gray-700">
     {label}
@@ -73,6 +76,7 @@ function Home() {
   const [userJobs, setUserJobs] = useState([]);
   const [pagination, setPagination] = useState({ page: 1, total: 0, total_pages: 0 });
   const [isLoading, setIsLoading] = useState(false);
+  const [scrapeProgress, setScrapeProgress] = useState(null);
   const [isLoadingUserJobs, setIsLoadingUserJobs] = useState(false);
   const [user, setUser] = useState(null);
   const [expandedScraped, setExpandedScraped] = useState(() => new Set());
@@ -162,6 +166,7 @@ function Home() {
     }
 
     setIsLoading(true);
+    setScrapeProgress(null);
     setExpandedScraped(new Set()); // reset expands for fresh results
 
     try {
@@ -174,14 +179,30 @@ function Home() {
         user_id: user.id,
       };
 
-      // Fixed: use API_URL instead of hardcoded localhost
-      const res = await fetch(`${API_URL}/api/jobs`, {
+      // Submit the scrape as a background task, then poll it until it finishes
+      const submitRes = await fetch(`${API_URL}/api/scrape-tasks`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(body),
       });
+      const submitted = await submitRes.json();
 
-      const data = await res.json();
+      // 409: a scrape for this user is already running, follow that one
+      if (!submitRes.ok && submitRes.status !== 409) {
+        console.error('❌ API error:', submitted?.error || submitRes.statusText);
+        alert(`Error: ${submitted?.error || 'Failed to start job search'}`);
+        return;
+      }
+
+      let res;
+      let data;
+      for (;;) {
+        res = await fetch(`${API_URL}${submitted.result_url}`);
+        data = await res.json();
+        if (res.status !== 202) break;
+        setScrapeProgress(data.task?.progress || null);
+        await sleep(TASK_POLL_MS);
+      }
 
       if (!res.ok || !data.success) {
         console.error('❌ API error:', data?.error || res.statusText);
@@ -204,6 +225,7 @@ Duplicates skipped: ${data.database.duplicates}`
       alert(`Failed to fetch jobs: ${err.message}`);
     } finally {
       setIsLoading(false);
+      setScrapeProgress(null);
     }
   };
 
@@ -388,7 +410,10 @@ Duplicates skipped: ${data.database.duplicates}`
 
           {isLoading && (
             <div className="mt-4 p-3 bg-yellow-50 border border-yellow-200 rounded-md text-sm text-yellow-800">
-              🔄 Scraping LinkedIn… check the Flask console for progress.
+              🔄 Scraping LinkedIn…{' '}
+              {scrapeProgress
+                ? `${scrapeProgress.pages} pages done, ${scrapeProgress.found} new jobs found, ${scrapeProgress.enriched} enriched`
+                : 'waiting for the scraper to start.'}
             </div>
           )}
         </div>